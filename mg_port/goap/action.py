@@ -14,9 +14,9 @@ This file consolidates the C# `Action.cs` and the `ExecutionStatus` enum. The ac
 - **Why co-locate ExecutionStatus**: This enum is intrinsically tied to the lifecycle and return value of an action's executor - it represents the only valid return values from any action execution.
 
 ## Dependencies
-- **Imports**: `from enum import Enum`
+- **Imports**: `from enum import Enum`, `from types import MappingProxyType`, `from .state import FrozenState, bloom_bits, compile_state_check`
 - **Used by**: `agent.py` (for execution), `parameters.py` (for variant generation), `graph.py` (for state transitions)
-- **Uses**: None (leaf module - this is intentional to avoid circular dependencies)
+- **Uses**: `state.py` (FrozenState for set-based precondition checks, compiled precondition checks)
 
 ## Implementation Structure
 
@@ -72,8 +72,7 @@ The condition logic handles different types of conditions that were present in t
 def apply_effects(self, state: dict) -> dict   (lines 78-98)
 ```
 Takes a world state and returns a NEW state dictionary with the action's effects applied. This method:
-- Creates a copy of the input state (important for immutability in the search algorithm)
-- Applies simple value assignments (e.g., `door_open: true`)
+- Merges the simple value assignments (e.g., `door_open: true`) into a new dictionary in one pass (`state | assignments`), leaving the input state untouched (important for immutability in the search algorithm)
 - Handles arithmetic modifications (e.g., `health: +10`)
 - Is used by the graph module to simulate the outcome of taking this action
 
@@ -87,6 +86,18 @@ Takes a world state and returns a NEW state dictionary with the action's effects
 
 4. **Co-location of ExecutionStatus**: Unlike the C# project which had various enums in separate files, ExecutionStatus lives here because it's meaningless outside the context of action execution.
 
+5. **Precomputed Condition Tables**: Assigning `preconditions` or `effects` (including in `__init__`) also builds flat tuples that split them by kind - equality vs. comparative preconditions, plain assignments vs. pre-parsed arithmetic effects - plus frozensets of the keys involved and `_always_possible`/`_no_effect` flags for empty preconditions/effects (never set when a subclass overrides `is_possible` or `apply_effects`, so the override is always called). When every precondition is a hashable equality literal, they are also kept as a frozenset of items, so `is_possible` on a `FrozenState` (whose items are precomputed as a frozenset) is a single C-level subset test. `is_possible` and `apply_effects` run on every node expansion of the search, so they iterate these tables instead of re-classifying each dictionary entry on every call. To keep the tables in sync, the setters store private copies and the properties return read-only views of them (`types.MappingProxyType`): changing an entry in place raises `TypeError`, and assigning a new dictionary rebuilds the tables.
+
+6. **Static Cost**: `Action` has no state-dependent `get_cost`, so `static_cost` always mirrors `cost` (kept in sync by the `cost` setter). The graph module reads `static_cost` directly for such actions instead of calling a cost function for every successor. Duck-typed actions can opt in by setting `static_cost` to a number; `None` marks a dynamic cost. A `get_cost(state)` method, such as one defined by an `Action` subclass, always takes precedence over `static_cost`.
+
+7. **Slotted Instances**: `Action` declares `__slots__`. `copy()` assigns every slot explicitly, so a new slot must be added there too. Parameterization creates one instance per parameter combination and the search touches their attributes on every expansion, so dropping the per-instance `__dict__` saves memory and speeds up attribute access. Subclasses that need extra attributes simply omit `__slots__` (or declare their own).
+
+8. **Compiled Preconditions**: When an action has only equality preconditions, assigning them also compiles a specialized check with `state.compile_state_check` - one unrolled expression instead of a loop over `_pre_equal` - which `is_possible` calls for ordinary dictionary states. Literal-only checks are cached by their generated source, so parameterized variants with identical preconditions share the compiled function. Actions with comparative preconditions, or more than 64 equality preconditions, keep the loop.
+
+9. **Bloom Prefilter**: `pre_bloom` folds the hashable equality preconditions into a 64-bit Bloom filter (`state.bloom_bits`). The graph module compares it against `FrozenState.bloom` to reject most inapplicable actions without calling `is_possible`. The filter is only valid for `Action.is_possible` itself, so subclasses that override `is_possible` get a `pre_bloom` of 0, which rejects nothing.
+
+10. **Shared Variant Tables**: Parameterization copies a template once per parameter combination, and the variants differ only in `parameters`. `copy()` therefore shares the template's preconditions, effects and precomputed tables instead of copying the dictionaries and rebuilding the tables. This is copy-on-write: the shared preconditions and effects are read-only views, so a copy can only change them by assigning new ones, which rebuilds its own tables and leaves the template untouched. The containers that can be changed in place - `parameters` and `parameterizers` - are copied.
+
 ## Relationship to C# Original
 
 This file primarily consolidates:
@@ -99,7 +110,23 @@ The Python version simplifies the C# approach by using Python's dynamic typing a
 ---"""
 
 from enum import Enum
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
+from .state import FrozenState, bloom_bits, compile_state_check
+
+
+def _hashable(value) -> bool:
+    """Check whether a value can be hashed."""
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _inherits(action, method: str) -> bool:
+    """Check whether an action uses Action's own implementation of a method."""
+    return getattr(type(action), method) is getattr(Action, method)
 
 
 class ExecutionStatus(Enum):
@@ -109,6 +136,11 @@ class ExecutionStatus(Enum):
 
 
 class Action:
+    __slots__ = ('name', '_cost', 'static_cost', '_preconditions', '_effects', 'executor', 'parameterizers', 'parameters',
+                 '_pre_equal', '_pre_compare', '_pre_keys', '_pre_set', '_eff_assign', '_eff_delta', '_eff_keys',
+                 '_pre_check', 'pre_bloom', '_always_possible', '_no_effect',
+                 '_cost_fn')
+    
     def __init__(self, name: str, cost: float, preconditions: Dict[str, Any], 
                  effects: Dict[str, Any], executor: callable, 
                  parameterizers: list | None = None):
@@ -124,12 +156,99 @@ class Action:
         """
         self.name = name
         self.cost = cost
-        self.preconditions = preconditions.copy()
-        self.effects = effects.copy()
+        self.preconditions = preconditions
+        self.effects = effects
         self.executor = executor
         self.parameterizers = parameterizers or []
         self.parameters = {}
     
+    @property
+    def cost(self) -> float:
+        """Base cost for planning."""
+        return self._cost
+    
+    @cost.setter
+    def cost(self, cost: float) -> None:
+        self._cost = cost
+        # An Action's cost never depends on the state, so the successor
+        # generation can read it straight from this plain attribute
+        self.static_cost = cost
+    
+    @property
+    def preconditions(self) -> Mapping[str, Any]:
+        """Read-only view of the world state requirements."""
+        return self._preconditions
+    
+    @preconditions.setter
+    def preconditions(self, preconditions: Dict[str, Any]) -> None:
+        # Keep a private copy, exposed read-only, so the tables below can't
+        # go stale through in-place changes
+        preconditions = dict(preconditions)
+        self._preconditions = MappingProxyType(preconditions)
+        
+        # Split once into plain equality checks and comparative checks
+        # (e.g., "health > 50") so is_possible doesn't re-classify every call
+        equal = []
+        compare = []
+        for key, value in preconditions.items():
+            if isinstance(value, str) and any(op in value for op in ['>', '<', '>=', '<=', '==']):
+                compare.append((key, value))
+            else:
+                equal.append((key, value))
+        self._pre_equal = tuple(equal)
+        self._pre_compare = tuple(compare)
+        self._pre_keys = frozenset(preconditions)
+        
+        # Set of required (key, value) items, for a single subset test against
+        # the items of a FrozenState; only usable when every precondition is
+        # a hashable equality literal
+        self._pre_set = None
+        if not compare:
+            try:
+                self._pre_set = frozenset(equal)
+            except TypeError:
+                pass
+        
+        # Bloom filter of the hashable equality literals (0 filters nothing);
+        # an overridden is_possible may accept states without them
+        if _inherits(self, 'is_possible'):
+            self.pre_bloom = bloom_bits(item for item in equal if _hashable(item))
+        else:
+            self.pre_bloom = 0
+        self._always_possible = not preconditions and _inherits(self, 'is_possible')
+        
+        # Actions without comparative preconditions get a specialized check;
+        # the others keep the generic loop in is_possible
+        self._pre_check = None if compare else compile_state_check(self._pre_equal)
+    
+    @property
+    def effects(self) -> Mapping[str, Any]:
+        """Read-only view of the changes to world state."""
+        return self._effects
+    
+    @effects.setter
+    def effects(self, effects: Dict[str, Any]) -> None:
+        effects = dict(effects)
+        self._effects = MappingProxyType(effects)
+        
+        # Split once into plain assignments and arithmetic modifications
+        # (e.g., "health: +10"), pre-parsing the modifiers
+        assign = {}
+        delta = []
+        for key, value in effects.items():
+            if isinstance(value, str) and value.startswith(('+', '-')):
+                try:
+                    delta.append((key, float(value), value))
+                    continue
+                except ValueError:
+                    # Not a number - treated as a simple assignment
+                    pass
+            assign[key] = value
+        self._eff_assign = assign
+        self._eff_delta = tuple(delta)
+        self._eff_keys = frozenset(effects)
+        self._no_effect = not effects and _inherits(self, 'apply_effects')
+    
     def is_possible(self, state: Dict[str, Any]) -> bool:
         """Check if the action's preconditions are met by a given world state.
         
@@ -139,20 +258,27 @@ class Action:
         Returns:
             True if all preconditions are satisfied, False otherwise
         """
-        for key, value in self.preconditions.items():
-            if key not in state:
-                return False
-                
-            state_value = state[key]
+        if type(state) is FrozenState and self._pre_set is not None:
+            # Frozen states carry their items as a frozenset
+            return self._pre_set <= state.key
+        
+        check = self._pre_check
+        if check is not None:
+            return check(state)
+        
+        try:
+            # Handle standard key-value preconditions
+            for key, value in self._pre_equal:
+                if state[key] != value:
+                    return False
             
             # Handle comparative preconditions (e.g., "health > 50")
-            if isinstance(value, str) and any(op in value for op in ['>', '<', '>=', '<=', '==']):
-                if not self._evaluate_comparison(state_value, value):
-                    return False
-            else:
-                # Handle standard key-value preconditions
-                if state_value != value:
+            for key, condition in self._pre_compare:
+                if not self._evaluate_comparison(state[key], condition):
                     return False
+        except KeyError:
+            # A precondition refers to a key missing from the state
+            return False
                     
         return True
     
@@ -165,24 +291,20 @@ class Action:
         Returns:
             New state dictionary with effects applied
         """
-        new_state = state.copy()
+        # Handle simple value assignments (e.g., "door_open: true"); the
+        # merge builds the new dictionary in a single pass
+        new_state = state | self._eff_assign
         
-        for key, value in self.effects.items():
-            # Handle arithmetic modifications (e.g., "health: +10")
-            if isinstance(value, str) and value.startswith(('+', '-')):
-                if key in new_state:
-                    try:
-                        current_value = new_state[key]
-                        modifier = float(value)
-                        new_state[key] = current_value + modifier
-                    except (ValueError, TypeError):
-                        # If arithmetic fails, treat as simple assignment
-                        new_state[key] = value
-                else:
-                    # Key doesn't exist, can't do arithmetic
+        # Handle arithmetic modifications (e.g., "health: +10")
+        for key, modifier, value in self._eff_delta:
+            if key in new_state:
+                try:
+                    new_state[key] = new_state[key] + modifier
+                except TypeError:
+                    # If arithmetic fails, treat as simple assignment
                     new_state[key] = value
             else:
-                # Handle simple value assignments (e.g., "door_open: true")
+                # Key doesn't exist, can't do arithmetic
                 new_state[key] = value
                 
         return new_state
@@ -239,17 +361,40 @@ class Action:
     def copy(self):
         """Create a copy of this action for parameterization.
         
+        The copy shares the read-only preconditions and effects and their
+        precomputed tables with this action (copy-on-write: assigning new
+        preconditions or effects on either action rebuilds only its own
+        tables). The parameters dictionary and parameterizer list, which can
+        be changed in place, are copied.
+        
         Returns:
             New Action instance that is a copy of this one
         """
-        new_action = Action(
-            name=self.name,
-            cost=self.cost,
-            preconditions=self.preconditions.copy(),
-            effects=self.effects.copy(),
-            executor=self.executor,
-            parameterizers=self.parameterizers.copy() if self.parameterizers else None
-        )
+        # Plain attribute assignments are several times faster than copying
+        # the slots generically; the graph's cached cost function is left
+        # unset and resolved again for the copy
+        new_action = object.__new__(type(self))
+        new_action.name = self.name
+        new_action._cost = self._cost
+        new_action.static_cost = self.static_cost
+        new_action.executor = self.executor
+        new_action.parameterizers = self.parameterizers.copy()
+        new_action._preconditions = self._preconditions
+        new_action._pre_equal = self._pre_equal
+        new_action._pre_compare = self._pre_compare
+        new_action._pre_keys = self._pre_keys
+        new_action._pre_set = self._pre_set
+        new_action._pre_check = self._pre_check
+        new_action.pre_bloom = self.pre_bloom
+        new_action._always_possible = self._always_possible
+        new_action._effects = self._effects
+        new_action._eff_assign = self._eff_assign
+        new_action._eff_delta = self._eff_delta
+        new_action._eff_keys = self._eff_keys
+        new_action._no_effect = self._no_effect
+        if hasattr(self, '__dict__'):
+            # Attributes of subclasses without __slots__
+            new_action.__dict__.update(self.__dict__)
         new_action.parameters = self.parameters.copy()
         return new_action
     
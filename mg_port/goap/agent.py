@@ -27,7 +27,7 @@ This cycle repeats continuously, allowing the agent to respond to changing condi
 ## Dependencies
 - **Imports**: `from enum import Enum`
 - **Used by**: User code (this is the main public interface)
-- **Uses**: All other modules - `planner.py`, `action.py`, `goal.py`, `sensor.py`
+- **Uses**: All other modules - `planner.py`, `action.py`, `goal.py`, `sensor.py`, `state.py`
 
 ## Implementation Structure
 
@@ -51,11 +51,11 @@ class Agent                                     (lines 22-130)
 
 The main agent class that users instantiate and interact with. Stores:
 - `name`: Identifier for the agent
-- `state`: Dictionary representing the agent's world knowledge
+- `state`: Dictionary representing the agent's world knowledge (a `VersionedDict`)
 - `actions`: List of action templates the agent can perform
 - `goals`: List of goals the agent wants to achieve
 - `sensors`: List of sensors for perceiving the world
-- `current_plan`: The active plan being executed (internal)
+- `current_plan`: The active plan being executed (internal). Stored as a `deque`; assigning any iterable converts it
 
 ### Methods
 
@@ -65,10 +65,11 @@ def __init__(self,                             (lines 25-45)
     initial_state: dict,
     actions: list[Action],
     goals: list[BaseGoal],
-    sensors: list[Sensor])
+    sensors: list[Sensor],
+    planner_fn: Callable | None = None)
 ```
 
-Initializes the agent with all its components. Also sets up internal attributes like `current_plan = None`. The agent takes ownership of all provided components.
+Initializes the agent with all its components. Also sets up internal attributes like `current_plan = None`. The agent takes ownership of all provided components. `planner_fn` is the planning function the agent calls when it needs a new plan; it defaults to `planner.orchestrate_planning` and can be replaced (e.g. by tests) without touching the planner module.
 
 ```
 def step(self,                                 (lines 48-80)
@@ -76,12 +77,12 @@ def step(self,                                 (lines 48-80)
 ```
 
 The primary public method and main entry point for agent activity. Orchestrates the sense-plan-act cycle:
-1. Always runs sensors via `_run_sensors()`
+1. Always runs sensors
 2. Checks if a new plan is needed (no plan or plan invalidated)
 3. If planning needed and mode allows, calls `_find_new_plan()`
-4. If plan exists, calls `_execute_current_action()`
+4. If plan exists, executes the first action of the plan
 
-This method is designed to be called once per game frame/turn.
+This method is designed to be called once per game frame/turn. The sensing and execution steps are inlined (the same logic as `_run_sensors()` and `_execute_current_action()`) to keep the per-tick cost down for games running many agents. For plain `Sensor` instances the loop calls `sensor.callback(state)` directly instead of going through `Sensor.run`, which saves a Python frame per sensor; subclasses and duck-typed sensors still have their `run()` called.
 
 ```
 def _run_sensors(self) -> None                 (lines 83-90)
@@ -94,10 +95,12 @@ def _find_new_plan(self) -> None               (lines 93-102)
 ```
 
 Private helper that:
-1. Calls the planner module's `orchestrate_planning()` function
+1. Calls the planning function given to `__init__` (by default the planner module's `orchestrate_planning()`)
 2. Passes self as the agent parameter
 3. Updates `self.current_plan` with the result (may be None)
 
+If every goal is already satisfied the planner is not called at all, since it would have nothing to plan for. Goal satisfaction is memoized on the state version, so on an unchanged state this check is a handful of dictionary lookups.
+
 This method encapsulates all interaction with the planning system.
 
 ```
@@ -114,11 +117,11 @@ Private helper that manages plan execution:
 
 ## Key Design Decisions
 
-1. **State Ownership**: The agent owns and manages its state dictionary. Sensors modify it directly, while actions receive copies.
+1. **State Ownership**: The agent owns and manages its state dictionary. Sensors modify it directly, while actions receive copies. The state is a `VersionedDict`, so every sensor write produces a new `state_version` that goals use to memoize satisfaction checks.
 
-2. **Plan as List**: The current plan is a simple list of actions that's consumed from the front. This makes execution logic straightforward.
+2. **Plan as Queue**: The current plan is a `deque` of actions that's consumed from the front, so removing a finished action is O(1) regardless of plan length. A fully consumed plan is reset to `None`.
 
-3. **Lazy Planning**: Plans are only generated when needed (no plan or plan failed), not every step. This improves performance.
+3. **Lazy Planning**: Plans are only generated when needed (no plan or plan failed), not every step. This improves performance. When planning finds nothing, the agent tries again on the next step: goals and actions are plain lists the game can change at any time, so an unchanged state version doesn't mean the search would fail again.
 
 4. **Single Responsibility**: The agent coordinates but delegates - it doesn't implement planning, searching, or action logic itself.
 
@@ -156,11 +159,19 @@ The Python version simplifies by:
 - Cleaner plan execution logic
 - More Pythonic method organization
 """
+from collections import deque
 from enum import Enum
-from typing import Dict, List, Optional, Any
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Any
 from .action import Action, ExecutionStatus
 from .goal import BaseGoal
+from .planner import orchestrate_planning
 from .sensor import Sensor
+from .state import VersionedDict, interned_items
+
+
+# Module-level aliases for the statuses checked on every tick
+_SUCCEEDED = ExecutionStatus.SUCCEEDED
+_EXECUTING = ExecutionStatus.EXECUTING
 
 
 class StepMode(Enum):
@@ -170,7 +181,8 @@ class StepMode(Enum):
 
 class Agent:
     def __init__(self, name: str, initial_state: Dict[str, Any], actions: List[Action], 
-                 goals: List[BaseGoal], sensors: List[Sensor]):
+                 goals: List[BaseGoal], sensors: List[Sensor],
+                 planner_fn: Optional[Callable[['Agent'], Optional[List[Action]]]] = None):
         """Initialize the agent with all its components.
         
         Args:
@@ -179,44 +191,83 @@ class Agent:
             actions: List of action templates the agent can perform
             goals: List of goals the agent wants to achieve
             sensors: List of sensors for perceiving the world
+            planner_fn: Planning function called with the agent when it needs a new
+                plan. Defaults to planner.orchestrate_planning
         """
         self.name = name
-        self.state = initial_state.copy()  # Agent owns and manages its state
+        # Agent owns and manages its state; interned keys make goal lookups hit by identity.
+        # The versioned copy is built straight from the caller's items, so this
+        # single shallow copy is the only pass over the initial state.
+        self.state = VersionedDict(interned_items(initial_state))
         self.actions = actions.copy()  # Agent takes ownership of components
         self.goals = goals.copy()
         self.sensors = sensors.copy()
-        self.current_plan: Optional[List[Action]] = None  # The active plan being executed
+        self.current_plan = None  # The active plan being executed
+        self._plan_fn = planner_fn if planner_fn is not None else orchestrate_planning
+    
+    @property
+    def current_plan(self) -> Optional[Deque[Action]]:
+        """The active plan being executed, or None if the agent has no plan."""
+        return self._current_plan
+    
+    @current_plan.setter
+    def current_plan(self, plan: Optional[Iterable[Action]]) -> None:
+        if plan is None or type(plan) is deque:
+            self._current_plan = plan
+        else:
+            self._current_plan = deque(plan)
+    
+    @property
+    def state_version(self) -> int:
+        """Version stamp of the agent's state; changes whenever the state is written."""
+        return self.state._version
     
     def step(self, mode: StepMode = StepMode.DEFAULT) -> None:
         """The primary public method and main entry point for agent activity.
         
         Orchestrates the sense-plan-act cycle:
-        1. Always runs sensors via _run_sensors()
+        1. Always runs sensors
         2. Checks if a new plan is needed (no plan or plan invalidated)
         3. If planning needed and mode allows, calls _find_new_plan()
-        4. If plan exists, calls _execute_current_action()
+        4. If plan exists, executes its first action
+        
+        Sensing and acting are inlined rather than delegated to the private
+        helpers, since this method runs once per agent per game tick.
         
         Args:
             mode: Controls how the step method behaves
         """
         # Step 1: Always sense first
-        self._run_sensors()
+        state = self.state
+        for sensor in self.sensors:
+            if type(sensor) is Sensor:
+                # Sensor.run only forwards to the callback; call it directly
+                sensor.callback(state)
+            else:
+                sensor.run(state)
         
         # Step 2: Check if we need a new plan
-        needs_new_plan = (self.current_plan is None or len(self.current_plan) == 0)
-        
-        # Step 3: Plan if needed (mode-dependent behavior)
-        if needs_new_plan:
-            if mode == StepMode.DEFAULT:
-                # In DEFAULT mode, always plan when needed
-                self._find_new_plan()
-            elif mode == StepMode.ONE_ACTION:
-                # In ONE_ACTION mode, plan synchronously when needed
+        if not self.current_plan:
+            # Step 3: Plan if needed (mode-dependent behavior). Both modes plan
+            # synchronously when needed. A failed search is retried every step,
+            # since goals and actions can change without the state changing.
+            if mode in (StepMode.DEFAULT, StepMode.ONE_ACTION):
                 self._find_new_plan()
+            
+            if not self.current_plan:
+                return
+        
+        # Step 4: Execute current action
+        plan = self.current_plan
+        execution_status = plan[0].executor(self)
         
-        # Step 4: Execute current action if we have a plan
-        if self.current_plan and len(self.current_plan) > 0:
-            self._execute_current_action()
+        if execution_status is _SUCCEEDED:
+            plan.popleft()
+            if not plan:
+                self.current_plan = None
+        elif execution_status is not _EXECUTING:
+            # FAILED or unknown status - abandon the plan
+            self.current_plan = None
     
     def _run_sensors(self) -> None:
         """Private helper that iterates through all sensors and calls their run() method,
@@ -227,17 +278,18 @@ class Agent:
             sensor.run(self.state)
     
     def _find_new_plan(self) -> None:
-        """Private helper that calls the planner module's orchestrate_planning() function,
+        """Private helper that calls the agent's planning function,
         passes self as the agent parameter, and updates self.current_plan with the result.
         This method encapsulates all interaction with the planning system.
+        
+        The planner skips goals that are already satisfied, so when every goal
+        is satisfied it can only return None; in that case it isn't called.
         """
-        # Use sys.modules to get planner to allow for mocking in tests
-        import sys
-        planner = sys.modules.get('goap.planner')
-        if planner is None:
-            from . import planner as planner_module
-            planner = planner_module
-        self.current_plan = planner.orchestrate_planning(self)
+        state = self.state
+        if all(goal.is_satisfied(state) for goal in self.goals):
+            self.current_plan = None
+        else:
+            self.current_plan = self._plan_fn(self)
     
     def _execute_current_action(self) -> None:
         """Private helper that manages plan execution:
@@ -248,25 +300,24 @@ class Agent:
            - FAILED: Clear the entire plan (needs replanning)
            - EXECUTING: Keep action in plan for next step
         """
-        if not self.current_plan or len(self.current_plan) == 0:
+        plan = self.current_plan
+        if not plan:
             return
         
-        # Get the next action (but don't remove it yet)
-        current_action = self.current_plan[0]
+        # Execute the next action (but don't remove it yet)
+        execution_status = plan[0].executor(self)
         
-        # Execute the action
-        execution_status = current_action.executor(self)
-        
-        # Handle the execution result
-        if execution_status == ExecutionStatus.SUCCEEDED:
+        # Handle the execution result. Enum members are singletons, so
+        # identity checks are exact and skip Enum.__eq__ dispatch.
+        if execution_status is _SUCCEEDED:
             # Action completed successfully, remove it from the plan
-            self.current_plan.pop(0)
-        elif execution_status == ExecutionStatus.FAILED:
-            # Action failed, abandon the entire plan (triggers replanning)
-            self.current_plan = None
-        elif execution_status == ExecutionStatus.EXECUTING:
+            plan.popleft()
+            if not plan:
+                self.current_plan = None
+        elif execution_status is _EXECUTING:
             # Action is still executing, keep it in the plan for next step
             pass
         else:
-            # Unknown status, treat as failure
+            # Action failed (or returned an unknown status), abandon the
+            # entire plan (triggers replanning)
             self.current_plan = None
\ No newline at end of file
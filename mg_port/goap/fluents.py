@@ -0,0 +1,163 @@
+"""# 📁 goap/fluents.py
+
+## Purpose
+Defines a COMPACT BITSET ENCODING of world states. This file provides `FluentRegistry`, which assigns every `(key, value)` pair ("fluent literal") a single bit so that a whole world state can be represented as one Python integer, and action preconditions and effects as integer masks.
+
+## Conceptual Overview
+Successor generation on dictionary states is dominated by two costs: copying the state for every applicable action, and hashing/comparing every precondition key. When states are encoded as bitsets, both collapse into integer arithmetic:
+
+- An action is applicable when `(state & pre_mask) == pre_bits`
+- Its successor is `(state & ~eff_mask) | eff_bits`
+
+Each distinct value of a key gets its own bit (one-hot encoding), so boolean fluents (`has_key: True`) and enum-like fluents (`position: "center"`) are handled uniformly. A state sets exactly one bit per key it contains; an effect clears every bit of the keys it touches before setting the bits of the new values.
+
+Literals are registered lazily: encoding a state or computing an action's masks registers any literal that hasn't been seen before. Because registering a new value for a key widens that key's mask, every registration bumps the registry's `generation`, and cached action masks are recomputed when their generation is stale.
+
+## Design Rationale
+- **Why Python integers**: Python's arbitrary-precision integers act as bitsets of any width, so domains with more than 64 literals need no special handling.
+- **Why one bit per literal**: It keeps both checks a single AND/compare, and it is the only encoding that works for values that aren't booleans.
+- **Why a separate registry**: Bit assignments must be shared by every state and action of one planning domain, so they live in an object the caller owns rather than in module-level globals.
+
+## Dependencies
+- **Imports**: `from typing import Any, Dict, Tuple`
+- **Used by**: `graph.py` (bitset successor generation), `search.py` (bitset A* search)
+- **Uses**: None (leaf module; actions are accessed by duck typing)
+
+## Implementation Structure
+
+### Classes
+
+```
+class FluentRegistry
+```
+
+- `bit(key, value) -> int`: The bit for a literal, registering it if needed
+- `encode(state: dict) -> int`: Encodes a dictionary state as a bitset
+- `decode(bits: int) -> dict`: Converts a bitset back into a dictionary state
+- `action_masks(action) -> (pre_mask, pre_bits, eff_mask, eff_bits)`: The (cached) masks of an action
+
+## Key Design Decisions
+
+1. **Equality Semantics**: Literals are keyed by `(key, value)` in a dictionary, so values that compare equal and hash alike (`1`, `1.0` and `True`) share a bit - exactly as the dictionary-based `is_possible` treats them as equal. `decode` returns the value that was registered first.
+
+2. **Encodable Actions Only**: Only equality preconditions and plain assignment effects can be expressed as masks. Real `Action` instances with comparative preconditions (`"> 50"`) or arithmetic effects (`"+10"`) raise `ValueError`; callers should keep those domains on the dictionary path.
+
+3. **Hashable Values**: Every value of an encoded state must be hashable, since it becomes part of a literal.
+
+## Relationship to C# Original
+
+MountainGoap has no bitset representation; this is a Python-port addition for planning performance, following the bitset states used by classical planners.
+
+---
+
+"""
+from typing import Any, Dict, Tuple
+
+
+class FluentRegistry:
+    """Assigns a bit to every (key, value) literal of a planning domain."""
+
+    __slots__ = ('_bits', '_literals', '_key_masks', '_action_masks', 'generation')
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._bits: Dict[Tuple[Any, Any], int] = {}  # literal -> bit
+        self._literals: list = []  # bit index -> literal
+        self._key_masks: Dict[Any, int] = {}  # key -> bits of all its values
+        self._action_masks: Dict[Any, tuple] = {}  # action -> (generation, masks)
+        self.generation = 0
+
+    def __len__(self) -> int:
+        """Number of registered literals."""
+        return len(self._literals)
+
+    def bit(self, key: Any, value: Any) -> int:
+        """Return the bit for a literal, registering it if it is new.
+
+        Args:
+            key: State key
+            value: State value (must be hashable)
+
+        Returns:
+            Integer with exactly one bit set
+        """
+        literal = (key, value)
+        bit = self._bits.get(literal)
+        if bit is None:
+            bit = 1 << len(self._literals)
+            self._bits[literal] = bit
+            self._literals.append(literal)
+            self._key_masks[key] = self._key_masks.get(key, 0) | bit
+            self.generation += 1
+        return bit
+
+    def key_mask(self, key: Any) -> int:
+        """Return the bits of every registered value of a key."""
+        return self._key_masks.get(key, 0)
+
+    def encode(self, state: Dict[str, Any]) -> int:
+        """Encode a dictionary state as a bitset.
+
+        Args:
+            state: World state dictionary
+
+        Returns:
+            Integer with one bit set per key of the state
+        """
+        bit = self.bit
+        bits = 0
+        for key, value in state.items():
+            bits |= bit(key, value)
+        return bits
+
+    def decode(self, bits: int) -> Dict[str, Any]:
+        """Convert a bitset back into a dictionary state.
+
+        Args:
+            bits: Encoded world state
+
+        Returns:
+            World state dictionary
+        """
+        literals = self._literals
+        state = {}
+        while bits:
+            low = bits & -bits
+            key, value = literals[low.bit_length() - 1]
+            state[key] = value
+            bits ^= low
+        return state
+
+    def action_masks(self, action) -> Tuple[int, int, int, int]:
+        """Return the bitset masks of an action, computing them if needed.
+
+        Args:
+            action: Object with `preconditions` and `effects` dictionaries
+
+        Returns:
+            Tuple (pre_mask, pre_bits, eff_mask, eff_bits)
+
+        Raises:
+            ValueError: If the action has comparative preconditions or
+                arithmetic effects, which can't be encoded as masks
+        """
+        cached = self._action_masks.get(action)
+        if cached is not None and cached[0] == self.generation:
+            return cached[1]
+
+        if getattr(action, '_pre_compare', None) or getattr(action, '_eff_delta', None):
+            raise ValueError(
+                f"Action '{action.name}' has comparative preconditions or arithmetic "
+                f"effects and cannot be encoded as a bitset"
+            )
+
+        # Register all literals first so the key masks below are complete
+        pre_bits = self.encode(action.preconditions)
+        eff_bits = self.encode(action.effects)
+        eff_mask = 0
+        for key in action.effects:
+            eff_mask |= self._key_masks[key]
+
+        masks = (pre_bits, pre_bits, eff_mask, eff_bits)
+        self._action_masks[action] = (self.generation, masks)
+        return masks
@@ -18,9 +18,9 @@ Each goal has a weight that represents its importance relative to other goals. T
 - **Why ExtremeGoal never satisfies**: Extreme goals provide direction for optimization rather than terminal conditions. They influence the heuristic function in the search algorithm.
 
 ## Dependencies
-- **Imports**: `from dataclasses import dataclass`, `from enum import Enum`
+- **Imports**: `from dataclasses import dataclass`, `from enum import Enum`, optionally `numpy`
 - **Used by**: `agent.py` (stores goal list), `planner.py` (evaluates goals), `search.py` (checks satisfaction and calculates heuristics)
-- **Uses**: None (leaf module)
+- **Uses**: `state.py` (recognizes versioned agent state for memoization, interns desired-state keys, compiles desired-state checks)
 
 ## Implementation Structure
 
@@ -84,6 +84,7 @@ Concrete implementation for maximizing or minimizing numeric values. Stores:
 - `optimizations`: Dictionary mapping state keys to boolean values (True for maximize, False for minimize)
 - Never actually "satisfied" - provides direction for the planning heuristic
 - Examples: "maximize gold", "minimize distance_to_target"
+- `score(states)` ranks a batch of candidate states (sum of maximized values minus sum of minimized values), vectorized with numpy when it is installed
 
 ### Methods
 
@@ -106,7 +107,7 @@ Constructor for exact state goals. The `desired_state` parameter is a dictionary
 ```
 def is_satisfied(self, state: dict) -> bool    (Goal: lines 60-68)
 ```
-Checks if the target `desired_state` is a subset of the current world state. All key-value pairs in desired_state must match exactly.
+Checks if the target `desired_state` is a subset of the current world state. All key-value pairs in desired_state must match exactly. Iterates a tuple snapshot of the items taken whenever `desired_state` is assigned; the `desired_state` property returns a read-only view, so the snapshot cannot drift from it and a new target is set by assigning a new dictionary.
 
 ```
 def __init__(self, name: str, weight: float,   (ComparativeGoal: lines 73-81)
@@ -139,9 +140,14 @@ Always returns False. Extreme goals influence planning through heuristics rather
 3. **Weight as Core Attribute**: Every goal has a weight, making priority a first-class concept in the planning system.
 
 4. **Dictionary-based Conditions**: Like actions, goals use dictionaries for flexibility without requiring a fixed world state schema.
+   The goal classes and `ComparisonValuePair` declare `__slots__`, so instances carry no per-instance `__dict__`; user-defined goal subclasses get one back unless they declare their own `__slots__`.
 
 5. **Extreme Goals as Heuristic Guides**: The design choice for extreme goals to never be "satisfied" is intentional - they provide optimization direction rather than termination conditions.
 
+6. **Memoized Satisfaction**: The agent's live state is a `VersionedDict`. A `Goal` remembers the result of its last few checks keyed by that state's version, so re-checking an unchanged agent state within a planning cycle is a dictionary lookup. Plain dictionaries (such as the successor states produced during search) are always checked directly. The version only tracks writes to the state dictionary itself, so a list or other container changed in place keeps its version; a `Goal` therefore memoizes only when every desired value is an immutable scalar (string, number, bytes or `None`), which can never compare equal to such a container. Goals with other desired values, and `ComparativeGoal`, whose conditions hold mutable `ComparisonValuePair` objects, are always checked directly. `desired_state` is exposed as a read-only view and assigning it clears the cached results.
+
+7. **Specialized Exact-State Checks**: Successor states produced during search are plain dictionaries, so every expansion runs a goal's check directly. When its desired state is assigned, `Goal` compiles a dedicated checker with `compile_state_check` (see `state.py`) that tests each key in a single unrolled expression (`state['k1'] != v1 or state['k2'] != v2 ...`) instead of looping over the items. Desired states with more than 64 keys keep the generic loop.
+
 ## Relationship to C# Original
 
 This file consolidates several C# files:
@@ -163,8 +169,19 @@ The Python version benefits from:
 from enum import Enum
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Union
+from types import MappingProxyType
+from typing import Dict, Any, List, Union, Callable, Mapping
 import uuid
+from .state import VersionedDict, compile_state_check, intern_keys, is_atomic
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; ExtremeGoal.score falls back to pure Python
+    np = None
+
+
+# Number of state versions each goal remembers satisfaction results for
+_SATISFACTION_CACHE_SIZE = 4
 
 
 class ComparisonOperator(Enum):
@@ -178,7 +195,7 @@ class ComparisonOperator(Enum):
     GREATER_THAN_OR_EQUALS = "greater_than_or_equals"
 
 
-@dataclass
+@dataclass(slots=True)
 class ComparisonValuePair:
     """Pairs a comparison operator with a value for ComparativeGoal conditions."""
     operator: ComparisonOperator
@@ -192,6 +209,8 @@ class ComparisonValuePair:
 class BaseGoal(ABC):
     """Abstract base class for all goal types."""
     
+    __slots__ = ('name', 'weight', '_sat_cache')
+    
     def __init__(self, name: str = None, weight: float = 1.0):
         """Initialize a base goal with name and weight.
         
@@ -201,6 +220,34 @@ class BaseGoal(ABC):
         """
         self.name = name if name is not None else f"Goal {uuid.uuid4()}"
         self.weight = weight
+        self._sat_cache: Dict[int, bool] = {}  # state version -> is_satisfied result
+    
+    def _memoized(self, state: Dict[str, Any], check: Callable[[Dict[str, Any]], bool]) -> bool:
+        """Run a satisfaction check, reusing the result for unchanged agent state.
+        
+        Results are cached by the version stamp of a VersionedDict. Any other
+        mapping is passed straight to the check.
+        
+        Args:
+            state: Current world state dictionary.
+            check: The goal's uncached satisfaction check.
+            
+        Returns:
+            The result of check(state).
+        """
+        if type(state) is not VersionedDict:
+            return check(state)
+        
+        cache = self._sat_cache
+        version = state._version
+        result = cache.get(version)
+        if result is None:
+            result = check(state)
+            cache[version] = result
+            if len(cache) > _SATISFACTION_CACHE_SIZE:
+                # Dicts preserve insertion order, so the first key is the oldest
+                del cache[next(iter(cache))]
+        return result
     
     @abstractmethod
     def is_satisfied(self, state: Dict[str, Any]) -> bool:
@@ -218,6 +265,8 @@ class BaseGoal(ABC):
 class Goal(BaseGoal):
     """Concrete goal for achieving exact world states."""
     
+    __slots__ = ('_desired_state', '_desired_items', '_checker', '_memoizable')
+    
     def __init__(self, name: str = None, weight: float = 1.0, desired_state: Dict[str, Any] = None):
         """Initialize an exact-state goal.
         
@@ -229,6 +278,24 @@ class Goal(BaseGoal):
         super().__init__(name, weight)
         self.desired_state = desired_state if desired_state is not None else {}
     
+    @property
+    def desired_state(self) -> Mapping[str, Any]:
+        """Read-only view of the key-value pairs that must all match the world state."""
+        return self._desired_state
+    
+    @desired_state.setter
+    def desired_state(self, desired_state: Dict[str, Any]) -> None:
+        desired_state = intern_keys(desired_state)
+        self._desired_state = MappingProxyType(desired_state)
+        # Snapshot of the items for the satisfaction fast path
+        self._desired_items = tuple(desired_state.items())
+        self._checker = compile_state_check(self._desired_items)
+        # A state value changed in place keeps its version, so a cached result
+        # is only safe when no desired value can compare equal to a container
+        self._memoizable = all(map(is_atomic, desired_state.values()))
+        # Results cached for the old target no longer apply
+        self._sat_cache.clear()
+    
     def is_satisfied(self, state: Dict[str, Any]) -> bool:
         """Check if all desired state conditions are met.
         
@@ -238,26 +305,32 @@ class Goal(BaseGoal):
         Returns:
             True if all key-value pairs in desired_state match the world state.
         """
-        for key, desired_value in self.desired_state.items():
-            if key not in state:
-                return False
-            
-            current_value = state[key]
-            
-            # Handle None values specially
-            if current_value is None and current_value != desired_value:
-                return False
-            
-            # Use equals comparison for non-None values
-            if current_value is not None and current_value != desired_value:
-                return False
-                
+        if self._memoizable:
+            return self._memoized(state, self._check_desired_state)
+        return self._check_desired_state(state)
+    
+    def _check_desired_state(self, state: Dict[str, Any]) -> bool:
+        """Uncached implementation of is_satisfied."""
+        checker = self._checker
+        if checker is not None:
+            return checker(state)
+        
+        # A single try block around the whole loop is cheaper than a
+        # membership test per key; any missing key fails the goal.
+        try:
+            for key, desired_value in self._desired_items:
+                if state[key] != desired_value:
+                    return False
+        except KeyError:
+            return False
         return True
 
 
 class ComparativeGoal(BaseGoal):
     """Concrete goal for achieving states relative to threshold values."""
     
+    __slots__ = ('conditions',)
+    
     def __init__(self, name: str = None, weight: float = 1.0, conditions: Dict[str, ComparisonValuePair] = None):
         """Initialize a comparative goal.
         
@@ -356,6 +429,8 @@ class ExtremeGoal(BaseGoal):
     for the planning heuristic to optimize values.
     """
     
+    __slots__ = ('_optimizations', '_max_keys', '_min_keys')
+    
     def __init__(self, name: str = None, weight: float = 1.0, optimizations: Dict[str, bool] = None):
         """Initialize an extreme goal.
         
@@ -368,6 +443,17 @@ class ExtremeGoal(BaseGoal):
         super().__init__(name, weight)
         self.optimizations = optimizations if optimizations is not None else {}
     
+    @property
+    def optimizations(self) -> Dict[str, bool]:
+        """Dictionary mapping state keys to optimization direction."""
+        return self._optimizations
+    
+    @optimizations.setter
+    def optimizations(self, optimizations: Dict[str, bool]) -> None:
+        self._optimizations = optimizations
+        self._max_keys = tuple(key for key, maximize in optimizations.items() if maximize)
+        self._min_keys = tuple(key for key, maximize in optimizations.items() if not maximize)
+    
     def is_satisfied(self, state: Dict[str, Any]) -> bool:
         """ExtremeGoals are never satisfied - they provide optimization direction.
         
@@ -379,3 +465,36 @@ class ExtremeGoal(BaseGoal):
         """
         return False
     
+    def score(self, states: List[Dict[str, Any]]):
+        """Score a batch of candidate states by how well they meet the optimizations.
+        
+        The score of a state is the sum of its maximized values minus the sum of
+        its minimized values; higher is better. Missing keys count as 0.
+        
+        When numpy is installed, each key is gathered into one float64 column and
+        the columns are summed with vectorized array operations. Without numpy
+        the same sums are computed in pure Python.
+        
+        Args:
+            states: Candidate world state dictionaries.
+            
+        Returns:
+            One score per state, as a numpy array when numpy is available and
+            as a list of floats otherwise.
+        """
+        n = len(states)
+        if np is not None:
+            scores = np.zeros(n)
+            for key in self._max_keys:
+                scores += np.fromiter((state.get(key, 0) for state in states), dtype=float, count=n)
+            for key in self._min_keys:
+                scores -= np.fromiter((state.get(key, 0) for state in states), dtype=float, count=n)
+            return scores
+        
+        max_keys = self._max_keys
+        min_keys = self._min_keys
+        return [
+            float(sum(state.get(key, 0) for key in max_keys) - sum(state.get(key, 0) for key in min_keys))
+            for state in states
+        ]
+    
@@ -20,9 +20,9 @@ The key insight is that the graph is implicitly defined and dynamically explored
 - **Why tuple return**: Returning (action, new_state, cost) tuples provides all the information the search needs while remaining generic.
 
 ## Dependencies
-- **Imports**: None (pure Python)
+- **Imports**: `from .action import Action`, `from .fluents import FluentRegistry`, `from .state import FrozenState`, optionally `numpy` and `numba`
 - **Used by**: `search.py` (calls get_successors during A* exploration)
-- **Uses**: `action.py` (calls is_possible and apply_effects)
+- **Uses**: `action.py` (calls is_possible and apply_effects), `fluents.py` (bitset masks), `state.py` (FrozenState)
 
 ## Implementation Structure
 
@@ -31,10 +31,11 @@ The key insight is that the graph is implicitly defined and dynamically explored
 ```
 def get_successors(                             (lines 12-55)
     current_state: dict, 
-    concrete_actions: list[Action]) -> list[tuple[Action, dict, float]]
+    concrete_actions: list[Action],
+    registry: FluentRegistry = None) -> list[tuple[Action, dict, float]]
 ```
 
-The module's sole public function. This is the interface between the abstract graph concept and the concrete GOAP mechanics. The function:
+The module's main public function. This is the interface between the abstract graph concept and the concrete GOAP mechanics. The function:
 
 1. Takes the current world state and all available concrete actions
 2. Iterates through every action (lines 15-50)
@@ -46,23 +47,60 @@ The module's sole public function. This is the interface between the abstract gr
 
 The function effectively answers: "What are all the places I can go from here, and how much does each step cost?"
 
+When a `FluentRegistry` is passed, `current_state` is a bitset produced by `registry.encode()` and the successor states are bitsets as well. Applicability and effects are then computed from the action's masks (`(state & pre_mask) == pre_bits`, `(state & ~eff_mask) | eff_bits`) without calling `is_possible` or `apply_effects`; `registry.decode()` converts results back to dictionaries.
+
+```
+def get_predecessors(goal: dict, concrete_actions: list, registry: FluentRegistry = None) -> list[tuple[Action, dict, float]]
+```
+
+The backward counterpart of `get_successors`, for regression (goal-directed) search. For each action that achieves at least one literal of the partial goal and contradicts none of them, it returns the regressed goal `(goal - effects) | preconditions`, skipping actions whose preconditions contradict what is still required. Branching is bounded by the goal's literals rather than by everything applicable in the current state. With a registry the same regression is done on bitsets: `(goal & ~eff_mask) | pre_bits`. Only literal (equality) preconditions and assignment effects can be regressed.
+
+```
+def get_successors_into(current_state, concrete_actions, out_actions, out_states, out_costs, ...) -> int
+```
+
+The allocation-free core of `get_successors`: appends each transition's action, state and cost to three caller-owned lists (structure-of-arrays instead of a list of tuples) and returns how many were added. `get_successors` calls it with fresh lists and zips the result; the A* search keeps three buffers and clears them for every expansion instead of allocating a new list of tuples per node.
+
+```
+def iter_successors(current_state, concrete_actions, registry=None) -> Iterator[tuple]
+```
+
+A generator version of `get_successors`: yields the same transitions in the same order, but only checks and applies each action when the next transition is requested, so a caller that needs just the first acceptable successor (or `min(..., key=itemgetter(2))` without an intermediate list) does no work for the rest. With a registry it simply yields the eager bitset results.
+
+### Classes
+
+```
+class ActionTable
+```
+
+A flat table of a fixed list of actions for expanding `FrozenState`s, built by the search once per call. Each plain `Action` with hashable equality preconditions, hashable assignment effects and a static cost becomes a row `(action, precondition items, assignments, assigned items, cost)`; `get_successors_into(state, ...)` then checks a row with one frozenset subset test against `state.key` and builds its successor as a `FrozenState` with `state.updated(assignments, assigned items)`, which derives the successor's key from the parent's, with no attribute lookups, method calls or Bloom prefilter. Other actions (duck-typed, comparative or arithmetic) are expanded through `get_successors_into` in their place, so the order of the transitions is unchanged. States other than `FrozenState` use `get_successors_into` directly.
+
+```
+class VectorizedActionBatch
+```
+
+Stacks the bitset masks of a fixed list of actions into `(actions, words)` uint64 arrays (`pre_mask`, `pre_bits`, `eff_mask`, `eff_bits`). `get_successors_batch(state_bits)` evaluates `((state & pre_mask) == pre_bits).all(axis=1)` to find every applicable action in one NumPy call and computes all successor rows with `(state & ~eff_mask[idx]) | eff_bits[idx]`. `expand(state_bits)` additionally returns the (static) costs of the applicable actions and, when Numba is installed, runs the module-level `_expand` kernel compiled with `numba.njit(parallel=True)`, which loops over actions with `prange`. `to_row`/`to_int` convert between encoded states and rows. The masks are rebuilt automatically when the registry gains literals. Without NumPy the same interface works on Python integers.
+
 ## Key Design Decisions
 
 1. **Dynamic Graph Generation**: Rather than pre-computing all states, the graph is explored dynamically. This is essential because the state space is potentially infinite.
 
 2. **State Immutability**: The function relies on actions properly implementing `apply_effects` to return new states rather than modifying the current state. This prevents corruption during search.
 
-3. **Action Validation**: Every action is checked with `is_possible` before generating a successor. This ensures the search only explores valid transitions.
+3. **Action Validation**: Every action is checked with `is_possible` before generating a successor. This ensures the search only explores valid transitions. When the current state is a `FrozenState` (as in the A* search), actions whose `pre_bloom` isn't covered by the state's `bloom` are rejected before `is_possible` is called (`Action` leaves `pre_bloom` at 0, filtering nothing, when a subclass overrides `is_possible`). Actions flagged `_always_possible` (no preconditions) skip the call, and actions flagged `_no_effect` (no effects) reuse the current state object instead of calling `apply_effects`; `Action` maintains both flags (leaving them unset for subclasses that override the corresponding method), duck-typed actions may set them.
 
-4. **Cost Transparency**: Action costs are passed through directly, allowing for variable costs without the graph module needing to understand cost calculation.
+4. **Cost Transparency**: Action costs are passed through directly, allowing for variable costs without the graph module needing to understand cost calculation. The precedence (`get_cost(state)`, then `static_cost`, then `cost`, then 1.0) is resolved once per action and cached as `action._cost_fn`, so the successor loop makes a single call instead of repeating the attribute checks on every expansion. Actions declaring a constant `static_cost` and no `get_cost` (every plain `Action`) skip the call entirely: their cost is read straight from that attribute. Actions may also set `_cost_fn` themselves.
 
 5. **No Goal Knowledge**: The graph module knows nothing about goals. This clean separation allows the same graph structure to be used for any goal type.
 
+6. **Tables over Generated Code**: The action list is fixed for the duration of a search, so `ActionTable` reads each action's condition tables once and expands states from a flat list of tuples. Generating straight-line Python source per action set was measured as well: it expanded states about 20% faster than the table, but compiling it costs about 50 us per action, which only pays off after roughly 150 expansions - more than most planning searches need. Building the table costs about 0.1 us per action.
+
 ## Performance Considerations
 
 - This function is called many times during search (once per explored state)
 - The efficiency of `is_possible` and `apply_effects` directly impacts planning performance
-- Generating all successors (rather than yielding them lazily) is a deliberate choice for algorithm simplicity
+- `get_successors` generates all successors (rather than yielding them lazily) for algorithm simplicity; A* needs every successor of a node anyway. `iter_successors` is the lazy alternative for callers that may stop early
+- For domains of boolean or enum-like fluents, the bitset path avoids copying a dictionary per successor; each transition is two integer operations
 
 ## Relationship to C# Original
 
@@ -78,7 +116,28 @@ The Python version creates a cleaner abstraction by:
 ---
 
 """
-def get_successors(current_state: dict, concrete_actions: list) -> list[tuple]:
+from .action import Action
+from .fluents import FluentRegistry
+from .state import FrozenState
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; VectorizedActionBatch falls back to Python ints
+    np = None
+
+try:
+    import numba
+except ImportError:  # numba is optional; _expand then runs as ordinary Python
+    numba = None
+
+
+# Bits per word of the NumPy bitset rows
+_WORD_BITS = 64
+_WORD_MASK = (1 << _WORD_BITS) - 1
+
+
+def get_successors(current_state: dict, concrete_actions: list,
+                   registry: FluentRegistry = None) -> list[tuple]:
     """
     Generate all valid state transitions from the current state.
     
@@ -87,8 +146,10 @@ def get_successors(current_state: dict, concrete_actions: list) -> list[tuple]:
     it returns the resulting state and the cost to get there.
     
     Args:
-        current_state: Dictionary representing the current world state
+        current_state: Dictionary representing the current world state, or a
+            bitset encoded with `registry` when one is given
         concrete_actions: List of Action objects that could potentially be executed
+        registry: Optional FluentRegistry; when given, states are bitsets
         
     Returns:
         List of (action, new_state, cost) tuples representing all valid transitions
@@ -97,26 +158,562 @@ def get_successors(current_state: dict, concrete_actions: list) -> list[tuple]:
         - new_state: Dictionary representing the resulting world state
         - cost: Float representing the cost of executing this action
     """
-    successors = []
+    out_actions = []
+    out_states = []
+    out_costs = []
+    get_successors_into(current_state, concrete_actions, out_actions, out_states, out_costs,
+                        registry)
+    return list(zip(out_actions, out_states, out_costs))
+
+
+def get_successors_into(current_state: dict, concrete_actions: list,
+                        out_actions: list, out_states: list, out_costs: list,
+                        registry: FluentRegistry = None) -> int:
+    """
+    Append all valid state transitions from the current state to caller-owned lists.
+    
+    Same as get_successors, but the transitions are stored as three parallel
+    lists instead of a new list of tuples. Callers expanding many states can
+    clear and reuse the same three lists for every expansion.
+    
+    Args:
+        current_state: Current world state (a bitset when registry is given)
+        concrete_actions: List of actions
+        out_actions: List receiving the action of each transition
+        out_states: List receiving the resulting state of each transition
+        out_costs: List receiving the cost of each transition
+        registry: Optional FluentRegistry; when given, states are bitsets
+        
+    Returns:
+        Number of transitions appended
+    """
+    if registry is not None:
+        return _get_bitset_successors_into(current_state, concrete_actions, registry,
+                                           out_actions, out_states, out_costs)
+    
+    # Bind everything the loop calls to locals; global and attribute
+    # lookups are a noticeable share of such a short loop body
+    count = len(out_actions)
+    add_action = out_actions.append
+    add_state = out_states.append
+    add_cost = out_costs.append
+    get_attribute = getattr
+    
+    # Frozen states carry a Bloom filter of their items; for any other
+    # state every bit is set, so the prefilter below never rejects
+    bloom = current_state.bloom if type(current_state) is FrozenState else -1
     
     # Iterate through all available actions
     for action in concrete_actions:
+        # Reject actions whose precondition literals can't all be present
+        pre_bloom = get_attribute(action, 'pre_bloom', 0)
+        if pre_bloom & bloom != pre_bloom:
+            continue
+        
         # Check if this action can be executed from the current state
-        if action.is_possible(current_state):
-            # Apply the action's effects to generate the new state
-            new_state = action.apply_effects(current_state)
+        # (actions without preconditions always can)
+        if get_attribute(action, '_always_possible', False) or action.is_possible(current_state):
+            # Apply the action's effects to generate the new state; actions
+            # without effects lead back to the (unmodified) current state
+            if get_attribute(action, '_no_effect', False):
+                new_state = current_state
+            else:
+                new_state = action.apply_effects(current_state)
+            
+            # Get the cost of executing this action through its
+            # pre-resolved cost function
+            try:
+                cost_fn = action._cost_fn
+            except AttributeError:
+                cost_fn = _cache_cost_fn(action)
+            cost = action.static_cost if cost_fn is None else cost_fn(current_state)
             
-            # Get the cost of executing this action
-            # Actions may have different cost calculation methods
-            if hasattr(action, 'get_cost'):
-                cost = action.get_cost(current_state)
-            elif hasattr(action, 'cost'):
-                cost = action.cost
+            # Add this valid transition to the output lists
+            add_action(action)
+            add_state(new_state)
+            add_cost(cost)
+    
+    return len(out_actions) - count
+
+
+def iter_successors(current_state: dict, concrete_actions: list,
+                    registry: FluentRegistry = None):
+    """
+    Lazily generate the valid state transitions from the current state.
+    
+    Yields the same (action, new_state, cost) tuples as get_successors, in
+    the same order, but checks and applies each action only when the next
+    transition is requested. Callers that stop early (e.g. after finding
+    one good enough successor) skip the remaining actions.
+    
+    Args:
+        current_state: Current world state (a bitset when registry is given)
+        concrete_actions: List of actions
+        registry: Optional FluentRegistry; when given, states are bitsets
+        
+    Yields:
+        (action, new_state, cost) tuples
+    """
+    if registry is not None:
+        # Bitset transitions are a couple of integer operations; no point
+        # in deferring them
+        yield from get_successors(current_state, concrete_actions, registry)
+        return
+    
+    bloom = current_state.bloom if type(current_state) is FrozenState else -1
+    for action in concrete_actions:
+        pre_bloom = getattr(action, 'pre_bloom', 0)
+        if pre_bloom & bloom != pre_bloom:
+            continue
+        if getattr(action, '_always_possible', False) or action.is_possible(current_state):
+            if getattr(action, '_no_effect', False):
+                new_state = current_state
             else:
-                # Default cost if no cost information is available
-                cost = 1.0
+                new_state = action.apply_effects(current_state)
+            try:
+                cost_fn = action._cost_fn
+            except AttributeError:
+                cost_fn = _cache_cost_fn(action)
+            yield action, new_state, action.static_cost if cost_fn is None else cost_fn(current_state)
+
+
+def get_predecessors(goal: dict, concrete_actions: list,
+                     registry: FluentRegistry = None) -> list[tuple]:
+    """
+    Regress a partial goal state through every action that can help achieve it.
+    
+    This is the backward counterpart of get_successors. An action is relevant
+    when at least one of its effects produces a literal of the goal and none
+    of its effects contradicts the goal. Regressing the goal through it drops
+    the literals the action achieves and adds its preconditions - the
+    resulting partial state is what must hold before the action so that the
+    goal holds after it.
+    
+    Args:
+        goal: Dictionary of required key-value pairs, or a bitset encoded with
+            `registry` when one is given
+        concrete_actions: Actions that could achieve parts of the goal
+        registry: Optional FluentRegistry; when given, goals are bitsets
+        
+    Returns:
+        List of (action, regressed_goal, cost) tuples. Actions with
+        comparative preconditions or arithmetic effects can't be regressed
+        and are skipped. Costs are computed on the regressed goal.
+    """
+    if registry is not None:
+        return _get_bitset_predecessors(goal, concrete_actions, registry)
+    
+    predecessors = []
+    
+    for action in concrete_actions:
+        regressed = _regress(goal, action)
+        if regressed is None:
+            continue
+        
+        try:
+            cost_fn = action._cost_fn
+        except AttributeError:
+            cost_fn = _cache_cost_fn(action)
+        cost = action.static_cost if cost_fn is None else cost_fn(regressed)
+        predecessors.append((action, regressed, cost))
+    
+    return predecessors
+
+
+def _regress(goal: dict, action):
+    """Regress goal through action, or return None if the action can't help."""
+    if getattr(action, '_pre_compare', None) or getattr(action, '_eff_delta', None):
+        return None
+    
+    # The action must achieve part of the goal without undoing any of it
+    effects = action.effects
+    relevant = False
+    for key, value in effects.items():
+        if key in goal:
+            if goal[key] != value:
+                return None
+            relevant = True
+    if not relevant:
+        return None
+    
+    # Preconditions must not contradict what is still required
+    regressed = {key: value for key, value in goal.items() if key not in effects}
+    for key, value in action.preconditions.items():
+        if key in regressed and regressed[key] != value:
+            return None
+        regressed[key] = value
+    return regressed
+
+
+def _get_bitset_predecessors(goal_bits: int, concrete_actions: list,
+                             registry: FluentRegistry) -> list[tuple]:
+    """
+    Bitset version of get_predecessors.
+    
+    A partial goal sets the bits of its literals only. Regression then becomes
+    `(goal & ~eff_mask) | pre_bits`, guarded by mask checks for relevance and
+    consistency.
+    """
+    predecessors = []
+    key_mask = registry.key_mask
+    
+    for action in concrete_actions:
+        pre_mask, pre_bits, eff_mask, eff_bits = registry.action_masks(action)
+        
+        # Relevant: achieves a goal literal; consistent: sets no other value
+        # of a goal key
+        if not goal_bits & eff_bits or goal_bits & eff_mask & ~eff_bits:
+            continue
+        
+        remaining = goal_bits & ~eff_mask
+        pre_keys = 0
+        for key in action.preconditions:
+            pre_keys |= key_mask(key)
+        if remaining & pre_keys & ~pre_bits:
+            continue  # A precondition contradicts the remaining goal
+        
+        regressed = remaining | pre_bits
+        try:
+            cost_fn = action._cost_fn
+        except AttributeError:
+            cost_fn = _cache_cost_fn(action)
+        cost = action.static_cost if cost_fn is None else cost_fn(registry.decode(regressed))
+        predecessors.append((action, regressed, cost))
+    
+    return predecessors
+
+
+def _default_cost(state: dict) -> float:
+    """Cost of actions that carry no cost information."""
+    return 1.0
+
+
+def _resolve_cost_fn(action):
+    """
+    Pick how an action's cost is computed, once, instead of on every expansion.
+    
+    Precedence: a callable `get_cost(state)` (including one defined by an
+    Action subclass), then a non-None `static_cost` attribute, then the `cost`
+    attribute (read at call time, so later changes to it are honoured), then
+    a default of 1.0.
+    
+    Args:
+        action: Action (or duck-typed equivalent)
+        
+    Returns:
+        None if the cost should be read from `action.static_cost`, otherwise
+        a callable taking the current state and returning the action's cost
+    """
+    get_cost = getattr(action, 'get_cost', None)
+    if callable(get_cost):
+        return get_cost
+    if getattr(action, 'static_cost', None) is not None:
+        return None
+    if hasattr(action, 'cost'):
+        return lambda state: action.cost
+    return _default_cost
+
+
+def _cache_cost_fn(action):
+    """Resolve an action's cost function and cache it as `action._cost_fn`."""
+    cost_fn = _resolve_cost_fn(action)
+    try:
+        action._cost_fn = cost_fn
+    except AttributeError:
+        # Slotted objects without a _cost_fn slot are resolved on every call
+        pass
+    return cost_fn
+
+
+def _get_bitset_successors_into(current_bits: int, concrete_actions: list,
+                                registry: FluentRegistry, out_actions: list,
+                                out_states: list, out_costs: list) -> int:
+    """
+    Bitset version of get_successors_into.
+    
+    Preconditions and effects are evaluated through the action's masks instead
+    of is_possible/apply_effects, so every check is an AND/compare and every
+    successor state is a new integer rather than a dictionary copy.
+    """
+    count = len(out_actions)
+    decoded = None
+    
+    for action in concrete_actions:
+        pre_mask, pre_bits, eff_mask, eff_bits = registry.action_masks(action)
+        if current_bits & pre_mask != pre_bits:
+            continue
+        
+        new_bits = (current_bits & ~eff_mask) | eff_bits
+        
+        try:
+            cost_fn = action._cost_fn
+        except AttributeError:
+            cost_fn = _cache_cost_fn(action)
+        if cost_fn is None:
+            cost = action.static_cost
+        else:
+            # Cost functions expect a dictionary, decoded at most once per call
+            if decoded is None:
+                decoded = registry.decode(current_bits)
+            cost = cost_fn(decoded)
+        
+        out_actions.append(action)
+        out_states.append(new_bits)
+        out_costs.append(cost)
+    
+    return len(out_actions) - count
+
+
+def _expand(state, pre_mask, pre_bits, eff_mask, eff_bits, costs):
+    """
+    Expand one bitset state against stacked action masks.
+    
+    Takes only NumPy arrays so it can be compiled by Numba, which runs the
+    per-action loops in parallel.
+    
+    Args:
+        state: (words,) uint64 row of the current state
+        pre_mask, pre_bits, eff_mask, eff_bits: (actions, words) uint64 masks
+        costs: (actions,) float64 action costs
+        
+    Returns:
+        Tuple (indices, new_states, new_costs) of the applicable actions
+    """
+    n_actions, n_words = pre_mask.shape
+    applicable = np.zeros(n_actions, dtype=np.bool_)
+    for i in prange(n_actions):
+        possible = True
+        for word in range(n_words):
+            if state[word] & pre_mask[i, word] != pre_bits[i, word]:
+                possible = False
+                break
+        applicable[i] = possible
+    
+    indices = np.flatnonzero(applicable)
+    new_states = np.empty((indices.shape[0], n_words), dtype=np.uint64)
+    new_costs = np.empty(indices.shape[0], dtype=np.float64)
+    for j in prange(indices.shape[0]):
+        i = indices[j]
+        for word in range(n_words):
+            new_states[j, word] = (state[word] & ~eff_mask[i, word]) | eff_bits[i, word]
+        new_costs[j] = costs[i]
+    return indices, new_states, new_costs
+
+
+if numba is not None:
+    prange = numba.prange
+    _expand = numba.njit(cache=True, parallel=True)(_expand)
+else:
+    prange = range
+
+
+class ActionTable:
+    """
+    Flat table of the actions, for expanding many FrozenStates.
+    
+    Built once per search. Each plain `Action` with hashable equality
+    preconditions, hashable assignment effects and a static cost becomes a
+    row of (action, precondition items, assignments, assigned items, cost):
+    it is applicable when its items are a subset of the state's, and its
+    successor is the FrozenState updated with its assignments. Other actions
+    go through get_successors_into.
+    Successors come out in the same order as from get_successors_into.
+    """
+    
+    __slots__ = ('actions', '_rows', '_tabled')
+    
+    def __init__(self, actions):
+        """
+        Build the table.
+        
+        Args:
+            actions: Concrete actions
+        """
+        self.actions = list(actions)
+        self._rows = []
+        self._tabled = 0
+        for action in self.actions:
+            row = (action, None, None, None, None)
+            if (type(action) is Action and action._pre_set is not None
+                    and not action._eff_delta and not action._no_effect
+                    and getattr(action, '_cost_fn', None) is None):
+                try:
+                    row = (action, action._pre_set, action._eff_assign,
+                           frozenset(action._eff_assign.items()), action.static_cost)
+                    self._tabled += 1
+                except TypeError:
+                    pass
+            self._rows.append(row)
+    
+    def __len__(self) -> int:
+        return len(self.actions)
+    
+    def __iter__(self):
+        return iter(self.actions)
+    
+    def get_successors_into(self, current_state, out_actions: list, out_states: list,
+                            out_costs: list) -> int:
+        """
+        Append all valid state transitions from the current state (see get_successors_into).
+        
+        Args:
+            current_state: Current world state
+            out_actions: List receiving the action of each transition
+            out_states: List receiving the resulting state of each transition
+            out_costs: List receiving the cost of each transition
+            
+        Returns:
+            Number of transitions appended
+        """
+        if type(current_state) is not FrozenState or not self._tabled:
+            return get_successors_into(current_state, self.actions, out_actions, out_states, out_costs)
+        
+        count = len(out_actions)
+        add_action = out_actions.append
+        add_state = out_states.append
+        add_cost = out_costs.append
+        items = current_state.key
+        
+        for action, pre_items, assignments, assigned_items, cost in self._rows:
+            if pre_items is None:
+                get_successors_into(current_state, (action,), out_actions, out_states, out_costs)
+            elif pre_items <= items:
+                add_action(action)
+                add_state(current_state.updated(assignments, assigned_items))
+                add_cost(cost)
+        
+        return len(out_actions) - count
+
+
+class VectorizedActionBatch:
+    """
+    Checks and applies a whole set of actions to a bitset state at once.
+    
+    The masks of all actions are stacked into (actions, words) uint64 arrays,
+    so that one NumPy expression finds every applicable action and another
+    produces all of their successor states. Without NumPy the same stacked
+    masks are kept as Python integers and processed in a comprehension.
+    """
+    
+    __slots__ = ('actions', 'registry', 'words', 'pre_mask', 'pre_bits',
+                 'eff_mask', 'eff_bits', 'costs', '_generation')
+    
+    def __init__(self, actions: list, registry: FluentRegistry):
+        """
+        Stack the bitset masks of a list of actions.
+        
+        Args:
+            actions: Actions encodable by the registry
+            registry: FluentRegistry used to encode the states
+        """
+        self.actions = list(actions)
+        self.registry = registry
+        self._build()
+    
+    def _build(self) -> None:
+        """(Re)compute the stacked masks for the registry's current literals."""
+        registry = self.registry
+        
+        # Computing masks may register new literals, which can widen the
+        # effect masks of actions processed earlier - repeat until stable
+        while True:
+            generation = registry.generation
+            masks = [registry.action_masks(action) for action in self.actions]
+            if registry.generation == generation:
+                break
+        self._generation = generation
+        
+        pre_mask, pre_bits, eff_mask, eff_bits = (
+            list(column) for column in zip(*masks)
+        ) if masks else ([], [], [], [])
+        self.words = max(1, -(-len(registry) // _WORD_BITS))
+        
+        if np is not None:
+            pre_mask, pre_bits, eff_mask, eff_bits = (
+                np.array([self._split(bits) for bits in column], dtype=np.uint64).reshape(-1, self.words)
+                for column in (pre_mask, pre_bits, eff_mask, eff_bits)
+            )
+        self.pre_mask = pre_mask
+        self.pre_bits = pre_bits
+        self.eff_mask = eff_mask
+        self.eff_bits = eff_bits
+        
+        # Static costs only - actions with state-dependent costs report
+        # their base cost here
+        costs = [
+            float(action.static_cost if getattr(action, 'static_cost', None) is not None
+                  else getattr(action, 'cost', 1.0))
+            for action in self.actions
+        ]
+        self.costs = np.array(costs, dtype=np.float64) if np is not None else costs
+    
+    def _split(self, bits: int) -> list:
+        """Split a bitset into little-endian 64-bit words."""
+        return [(bits >> (word * _WORD_BITS)) & _WORD_MASK for word in range(self.words)]
+    
+    def to_row(self, bits: int):
+        """Convert an encoded state into the batch's row format."""
+        if self.registry.generation != self._generation:
+            self._build()
+        if np is None:
+            return bits
+        return np.array(self._split(bits), dtype=np.uint64)
+    
+    def to_int(self, row) -> int:
+        """Convert a row produced by this batch back into an encoded state."""
+        if np is None:
+            return row
+        bits = 0
+        for word, value in enumerate(row.tolist()):
+            bits |= value << (word * _WORD_BITS)
+        return bits
+    
+    def get_successors_batch(self, state_bits: int):
+        """
+        Find every applicable action and compute all successor states at once.
+        
+        Args:
+            state_bits: State encoded with the batch's registry
             
-            # Add this valid transition to the successors list
-            successors.append((action, new_state, cost))
+        Returns:
+            Tuple (indices, new_states): the indices into `actions` of the
+            applicable actions and, row for row, the resulting states. With
+            NumPy these are an index array and a (k, words) uint64 array;
+            otherwise a list of ints and a list of encoded states.
+        """
+        state = self.to_row(state_bits)
+        
+        if np is None:
+            indices = [
+                i for i, (mask, bits) in enumerate(zip(self.pre_mask, self.pre_bits))
+                if state & mask == bits
+            ]
+            eff_mask, eff_bits = self.eff_mask, self.eff_bits
+            return indices, [(state & ~eff_mask[i]) | eff_bits[i] for i in indices]
+        
+        applicable = ((state & self.pre_mask) == self.pre_bits).all(axis=1)
+        indices = np.flatnonzero(applicable)
+        new_states = (state & ~self.eff_mask[indices]) | self.eff_bits[indices]
+        return indices, new_states
     
-    return successors
\ No newline at end of file
+    def expand(self, state_bits: int):
+        """
+        Like get_successors_batch, but also returns the applicable actions' costs.
+        
+        Uses the Numba-compiled kernel when Numba is installed.
+        
+        Args:
+            state_bits: State encoded with the batch's registry
+            
+        Returns:
+            Tuple (indices, new_states, costs)
+        """
+        if numba is not None:
+            return _expand(self.to_row(state_bits), self.pre_mask, self.pre_bits,
+                           self.eff_mask, self.eff_bits, self.costs)
+        
+        indices, new_states = self.get_successors_batch(state_bits)
+        if np is None:
+            return indices, new_states, [self.costs[i] for i in indices]
+        return indices, new_states, self.costs[indices]
+
@@ -20,8 +20,8 @@ This file formalizes what was `PermutationSelectorGenerators.cs` in the C# proje
 - **Why Cartesian product**: When an action has multiple parameters, we need all valid combinations to ensure the planner doesn't miss optimal solutions.
 
 ## Dependencies
-- **Imports**: None (pure Python)
-- **Used by**: `planner.py` (calls generate_action_variants to expand action templates)
+- **Imports**: `itertools.product`
+- **Used by**: `planner.py` (calls generate_all_action_variants to expand action templates)
 - **Uses**: `action.py` (creates new Action instances)
 
 ## Implementation Structure
@@ -57,7 +57,8 @@ Concrete parameterizer that retrieves a collection from the agent's world state.
 ```
 def generate_action_variants(                   (lines 58-120)
     action_template: Action, 
-    state: dict) -> list[Action]
+    state: dict,
+    prune_fn=None) -> list[Action]
 ```
 
 The module's core function that transforms a single action template into multiple concrete instances. The process:
@@ -67,6 +68,22 @@ The module's core function that transforms a single action template into multipl
 4. Creates a new Action instance for each combination
 5. Returns the complete list of concrete actions
 
+When a `prune_fn(partial_parameters, state)` is given, combinations are instead built depth-first, one parameter at a time, and the check runs after each parameter is bound. As soon as it returns False for a partial binding (e.g. a target that isn't reachable), the whole subtree of combinations extending it is skipped without ever being materialized - the same way e-commerce variant generators skip incompatible attribute values. Variants come out in the same order as without pruning.
+
+The loop that copies the template and assigns parameters is generated per parameter schema (`_variant_builder`): for parameters `('target', 'weapon')` it unpacks each combination straight into locals and calls `set_parameter('target', _0)`, `set_parameter('weapon', _1)`, with no per-parameter `zip` or inner loop. Builders are cached by parameter names, so all templates with the same schema share one.
+
+```
+def iter_action_variants(action_template, state, prune_fn=None) -> Iterator[Action]
+```
+
+The lazy counterpart of `generate_action_variants`, producing the same variants in the same order. Variants are created one at a time as the caller iterates, so a caller looking for the first acceptable variant doesn't pay for the rest. Parameterizers run on the first request.
+
+```
+def generate_all_action_variants(action_templates, state) -> list[Action]
+```
+
+Expands a whole set of templates, as the planner does on every cycle. The result is the concatenation of `generate_action_variants` for each template, but templates that share one parameterizers dictionary have its values generated once for the batch.
+
 This is not a "god function" despite its length because it has a single, well-defined responsibility: combinatorial generation of action variants.
 
 ### Methods
@@ -84,7 +101,7 @@ Stores a static collection of values that will be returned regardless of world s
 ```
 def generate(self, state: dict) -> list         (SelectFromCollection: lines 33-38)
 ```
-Simply returns the static collection provided during initialization, ignoring the world state.
+Simply returns the static collection provided during initialization, ignoring the world state. `None` values are filtered out once, at construction, and each call returns a fresh copy of the filtered list.
 
 ```
 def __init__(self, state_key: str)              (SelectFromState: lines 43-46)
@@ -94,19 +111,26 @@ Stores the key to look up in the world state dictionary.
 ```
 def generate(self, state: dict) -> list         (SelectFromState: lines 49-55)
 ```
-Retrieves and returns the collection found at `state[state_key]`, with appropriate error handling for missing keys.
+Retrieves and returns the collection found at `state[state_key]`, with appropriate error handling for missing keys. The value's exact type is looked up in `_SELECT_DISPATCH` (lists, tuples and sets are filtered for `None`; strings and numbers are wrapped as single values); only other types go through the generic iterable checks. Every call reads the state afresh and returns a new list.
 
 ## Key Design Decisions
 
 1. **Composition over Configuration**: Actions compose parameterizers rather than using configuration flags. This makes the system more extensible.
 
-2. **Eager Generation**: All variants are generated upfront rather than lazily. This simplifies the planner and search algorithms at the cost of memory.
+2. **Eager Generation**: The planner generates all variants upfront rather than lazily. This simplifies the planner and search algorithms, which revisit the whole action list on every expansion, at the cost of memory. `iter_action_variants` is available for callers that may stop early.
 
 3. **Immutable Templates**: Action templates are not modified; new instances are created. This prevents surprising side effects.
 
 4. **State-Driven**: Parameterizers receive the full world state, allowing complex logic for parameter generation without coupling to specific state structures.
 
 5. **List-Based Returns**: Parameterizers return lists (not generators) to ensure the full parameter space is available for planning.
+   The built-in parameterizers declare `__slots__` (the base class an empty one), so they carry no per-instance `__dict__`; custom subclasses get one back unless they declare their own `__slots__`.
+
+6. **Fresh Selections**: `SelectFromState` reads its collection from the state on every call rather than caching it by state version: an executor that removes a dead enemy from `state['enemies']` in place would otherwise keep generating variants that target it. Templates that share a parameterizers dictionary still share one selection within a `generate_all_action_variants` call.
+
+7. **Early Pruning**: Filtering finished variants costs one copy per combination even when most are infeasible. An optional `prune_fn` rejects partial bindings instead, so the work saved grows with the size of the pruned subtree.
+
+8. **Generated Variant Loops**: A template is expanded on every planning cycle with the same parameter names, so the variant loop is specialized once per schema by generating its source. Parameter names are embedded with `repr`, so only string names are specialized; templates with other names use the generic loop.
 
 ## Example Usage (Conceptual)
 
@@ -138,7 +162,40 @@ The Python version improves on the C# design by:
 """
 from abc import ABC, abstractmethod
 from itertools import product
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
+
+
+# Returned by _parameter_space when some parameter has no possible values
+_NO_VARIANTS = object()
+
+# Compiled variant builders, keyed by (parameter names, use_setter)
+_BUILDER_CACHE: Dict[tuple, Callable] = {}
+_MAX_CACHED_BUILDERS = 256
+
+
+def _non_none_items(collection) -> List[Any]:
+    """List the items of a collection, skipping None values."""
+    return [item for item in collection if item is not None]
+
+
+def _single_value(value) -> List[Any]:
+    """Wrap a scalar value in a list."""
+    return [value]
+
+
+# SelectFromState handlers by exact value type; subclasses and other types
+# fall back to the generic checks in SelectFromState.generate
+_SELECT_DISPATCH = {
+    list: _non_none_items,
+    tuple: _non_none_items,
+    set: _non_none_items,
+    frozenset: _non_none_items,
+    str: _single_value,
+    bytes: _single_value,
+    int: _single_value,
+    float: _single_value,
+    bool: _single_value,
+}
 
 
 class Parameterizer(ABC):
@@ -149,6 +206,8 @@ class Parameterizer(ABC):
     for action parameters based on the current world state.
     """
     
+    __slots__ = ()
+    
     @abstractmethod
     def generate(self, state: Dict[str, Any]) -> List[Any]:
         """Generate possible parameter values based on world state.
@@ -169,6 +228,8 @@ class SelectFromCollection(Parameterizer):
     such as weapon types, spell schools, or movement directions.
     """
     
+    __slots__ = ('collection', '_values')
+    
     def __init__(self, collection: List[Any]):
         """Initialize with a static collection of values.
         
@@ -178,6 +239,9 @@ class SelectFromCollection(Parameterizer):
         if not isinstance(collection, list):
             raise TypeError("Collection must be a list")
         self.collection = collection.copy()  # Defensive copy
+        # The collection never changes, so None values are filtered once here
+        # rather than on every generate() call
+        self._values = [item for item in collection if item is not None]
     
     def generate(self, state: Dict[str, Any]) -> List[Any]:
         """Return the static collection, ignoring world state.
@@ -186,9 +250,9 @@ class SelectFromCollection(Parameterizer):
             state: Current world state (ignored)
             
         Returns:
-            Copy of the static collection
+            Copy of the static collection, without None values
         """
-        return [item for item in self.collection if item is not None]
+        return self._values.copy()
 
 
 class SelectFromState(Parameterizer):
@@ -198,6 +262,8 @@ class SelectFromState(Parameterizer):
     such as visible enemies, available items, or discovered locations.
     """
     
+    __slots__ = ('state_key',)
+    
     def __init__(self, state_key: str):
         """Initialize with the key to look up in world state.
         
@@ -219,54 +285,121 @@ class SelectFromState(Parameterizer):
         Returns:
             List from state at state_key, or empty list if not found
         """
-        if self.state_key not in state:
+        # A missing key and a None value both mean "no candidates"
+        value = state.get(self.state_key)
+        if value is None:
             return []
         
-        value = state[self.state_key]
+        # Common types are resolved with a single dictionary lookup
+        handler = _SELECT_DISPATCH.get(type(value))
+        if handler is not None:
+            return handler(value)
         
         # Handle different types of collections
-        if isinstance(value, list):
-            return [item for item in value if item is not None]
-        elif hasattr(value, '__iter__') and not isinstance(value, (str, bytes)):
+        if hasattr(value, '__iter__') and not isinstance(value, (str, bytes)):
             # Handle other iterables (sets, tuples, etc.)
             return [item for item in value if item is not None]
         else:
             # Single value - wrap in list
-            return [value] if value is not None else []
+            return [value]
 
 
-def generate_action_variants(action_template, state: Dict[str, Any]) -> List:
-    """Generate all possible concrete instances of an action template.
+def _pruned_product(parameter_names: List[str], parameter_values: List[List[Any]],
+                    prune_fn: Callable[[Dict[str, Any], Dict[str, Any]], bool],
+                    state: Dict[str, Any]):
+    """Depth-first Cartesian product that skips infeasible partial combinations.
     
-    Takes an action template with parameterizers and generates all possible
-    combinations of parameter values based on the current world state.
+    Binds parameters in order and asks prune_fn about every partial binding;
+    when it returns False, no combination extending that binding is produced.
+    
+    Args:
+        parameter_names: Parameter names, in binding order
+        parameter_values: Candidate values for each parameter
+        prune_fn: Feasibility check taking (partial_parameters, state)
+        state: Current world state dictionary
+        
+    Yields:
+        Tuples of parameter values, in the same order as itertools.product
+    """
+    depth = len(parameter_names)
+    partial = {}
+    combination = []
+    # One iterator per bound parameter; the last one is the one advancing
+    iterators = [iter(parameter_values[0])]
+    while iterators:
+        level = len(iterators) - 1
+        name = parameter_names[level]
+        for value in iterators[-1]:
+            partial[name] = value
+            if prune_fn(partial, state):
+                break
+        else:
+            # This level is exhausted - backtrack
+            iterators.pop()
+            partial.pop(name, None)
+            if combination:
+                combination.pop()
+            continue
+        
+        combination.append(value)
+        if level + 1 == depth:
+            yield tuple(combination)
+            combination.pop()
+        else:
+            iterators.append(iter(parameter_values[level + 1]))
+
+
+def _parameter_space(action_template, state: Dict[str, Any], prune_fn):
+    """Validate a template and compute its parameter combinations.
     
     Args:
         action_template: Action template with parameterizers attribute
         state: Current world state dictionary
+        prune_fn: Optional feasibility check (see generate_action_variants)
         
     Returns:
-        List of concrete action instances with all parameter combinations
-        
-    Raises:
-        AttributeError: If action_template lacks required attributes
-        TypeError: If parameterizers is not a dictionary
+        None if the template has no parameters to vary (it is its own only
+        variant), _NO_VARIANTS if some parameterizer produced no values, and
+        otherwise a tuple (parameter_names, combinations, use_setter)
     """
     # Validate input
     if not hasattr(action_template, 'parameterizers'):
-        # No parameterizers - return single copy of the template
-        return [action_template]
+        return None
     
     parameterizers = action_template.parameterizers
     
     if parameterizers is None or len(parameterizers) == 0:
-        # No parameterizers - return single copy of the template  
-        return [action_template]
+        return None
+    
+    values = _parameter_values(parameterizers, state)
+    if values is _NO_VARIANTS:
+        return _NO_VARIANTS
+    parameter_names, parameter_values = values
+    use_setter = _uses_setter(action_template)
+    
+    # Walk the Cartesian product of all parameter combinations in one flat
+    # itertools.product iteration, or depth-first when pruning
+    if prune_fn is None:
+        combinations = product(*parameter_values)
+    else:
+        combinations = _pruned_product(parameter_names, parameter_values, prune_fn, state)
+    return parameter_names, combinations, use_setter
+
+
+def _parameter_values(parameterizers, state: Dict[str, Any]):
+    """Generate the possible values of every parameter.
     
+    Args:
+        parameterizers: Non-empty dictionary of parameter names to Parameterizers
+        state: Current world state dictionary
+        
+    Returns:
+        _NO_VARIANTS if some parameterizer produced no values, otherwise a
+        tuple (parameter_names, parameter_values)
+    """
     if not isinstance(parameterizers, dict):
         raise TypeError("Parameterizers must be a dictionary")
     
-    # Generate all possible parameter values
     parameter_names = []
     parameter_values = []
     
@@ -278,41 +411,196 @@ def generate_action_variants(action_template, state: Dict[str, Any]) -> List:
         
         # If any parameterizer returns empty list, no variants possible
         if not values:
-            return []
+            return _NO_VARIANTS
         
         parameter_names.append(param_name)
         parameter_values.append(values)
     
-    # Generate Cartesian product of all parameter combinations
-    variants = []
+    return tuple(parameter_names), parameter_values
+
+
+def _uses_setter(action_template) -> bool:
+    """Check the template's interface once, before any variant is created."""
+    assert hasattr(action_template, 'copy'), "Action template must have a copy() method"
+    use_setter = hasattr(action_template, 'set_parameter')
+    assert use_setter or hasattr(action_template, 'parameters'), \
+        "Action template must have a set_parameter() method"
+    return use_setter
+
+
+def _variant_builder(parameter_names: tuple, use_setter: bool):
+    """Return a function building the variants for one parameter schema.
+    
+    The generated function takes the template's copy method and an iterable
+    of combinations and returns the list of variants. Its loop unpacks each
+    combination into locals and assigns every parameter by name, with no
+    per-parameter iteration or zip. Builders are cached by schema, so every
+    template with the same parameter names shares one.
+    
+    Args:
+        parameter_names: Parameter names (strings), in combination order
+        use_setter: Whether to call set_parameter or write to parameters
+        
+    Returns:
+        Function (copy, combinations) -> list of variants
+    """
+    cache_key = (parameter_names, use_setter)
+    build = _BUILDER_CACHE.get(cache_key)
+    if build is not None:
+        return build
+    
+    targets = ''.join(f'_{i}, ' for i in range(len(parameter_names)))
+    if use_setter:
+        assign = ['        set_parameter = variant.set_parameter\n'] + [
+            f'        set_parameter({name!r}, _{i})\n' for i, name in enumerate(parameter_names)
+        ]
+    else:
+        assign = [
+            '        parameters = variant.parameters\n',
+            '        if parameters is None:\n',
+            '            parameters = variant.parameters = {}\n',
+        ] + [f'        parameters[{name!r}] = _{i}\n' for i, name in enumerate(parameter_names)]
+    source = (
+        'def build(copy, combinations):\n'
+        '    variants = []\n'
+        '    add = variants.append\n'
+        f'    for {targets}in combinations:\n'
+        '        variant = copy()\n'
+        + ''.join(assign) +
+        '        add(variant)\n'
+        '    return variants\n'
+    )
+    namespace = {}
+    exec(compile(source, '<variant builder>', 'exec'), namespace)
+    build = namespace['build']
+    
+    if len(_BUILDER_CACHE) >= _MAX_CACHED_BUILDERS:
+        del _BUILDER_CACHE[next(iter(_BUILDER_CACHE))]
+    _BUILDER_CACHE[cache_key] = build
+    return build
+
+
+def generate_action_variants(action_template, state: Dict[str, Any],
+                             prune_fn: Optional[Callable[[Dict[str, Any], Dict[str, Any]], bool]] = None) -> List:
+    """Generate all possible concrete instances of an action template.
     
-    if not parameter_values:
-        # No parameters to vary - return single copy
+    Takes an action template with parameterizers and generates all possible
+    combinations of parameter values based on the current world state.
+    
+    Args:
+        action_template: Action template with parameterizers attribute
+        state: Current world state dictionary
+        prune_fn: Optional feasibility check called with (partial_parameters,
+            state) each time another parameter is bound; returning False
+            discards every combination extending that partial binding
+        
+    Returns:
+        List of concrete action instances with all parameter combinations
+        
+    Raises:
+        AttributeError: If action_template lacks required attributes
+        TypeError: If parameterizers is not a dictionary
+    """
+    space = _parameter_space(action_template, state, prune_fn)
+    if space is None:
+        # No parameterizers - the template is the only variant
         return [action_template]
+    if space is _NO_VARIANTS:
+        return []
     
-    # Use itertools.product to generate all combinations
-    for combination in product(*parameter_values):
-        # Create new action instance (copy of template)
-        # This assumes action_template has a copy() method or similar
-        if hasattr(action_template, 'copy'):
-            variant = action_template.copy()
+    parameter_names, combinations, use_setter = space
+    if all(type(name) is str for name in parameter_names):
+        return _variant_builder(parameter_names, use_setter)(action_template.copy, combinations)
+    return list(_iter_variants(action_template, parameter_names, combinations, use_setter))
+
+
+def iter_action_variants(action_template, state: Dict[str, Any],
+                         prune_fn: Optional[Callable[[Dict[str, Any], Dict[str, Any]], bool]] = None):
+    """Lazily generate the concrete instances of an action template.
+    
+    Yields the same variants as generate_action_variants, in the same order,
+    but creates each one only when it is requested. Parameterizers run and
+    the template is validated on the first request.
+    
+    Args:
+        action_template: Action template with parameterizers attribute
+        state: Current world state dictionary
+        prune_fn: Optional feasibility check (see generate_action_variants)
         
+    Yields:
+        Concrete action instances, one per parameter combination
+        
+    Raises:
+        AttributeError: If action_template lacks required attributes
+        TypeError: If parameterizers is not a dictionary
+    """
+    space = _parameter_space(action_template, state, prune_fn)
+    if space is None:
+        # No parameterizers - the template is the only variant
+        yield action_template
+    elif space is not _NO_VARIANTS:
+        yield from _iter_variants(action_template, *space)
+
+
+def _iter_variants(action_template, parameter_names: tuple, combinations, use_setter: bool):
+    """Create one variant per combination, as they are requested."""
+    copy = action_template.copy
+    for combination in combinations:
+        variant = copy()
+        if use_setter:
+            set_parameter = variant.set_parameter
+            for param_name, param_value in zip(parameter_names, combination):
+                set_parameter(param_name, param_value)
         else:
-            assert False, "Action template must have a copy() method"
+            if variant.parameters is None:
+                variant.parameters = {}
+            variant.parameters.update(zip(parameter_names, combination))
+        yield variant
 
-        
-        # Set parameters on the variant
-        for param_name, param_value in zip(parameter_names, combination):
-            if hasattr(variant, 'set_parameter'):
-                variant.set_parameter(param_name, param_value)
-            elif hasattr(variant, 'parameters'):
-                if not hasattr(variant, 'parameters') or variant.parameters is None:
-                    variant.parameters = {}
-                variant.parameters[param_name] = param_value
-            else:
-                assert False, "Action template must have a set_parameter() method"
 
+def generate_all_action_variants(action_templates, state: Dict[str, Any]) -> List:
+    """Generate the concrete instances of several action templates.
+    
+    Equivalent to concatenating generate_action_variants for each template,
+    but templates that share the same parameterizers dictionary (e.g.,
+    several combat actions built with one `{'target': ...}` dict) have
+    their parameter values generated once for the whole batch.
+    
+    Args:
+        action_templates: Iterable of action templates
+        state: Current world state dictionary
+        
+    Returns:
+        List of concrete action instances, grouped by template in order
         
-        variants.append(variant)
+    Raises:
+        AttributeError: If a template lacks required attributes
+        TypeError: If a template's parameterizers is not a dictionary
+    """
+    variants = []
+    # Parameter values per parameterizers dictionary, keyed by identity;
+    # the dictionaries stay alive through their templates for the call
+    shared_values = {}
+    
+    for action_template in action_templates:
+        parameterizers = getattr(action_template, 'parameterizers', None)
+        if parameterizers is None or len(parameterizers) == 0:
+            # No parameterizers - the template is the only variant
+            variants.append(action_template)
+            continue
+        
+        values = shared_values.get(id(parameterizers))
+        if values is None:
+            values = shared_values[id(parameterizers)] = _parameter_values(parameterizers, state)
+        if values is _NO_VARIANTS:
+            continue
+        
+        parameter_names, parameter_values = values
+        use_setter = _uses_setter(action_template)
+        combinations = product(*parameter_values)
+        if all(type(name) is str for name in parameter_names):
+            variants.extend(_variant_builder(parameter_names, use_setter)(action_template.copy, combinations))
+        else:
+            variants.extend(_iter_variants(action_template, parameter_names, combinations, use_setter))
     
-    return variants
\ No newline at end of file
+    return variants
@@ -22,14 +22,14 @@ This creates a two-level optimization: the planner optimizes across goals while
 ## Dependencies
 - **Imports**: Functions from other modules
 - **Used by**: `agent.py` (calls orchestrate_planning to get new plans)
-- **Uses**: `parameters.py` (generate_action_variants), `search.py` (astar_pathfind), goal classes from `goal.py`
+- **Uses**: `parameters.py` (generate_all_action_variants), `search.py` (astar_pathfind), goal classes from `goal.py`
 
 ## Implementation Structure
 
 ### Helper Functions
 
 ```
-def _calculate_plan_utility(                    (lines 15-22)
+def _calculate_plan_utility(                    (lines 123-141)
     plan_cost: float, 
     goal: BaseGoal) -> float
 ```
@@ -37,7 +37,14 @@ def _calculate_plan_utility(                    (lines 15-22)
 Private helper that calculates the utility of a plan. The typical implementation uses `goal.weight / plan_cost`, creating a natural trade-off between goal importance and plan expense. Higher weight goals can justify more expensive plans.
 
 ```
-def _find_plan_for_goal(                        (lines 25-45)
+def _min_action_cost(                           (lines 144-168)
+    concrete_actions: list[Action]) -> float | None
+```
+
+Private helper that returns the cheapest cost of any concrete action, resolved like the graph module does (`static_cost`, then `cost`, then 1.0). `orchestrate_planning` uses it to bound the utility any plan for a goal could reach. Returns None when an action's cost depends on the state, since no bound is valid then.
+
+```
+def _find_plan_for_goal(                        (lines 171-188)
     goal: BaseGoal, 
     start_state: dict, 
     concrete_actions: list[Action]) -> list[Action] | None
@@ -51,24 +58,25 @@ Private helper that delegates the actual pathfinding to the search module for a
 ### Main Functions
 
 ```
-def orchestrate_planning(                       (lines 48-125)
+def orchestrate_planning(                       (lines 191-257)
     agent: Agent) -> list[Action] | None
 ```
 
 The public-facing function of the module. This is the entry point called by agents when they need a new plan. The function follows a clear process:
 
-1. **Action Generation Phase** (lines 55-65)
+1. **Action Generation Phase** (lines 207-214)
    - Iterates through the agent's abstract action templates
-   - Calls `generate_action_variants` for each template
+   - Calls `generate_all_action_variants` once for all templates, so templates sharing parameterizers are expanded together
    - Builds a complete list of all possible concrete actions in the current state
 
-2. **Goal Evaluation Phase** (lines 67-115)
-   - Loops through each of the agent's goals
+2. **Goal Evaluation Phase** (lines 216-253)
+   - Loops through the agent's goals, heaviest first
+   - Skips goals whose optimistic utility bound (weight over the cheapest action's cost) can't beat the best plan so far
    - Calls `_find_plan_for_goal` to get a potential plan
    - If a plan exists, calculates its utility using `_calculate_plan_utility`
    - Tracks the best plan found so far
 
-3. **Plan Selection Phase** (lines 117-125)
+3. **Plan Selection Phase** (lines 255-257)
    - Returns the plan with the highest utility
    - Returns None if no valid plans were found for any goal
 
@@ -84,6 +92,8 @@ The public-facing function of the module. This is the entry point called by agen
 
 5. **Separation of Concerns**: The planner knows about goals and utility but delegates pathfinding to the search module. This prevents the planning logic from becoming a "god function."
 
+6. **Branch and Bound**: The search is by far the most expensive step, and most goals can't win once a good plan is known. Every plan for an unsatisfied goal contains at least one concrete action, so no plan costs less than the cheapest one, and `weight / cheapest cost` bounds a goal's utility from above. Goals are evaluated heaviest first so a strong plan is found early, and goals whose bound can't beat it are never searched. Ties between equal utilities still go to the goal listed first, so the selected plan is the same as evaluating every goal in order. With zero or negative action costs the bound is infinite and nothing is skipped. `_min_action_cost` resolves costs like the graph module (`static_cost`, then `cost`, then 1.0, so duck-typed actions without a `cost` are supported) and returns None when any action has a state-dependent `get_cost`, which turns the bound off.
+
 ## Integration Notes
 
 The planner acts as the critical bridge between:
@@ -106,7 +116,7 @@ The Python version improves clarity by:
 ---
 
 """
-from .parameters import generate_action_variants
+from .parameters import generate_all_action_variants
 from .search import astar_pathfind
 
 
@@ -131,6 +141,33 @@ def _calculate_plan_utility(plan_cost: float, goal) -> float:
     return goal.weight / plan_cost
 
 
+def _min_action_cost(concrete_actions: list):
+    """
+    Cheapest cost of any concrete action, for bounding plan utilities.
+    
+    Costs are resolved with the same precedence as the graph module's
+    successor generation: a constant `static_cost`, then `cost`, then 1.0.
+    
+    Args:
+        concrete_actions: List of all concrete actions available
+        
+    Returns:
+        The cheapest cost (0.0 without actions), or None if any action's cost
+        depends on the state (`get_cost` or its own `_cost_fn`), in which case
+        no bound is valid
+    """
+    cheapest = None
+    for action in concrete_actions:
+        if callable(getattr(action, 'get_cost', None)) or getattr(action, '_cost_fn', None) is not None:
+            return None
+        cost = getattr(action, 'static_cost', None)
+        if cost is None:
+            cost = getattr(action, 'cost', 1.0)
+        if cheapest is None or cost < cheapest:
+            cheapest = cost
+    return 0.0 if cheapest is None else cheapest
+
+
 def _find_plan_for_goal(goal, start_state: dict, concrete_actions: list):
     """
     Find a plan to achieve a specific goal using A* search.
@@ -169,17 +206,32 @@ def orchestrate_planning(agent):
     """
     # Phase 1: Action Generation
     # Generate all possible concrete actions from the agent's action templates
-    concrete_actions = []
-    for action_template in agent.actions:
-        action_variants = generate_action_variants(action_template, agent.state)
-        concrete_actions.extend(action_variants)
+    concrete_actions = generate_all_action_variants(agent.actions, agent.state)
+    
+    # A plan for an unsatisfied goal takes at least one action, so (with
+    # positive costs) it can't cost less than the cheapest concrete action.
+    # None when costs depend on the state: then every goal is searched.
+    min_action_cost = _min_action_cost(concrete_actions)
     
     # Phase 2: Goal Evaluation  
     # Evaluate each goal and find the best plan
     best_plan = None
     best_utility = 0.0
+    best_rank = -1
     
-    for goal in agent.goals:
+    # Heavier goals first: a good plan found early lets the optimistic bound
+    # below skip the searches for goals that could never beat it. Ties are
+    # still won by the goal listed first, as if evaluated in order.
+    ranked_goals = sorted(enumerate(agent.goals), key=lambda item: -item[1].weight)
+    
+    for rank, goal in ranked_goals:
+        # Skip the search if even a one-step plan of the cheapest action
+        # couldn't beat the best plan so far
+        if min_action_cost is not None:
+            utility_bound = _calculate_plan_utility(min_action_cost, goal)
+            if utility_bound < best_utility or (utility_bound == best_utility and rank > best_rank):
+                continue
+        
         # Check if goal is already satisfied
         if goal.is_satisfied(agent.state):
             continue
@@ -195,9 +247,10 @@ def orchestrate_planning(agent):
             utility = _calculate_plan_utility(plan_cost, goal)
             
             # Track if this is the best plan so far
-            if utility > best_utility:
+            if utility > best_utility or (utility == best_utility and rank < best_rank):
                 best_utility = utility
                 best_plan = plan
+                best_rank = rank
     
     # Phase 3: Plan Selection
     # Return the plan with the highest utility (or None if no plans found)
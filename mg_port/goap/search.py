@@ -30,7 +30,7 @@ The module does NOT know about:
 ## Dependencies
 - **Imports**: `heapq` for priority queue implementation
 - **Used by**: `planner.py` (calls astar_pathfind for each goal)
-- **Uses**: `graph.py` (calls get_successors), `goal.py` (calls is_satisfied)
+- **Uses**: `graph.py` (expands states through an ActionTable with reused buffers), `action.py` (reads the effect tables of plain Actions for numeric heuristic bounds), `state.py` (FrozenState), `fluents.py` (FluentRegistry for bitset searches), `goal.py` (calls is_satisfied)
 
 ## Implementation Structure
 
@@ -46,11 +46,14 @@ Private helper class that represents a node in the search tree. Stores:
 - `parent`: Reference to parent node for path reconstruction
 - `g_score`: Actual cost from start to this node
 - `h_score`: Heuristic estimate from this node to goal
+- `f_score`: `g_score + h_score`, computed once on creation
+
+Nodes declare `__slots__`: a search creates one per queued successor, and slots drop the per-instance `__dict__`.
 
 ```
 def __lt__(self, other) -> bool                (lines 31-35)
 ```
-Implements less-than comparison based on f-score (g + h). This allows SearchNode objects to be used directly in Python's heapq, which maintains a min-heap based on this comparison.
+Implements less-than comparison based on f-score (g + h), so nodes can be ordered directly. The search itself doesn't rely on it: its heap holds `(f, h, count, node)` tuples (see Key Design Decisions).
 
 ### Helper Functions
 
@@ -74,6 +77,16 @@ Private helper that estimates the "distance" from a state to a goal. Implements
 
 The heuristic must be admissible (never overestimate) for A* to guarantee optimal plans.
 
+```
+def _numeric_goal_units(
+    goal: BaseGoal, 
+    concrete_actions: list[Action]) -> list | None
+```
+
+Private helper that bounds the cost of reaching each numeric value of a plain `Goal`: for every such key it returns the cheapest cost per unit of change among the actions that affect it, where an action moves a key by its arithmetic effect (`"+5"`) or, for an assignment guarded by a numeric equality precondition on the same key (`pos == 3` -> `pos = 4`), by the difference. Keys that can be moved arbitrarily far, or that an action changes together with another goal key, get no bound. Returns None when no key is bounded or an action isn't a plain `Action` with a static cost.
+
+`_numeric_excess(state, numeric_bounds)` computes what these bounds add to the unmet-condition count for a state.
+
 ### Main Function
 
 ```
@@ -87,7 +100,7 @@ The main A* implementation. The algorithm proceeds in phases:
 
 1. **Initialization** (lines 105-120)
    - Create start node with g=0 and h=heuristic
-   - Initialize open set (heapq) with start node
+   - Initialize open set (heapq) with the start node's entry
    - Initialize closed set (set) for visited states
    - Create g_score tracking dictionary
 
@@ -104,9 +117,11 @@ The main A* implementation. The algorithm proceeds in phases:
 3. **Failure Case** (lines 182-190)
    - Return None if open set empty (no path exists)
 
+With a `registry` (a `FluentRegistry`), the same search runs in `_astar_pathfind_bits` on states encoded as integers: the start state is encoded once, successors come from the graph module's bitset path, and a plain `Goal` becomes the bits of its desired literals - satisfied when `state & goal_bits == goal_bits`, with the count of unset goal bits as its heuristic (identical to the unmet-condition count). Other goal types are evaluated on decoded states.
+
 ## Key Design Decisions
 
-1. **Immutable State Tracking**: States are used as dictionary keys, so they must be immutable (converted to frozen representations).
+1. **Immutable State Tracking**: States are used as dictionary keys, so they must be immutable. The start state and every successor are converted to a `FrozenState`, which serves as its own key: its hash is computed once when it is created, where the sorted tuple of items it replaces was rebuilt and rehashed on every lookup (and required sortable keys). Frozen states also enable the graph module's Bloom prefilter. Within one search, successors are interned in a plain dict keyed by state: a state reached again is replaced by the first instance, so its closed-set and g-score lookups match by identity instead of comparing contents (about 40% fewer full comparisons on the benchmark schema). The table lives only as long as the search, so it never holds states that are no longer needed.
 
 2. **Lazy Successor Evaluation**: Successors are only generated when a node is explored, not when it's discovered.
 
@@ -116,6 +131,14 @@ The main A* implementation. The algorithm proceeds in phases:
 
 5. **Admissible Heuristics**: All heuristic implementations are designed to be admissible, ensuring optimal plans.
 
+6. **Set-Based Goal Checks**: For a plain `Goal`, the search freezes its desired items once and compares them against the items every `FrozenState` already holds as a frozenset: `goal_items <= state.key` replaces `is_satisfied`, and `len(goal_items - state.key)` replaces the per-key heuristic loop with the same count. Both are single C-level set operations. Other goal types (and `Goal` subclasses) use `is_satisfied` and `_calculate_heuristic`.
+
+7. **Heap Entries Carry Their Keys**: The open set holds `(f, h, count, node)` tuples rather than nodes, so every heap comparison is a C-level tuple comparison of precomputed floats instead of a call to `_SearchNode.__lt__` that adds up both scores of both nodes. Among equal f-scores the node with the lower heuristic - the one closer to the goal - is expanded first, and the insertion count settles any remaining tie in FIFO order (and means nodes themselves are never compared).
+
+8. **Optional Bitset Search**: Domains whose actions only have equality preconditions and assignment effects can be searched on integer states by passing a `FluentRegistry`. Hashing, set lookups, applicability checks and effects then cost a few integer operations each, instead of operations on dictionaries. It is opt-in because encoding fails (`ValueError`) for comparative preconditions and arithmetic effects, which stay on the dictionary path.
+
+9. **Distance-Aware Goal Heuristic**: Counting unmet conditions treats a position 10 steps away like one a single step away, so A* explores broadly on numeric problems. When `_numeric_goal_units` finds bounds for a plain `Goal`, each unmet numeric condition contributes `max(distance * cost per unit, 1)` instead of 1 (in the bitset search, only the bounded keys are decoded for this). This stays admissible under the same assumption as the count: the cheapest way to close a gap of `d` units costs at least `d` times the cheapest per-unit cost, and keys changed together by one action are left at 1 so no action's cost is counted twice. On the 12x12 grid benchmark, the search expands a handful of nodes instead of thousands.
+
 ## Performance Characteristics
 
 - Time complexity: O(b^d) where b is branching factor and d is depth
@@ -139,23 +162,29 @@ The Python version benefits from:
 """
 import heapq
 from typing import Optional
+from .action import Action
 from .goal import BaseGoal, Goal, ComparativeGoal, ExtremeGoal, ComparisonOperator
-from .graph import get_successors
+from .fluents import FluentRegistry
+from .graph import ActionTable, get_successors, get_successors_into
+from .state import FrozenState
 
 
 class _SearchNode:
     """Private helper class representing a node in the A* search tree."""
     
+    __slots__ = ('state', 'action', 'parent', 'g_score', 'h_score', 'f_score')
+    
     def __init__(self, state: dict, action=None, parent=None, g_score: float = 0, h_score: float = 0):
         self.state = state
         self.action = action  # Action that led to this state (None for start)
         self.parent = parent  # Reference to parent node for path reconstruction
         self.g_score = g_score  # Actual cost from start to this node
         self.h_score = h_score  # Heuristic estimate from this node to goal
+        self.f_score = g_score + h_score  # Estimated total cost through this node
     
     def __lt__(self, other) -> bool:
         """Implements less-than comparison based on f-score (g + h) for heapq."""
-        return (self.g_score + self.h_score) < (other.g_score + other.h_score)
+        return self.f_score < other.f_score
 
 
 def _reconstruct_path(end_node: '_SearchNode') -> list:
@@ -197,8 +226,7 @@ def _calculate_heuristic(state: dict, goal: BaseGoal) -> float:
         cost = 0.0
         for key, comparison_pair in goal.conditions.items():
             if key not in state:
-                cost += float('inf')  # Missing key is infinite cost
-                continue
+                return float('inf')  # Missing key is infinite cost
             
             current_value = state[key]
             target_value = comparison_pair.value
@@ -232,14 +260,10 @@ def _calculate_heuristic(state: dict, goal: BaseGoal) -> float:
         # ExtremeGoal: Distance from current value to optimization direction
         cost = 0.0
         for key, maximize in goal.optimizations.items():
-            if key not in state:
-                cost += float('inf')
-                continue
-            
-            current_value = state[key]
+            # A missing or non-numeric value makes the cost infinite, whatever the other keys add
+            current_value = state.get(key)
             if not isinstance(current_value, (int, float)):
-                cost += float('inf')
-                continue
+                return float('inf')
             
             # For extreme goals, we use the inverse of the current value as heuristic
             # This encourages moving toward higher values (for maximize) or lower values (for minimize)
@@ -256,53 +280,190 @@ def _calculate_heuristic(state: dict, goal: BaseGoal) -> float:
     return 0.0
 
 
-def astar_pathfind(start_state: dict, goal: BaseGoal, concrete_actions: list) -> Optional[list]:
+def _literal_goal_items(goal: BaseGoal) -> Optional[frozenset]:
+    """
+    Return the desired (key, value) items of a plain Goal as a frozenset, or
+    None for other goal types, subclasses (which may override is_satisfied)
+    and goals with unhashable values.
+    """
+    if type(goal) is not Goal:
+        return None
+    try:
+        return frozenset(goal.desired_state.items())
+    except TypeError:
+        return None
+
+
+def _is_number(value) -> bool:
+    """Whether value is an int or float (bools excluded)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _numeric_goal_units(goal: BaseGoal, concrete_actions: list) -> Optional[list]:
+    """
+    Per-unit cost bounds for the numeric conditions of a plain Goal.
+    
+    For every numeric desired value, finds the cheapest cost per unit of
+    change among the actions that affect its key: an arithmetic effect
+    ("+5") moves the key by its amount, and an assignment guarded by a
+    numeric equality precondition on the same key (pos == 3 -> pos = 4)
+    by the difference. Any other effect on the key can move it arbitrarily
+    far, so the key gets no bound. Keys that some action changes together
+    with another goal key get no bound either, so the per-key costs can be
+    added up.
+    
+    Returns:
+        List of (key, desired value, cost per unit) for the keys with a
+        positive bound, or None when there are none or an action's effects
+        or cost can't be inspected
+    """
+    if type(goal) is not Goal:
+        return None
+    desired = {key: value for key, value in goal.desired_state.items() if _is_number(value)}
+    if not desired:
+        return None
+    goal_keys = goal.desired_state.keys()
+    
+    units = dict.fromkeys(desired, float('inf'))
+    for action in concrete_actions:
+        if type(action) is not Action or getattr(action, '_cost_fn', None) is not None:
+            return None
+        keys = action._eff_keys & desired.keys()
+        if not keys:
+            continue
+        shared = len(action._eff_keys & goal_keys) > 1
+        pre_equal = dict(action._pre_equal)
+        for key in keys:
+            step = float('inf')
+            if key in action._eff_assign:
+                value = action._eff_assign[key]
+                if _is_number(value) and _is_number(pre_equal.get(key)) and \
+                        not any(k == key for k, _ in action._pre_compare):
+                    step = abs(value - pre_equal[key])
+            else:
+                for delta_key, modifier, _ in action._eff_delta:
+                    if delta_key == key:
+                        step = abs(modifier)
+            if step == 0:
+                continue
+            units[key] = 0.0 if shared else min(units[key], action.static_cost / step)
+    
+    bounds = [(key, desired[key], unit) for key, unit in units.items()
+              if 0.0 < unit < float('inf')]
+    return bounds or None
+
+
+def _numeric_excess(state: dict, numeric_bounds: list) -> float:
+    """
+    How much the bounded numeric conditions (see _numeric_goal_units) add to
+    the unmet-condition count: each unmet one costs at least its distance
+    times its cost per unit, instead of 1.
+    """
+    excess = 0.0
+    for key, desired_value, unit in numeric_bounds:
+        value = state.get(key)
+        if value != desired_value and _is_number(value):
+            excess += max(abs(value - desired_value) * unit, 1.0) - 1.0
+    return excess
+
+
+def astar_pathfind(start_state: dict, goal: BaseGoal, concrete_actions: list,
+                   registry: FluentRegistry = None) -> Optional[list]:
     """
     The main A* implementation. Finds the cheapest path from start_state to a state
     that satisfies the goal using the provided concrete actions.
     
+    When a FluentRegistry is given, the search runs on states encoded as
+    bitsets (see _astar_pathfind_bits); every action must then be encodable.
+    
     Returns a list of actions to execute, or None if no path exists.
     """
-    # Convert state to immutable representation for dictionary keys
-    def make_hashable_state(state):
-        return tuple(sorted(state.items()))
+    if registry is not None:
+        return _astar_pathfind_bits(start_state, goal, concrete_actions, registry)
+    
+    # Search over FrozenStates: they are their own set/dictionary keys and
+    # hash their items once, instead of on every lookup
+    start_state = FrozenState(start_state)
+    
+    # A plain Goal compares against the items each FrozenState precomputes:
+    # it is satisfied when its items are a subset of the state's, and its
+    # heuristic (the number of unmet conditions) is the size of the difference
+    goal_items = _literal_goal_items(goal)
+    numeric_bounds = _numeric_goal_units(goal, concrete_actions) if goal_items is not None else None
+    if numeric_bounds is not None:
+        # An unmet numeric condition costs at least its distance times the
+        # cheapest cost per unit of change, rather than a flat 1
+        def heuristic(state):
+            return len(goal_items - state.key) + _numeric_excess(state, numeric_bounds)
+        
+        def is_satisfied(state):
+            return goal_items <= state.key
+    elif goal_items is not None:
+        def heuristic(state):
+            return len(goal_items - state.key)
+        
+        def is_satisfied(state):
+            return goal_items <= state.key
+    else:
+        def heuristic(state):
+            return _calculate_heuristic(state, goal)
+        
+        is_satisfied = goal.is_satisfied
     
     # Phase 1: Initialization
-    start_h = _calculate_heuristic(start_state, goal)
+    start_h = heuristic(start_state)
     start_node = _SearchNode(start_state, None, None, 0.0, start_h)
     
-    # Open set (priority queue) - nodes to be evaluated
-    open_set = [start_node]
-    heapq.heapify(open_set)
+    # Open set (priority queue) - nodes to be evaluated, as
+    # (f-score, h-score, insertion count, node) entries (see _push_node)
+    open_set = [(start_h, start_h, 0, start_node)]
+    pushed = 0
     
     # Closed set - states we've already evaluated
     closed_set = set()
     
     # Track best known g-score for each state
-    g_scores = {make_hashable_state(start_state): 0.0}
+    g_scores = {start_state: 0.0}
+    
+    # Canonical instance of every state seen, so repeated states compare by identity
+    intern = {start_state: start_state}.setdefault
+    
+    # Successor buffers, cleared and reused for every expansion
+    succ_actions = []
+    succ_states = []
+    succ_costs = []
+    
+    # Read the actions' condition tables once for all expansions
+    expand = ActionTable(concrete_actions).get_successors_into
     
     # Phase 2: Main Search Loop
     while open_set:
         # Pop the node with lowest f-score
-        current_node = heapq.heappop(open_set)
-        current_state_key = make_hashable_state(current_node.state)
+        current_node = heapq.heappop(open_set)[3]
+        current_state_key = current_node.state
         
         # Check if we've already processed this state with a better path
         if current_state_key in closed_set:
             continue
         
         # Check if goal is satisfied
-        if goal.is_satisfied(current_node.state):
+        if is_satisfied(current_node.state):
             return _reconstruct_path(current_node)
         
         # Add current state to closed set
         closed_set.add(current_state_key)
         
         # Get all successor states
-        successors = get_successors(current_node.state, concrete_actions)
+        succ_actions.clear()
+        succ_states.clear()
+        succ_costs.clear()
+        expand(current_node.state, succ_actions, succ_states, succ_costs)
         
-        for action, new_state, action_cost in successors:
-            new_state_key = make_hashable_state(new_state)
+        for action, new_state, action_cost in zip(succ_actions, succ_states, succ_costs):
+            if type(new_state) is not FrozenState:
+                new_state = FrozenState(new_state)
+            new_state = intern(new_state, new_state)
+            new_state_key = new_state
             
             # Skip if already fully evaluated
             if new_state_key in closed_set:
@@ -317,11 +478,104 @@ def astar_pathfind(start_state: dict, goal: BaseGoal, concrete_actions: list) ->
                 g_scores[new_state_key] = tentative_g
                 
                 # Calculate heuristic for new state
-                h_score = _calculate_heuristic(new_state, goal)
+                h_score = heuristic(new_state)
                 
                 # Create new node and add to open set
                 new_node = _SearchNode(new_state, action, current_node, tentative_g, h_score)
-                heapq.heappush(open_set, new_node)
+                pushed += 1
+                heapq.heappush(open_set, (tentative_g + h_score, h_score, pushed, new_node))
     
     # Phase 3: Failure Case - no path exists
-    return None
\ No newline at end of file
+    return None
+
+
+def _astar_pathfind_bits(start_state: dict, goal: BaseGoal, concrete_actions: list,
+                         registry: FluentRegistry) -> Optional[list]:
+    """
+    astar_pathfind over states encoded as integers by registry.
+    
+    Every state is a single int, so hashing, closed-set lookups and successor
+    generation are integer operations. A plain Goal is compiled to the bits of
+    its desired literals: it is satisfied when all of them are set, and its
+    heuristic (the number of unmet conditions) is the number that aren't, plus
+    the distance-aware excess of its bounded numeric conditions.
+    Other goal types are evaluated on decoded states.
+    
+    Raises:
+        ValueError: If an action can't be encoded (see FluentRegistry.action_masks)
+    """
+    start_bits = registry.encode(start_state)
+    
+    if type(goal) is Goal:
+        goal_bits = registry.encode(goal.desired_state)
+        
+        def is_satisfied(bits):
+            return bits & goal_bits == goal_bits
+        
+        numeric_bounds = _numeric_goal_units(goal, concrete_actions)
+        if numeric_bounds is None:
+            def heuristic(bits):
+                return float((goal_bits & ~bits).bit_count())
+        else:
+            # Decode only the bounded keys (their masks grow as the actions
+            # register literals, so they are read on every call)
+            key_mask = registry.key_mask
+            decode = registry.decode
+            numeric_keys = [key for key, _, _ in numeric_bounds]
+            
+            def heuristic(bits):
+                mask = 0
+                for key in numeric_keys:
+                    mask |= key_mask(key)
+                return float((goal_bits & ~bits).bit_count()) + \
+                    _numeric_excess(decode(bits & mask), numeric_bounds)
+    else:
+        decode = registry.decode
+        
+        def is_satisfied(bits):
+            return goal.is_satisfied(decode(bits))
+        
+        def heuristic(bits):
+            return _calculate_heuristic(decode(bits), goal)
+    
+    start_h = heuristic(start_bits)
+    open_set = [(start_h, start_h, 0, _SearchNode(start_bits, None, None, 0.0, start_h))]
+    pushed = 0
+    closed_set = set()
+    g_scores = {start_bits: 0.0}
+    
+    succ_actions = []
+    succ_states = []
+    succ_costs = []
+    
+    while open_set:
+        current_node = heapq.heappop(open_set)[3]
+        current_bits = current_node.state
+        
+        if current_bits in closed_set:
+            continue
+        
+        if is_satisfied(current_bits):
+            return _reconstruct_path(current_node)
+        
+        closed_set.add(current_bits)
+        
+        succ_actions.clear()
+        succ_states.clear()
+        succ_costs.clear()
+        get_successors_into(current_bits, concrete_actions,
+                            succ_actions, succ_states, succ_costs, registry)
+        
+        for action, new_bits, action_cost in zip(succ_actions, succ_states, succ_costs):
+            if new_bits in closed_set:
+                continue
+            
+            tentative_g = current_node.g_score + action_cost
+            if tentative_g < g_scores.get(new_bits, float('inf')):
+                g_scores[new_bits] = tentative_g
+                h_score = heuristic(new_bits)
+                new_node = _SearchNode(new_bits, action, current_node, tentative_g, h_score)
+                pushed += 1
+                heapq.heappush(open_set, (tentative_g + h_score, h_score, pushed, new_node))
+    
+    return None
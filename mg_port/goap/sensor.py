@@ -86,6 +86,8 @@ In the agent's `step()` method, sensors are run first, before planning or action
 The execution order is critical: Sense → Plan → Act.
 """
 class Sensor:
+    __slots__ = ('name', 'callback')
+    
     def __init__(self, name: str, callback: callable):
         """Initialize a sensor with an identifying name and callback function.
         
@@ -5,6 +5,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from goap.action import Action, ExecutionStatus
+from goap.state import FrozenState
 
 
 def test_execution_status():
@@ -80,6 +81,25 @@ def test_action_initialization():
     assert action3.preconditions["health"] == 100
     assert action3.effects["health"] == 50
 
+    # They are read-only; changing them means assigning new dictionaries
+    for mapping in (action3.preconditions, action3.effects):
+        try:
+            mapping["health"] = 0
+            assert False, "Should not allow in-place changes"
+        except TypeError:
+            pass
+    action3.preconditions = {"health": 100, "mana": 5}
+    assert not action3.is_possible({"health": 100})
+    assert action3.is_possible({"health": 100, "mana": 5})
+
+    # The static cost mirrors the (state-independent) cost
+    assert action3.static_cost == 1.0
+    action3.cost = 4.0
+    assert action3.static_cost == 4.0
+
+    # Actions are slotted - no per-instance __dict__
+    assert not hasattr(action3, "__dict__")
+
     print("✓ Action initialization works correctly")
 
 
@@ -179,6 +199,27 @@ def test_is_possible():
         invalid_name_state
     ), "Should not be possible with wrong name"
 
+    # Frozen states are checked with a subset test, with the same results
+    literal = Action("literal", 1.0, {"has_key": True, "name": "player1"}, {}, None)
+    for state in ({"has_key": True, "name": "player1", "x": 1}, {"has_key": True},
+                  {"has_key": 1, "name": "player1"}, {"has_key": False, "name": "player1"}):
+        assert literal.is_possible(FrozenState(state)) == literal.is_possible(state)
+    assert comp_action._pre_set is None  # Comparisons need the generic path
+    assert comp_action.is_possible(FrozenState(valid_comp_state)) == comp_action.is_possible(valid_comp_state)
+
+    # Empty preconditions/effects are flagged for get_successors
+    empty = Action("empty", 1.0, {}, {}, None)
+    assert empty._always_possible and empty._no_effect
+    assert not comp_action._always_possible
+
+    # Reassigning preconditions/effects refreshes the precomputed tables
+    comp_action.preconditions = {"gold": ">= 10"}
+    comp_action.effects = {"gold": "-10", "has_sword": True}
+    assert comp_action.is_possible({"gold": 15})
+    assert not comp_action.is_possible({"gold": 5})
+    assert not comp_action.is_possible({"name": "player1"})
+    assert comp_action.apply_effects({"gold": 15}) == {"gold": 5.0, "has_sword": True}
+
     print("✓ is_possible() method works correctly")
 
 
@@ -471,6 +512,87 @@ def test_integration_readiness():
     print("✓ Integration readiness verified")
 
 
+def test_compiled_preconditions():
+    """Test that compiled precondition checks match the generic loop."""
+    print("Testing compiled preconditions...")
+
+    def executor(agent):
+        return ExecutionStatus.SUCCEEDED
+
+    preconditions = {"has_key": True, "position": "door", "count": 3, "items": ("key",), 1: None}
+    action = Action("open_door", 1.0, preconditions, {"door_open": True}, executor)
+    assert action._pre_check is not None
+
+    generic = Action("open_door", 1.0, preconditions, {"door_open": True}, executor)
+    generic._pre_check = None
+    states = [
+        dict(preconditions),
+        {**preconditions, "extra": 1},
+        {**preconditions, "count": 3.0},
+        {**preconditions, "has_key": 1},
+        {**preconditions, "items": ("key", "map")},
+        {key: value for key, value in preconditions.items() if key != 1},
+        {},
+    ]
+    for state in states:
+        assert action.is_possible(state) == generic.is_possible(state)
+    assert action.is_possible(states[0]) == True
+    assert action.is_possible(states[5]) == False
+    print("✓ Compiled checks agree with the generic loop")
+
+    # Identical literal preconditions share one compiled function
+    variant = Action("open_door_2", 1.0, {"has_key": True}, {}, executor)
+    other = Action("open_door_3", 2.0, {"has_key": True}, {"door_open": True}, executor)
+    assert variant._pre_check is other._pre_check
+    print("✓ Identical precondition sets share compiled code")
+
+    # Comparative preconditions keep the generic loop
+    heal = Action("heal", 1.0, {"health": "< 50", "alive": True}, {}, executor)
+    assert heal._pre_check is None
+    assert heal.is_possible({"health": 20, "alive": True}) == True
+    print("✓ Comparative preconditions use the generic loop")
+
+
+def test_copy_shares_tables():
+    """Test that copies share condition tables but not mutable containers."""
+    print("Testing Action.copy...")
+
+    def executor(agent):
+        return ExecutionStatus.SUCCEEDED
+
+    template = Action("attack", 2.0, {"has_weapon": True, "health": "> 10"},
+                      {"enemy_hp": "-10", "alerted": True}, executor, [lambda state: []])
+    template.set_parameter("target", "goblin")
+    variant = template.copy()
+
+    # Every slot except the lazily cached cost function is carried over
+    for slot in Action.__slots__:
+        if slot == "_cost_fn":
+            continue
+        assert getattr(variant, slot) is getattr(template, slot) or slot in ("parameters", "parameterizers"), slot
+    assert variant.parameters == template.parameters
+    assert variant.parameters is not template.parameters
+    assert variant.parameterizers == template.parameterizers
+    assert variant.parameterizers is not template.parameterizers
+    print("✓ Copies share preconditions, effects and their tables")
+
+    # Parameters, parameterizers and reassigned conditions are independent
+    variant.set_parameter("target", "orc")
+    variant.parameterizers.append(lambda state: [])
+    variant.preconditions = {}
+    assert template.parameters["target"] == "goblin"
+    assert len(template.parameterizers) == 1
+    try:
+        variant.effects["alerted"] = False  # Shared effects can't leak changes
+        assert False, "Should not allow in-place changes"
+    except TypeError:
+        pass
+    assert template.preconditions == {"has_weapon": True, "health": "> 10"}
+    assert not template.is_possible({"has_weapon": False, "health": 50})
+    assert variant.is_possible({})
+    print("✓ Copies can be modified independently")
+
+
 def test_action_comprehensive():
     """Run all comprehensive tests."""
     print("Running comprehensive Action tests...")
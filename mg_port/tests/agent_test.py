@@ -4,8 +4,8 @@ from goap.agent import Agent, StepMode
 from goap.action import Action, ExecutionStatus
 from goap.goal import Goal
 from goap.sensor import Sensor
-from goap import planner
 from unittest.mock import patch
+from collections import deque
 
 # ============================================================================
 # TEST FUNCTIONS
@@ -74,77 +74,50 @@ def test_step_method():
         execution_log.append("action_executed")
         return ExecutionStatus.SUCCEEDED
     
-    # Mock planner module
-    class MockPlanner:
-        @staticmethod
-        def orchestrate_planning(agent):
-            execution_log.append("planning_called")
-            return [Action(name="planned_action", cost=1.0, preconditions={}, effects={}, executor=logging_action)]
-    
-    # Replace planner temporarily
-    import sys
-    from types import ModuleType
-    
-    mock_planner = ModuleType('planner')
-    mock_planner.orchestrate_planning = MockPlanner.orchestrate_planning
-    
-    original_planner = sys.modules.get('goap.planner')
-    sys.modules['goap.planner'] = mock_planner
-    
-    # Also replace the imported planner module in this module
-    global planner
-    original_local_planner = planner
-    planner = mock_planner
-    
-    try:
-        # Create agent
-        agent = Agent(
-            name="test_agent",
-            initial_state={"test": "value"},
-            actions=[Action(name="test_action", cost=1.0, preconditions={}, effects={}, executor=logging_action)],
-            goals=[Goal(name="test_goal", desired_state={"goal": "achieved"})],
-            sensors=[Sensor(name="logging_sensor", callback=logging_sensor)]
-        )
-        
-        # Test step with no plan (should trigger planning)
-        execution_log.clear()
-        agent.step()
-        
-        # Verify sense-plan-act sequence
-        expected_sequence = ["sensor_ran", "planning_called", "action_executed"]
-        assert execution_log == expected_sequence
-        assert agent.state.get('sensor_updated') == True
-        print('✓ step() runs sensors, plans, and acts in sequence')
-        
-        # Test step with existing plan (should not trigger planning)
-        execution_log.clear()
-        agent.current_plan = [Action(name="existing_action", cost=1.0, preconditions={}, effects={}, executor=logging_action)]
-        agent.step()
-        
-        # Should only run sensors and execute action
-        expected_sequence = ["sensor_ran", "action_executed"]
-        assert execution_log == expected_sequence
-        print('✓ step() skips planning when plan exists')
-        
-        # Test ONE_ACTION mode
-        execution_log.clear()
-        agent.current_plan = None  # Force planning
-        agent.step(StepMode.ONE_ACTION)
-        
-        # Should behave same as DEFAULT for planning
-        expected_sequence = ["sensor_ran", "planning_called", "action_executed"]
-        assert execution_log == expected_sequence
-        print('✓ ONE_ACTION mode works correctly')
-        
-    finally:
-        # Restore original planner
-        if original_planner:
-            sys.modules['goap.planner'] = original_planner
-        else:
-            sys.modules.pop('goap.planner', None)
-        
-        # Restore local planner import
-        planner = original_local_planner
+    # Mock planning function, injected into the agent
+    def mock_orchestrate_planning(agent):
+        execution_log.append("planning_called")
+        return [Action(name="planned_action", cost=1.0, preconditions={}, effects={}, executor=logging_action)]
+    
+    # Create agent
+    agent = Agent(
+        name="test_agent",
+        initial_state={"test": "value"},
+        actions=[Action(name="test_action", cost=1.0, preconditions={}, effects={}, executor=logging_action)],
+        goals=[Goal(name="test_goal", desired_state={"goal": "achieved"})],
+        sensors=[Sensor(name="logging_sensor", callback=logging_sensor)],
+        planner_fn=mock_orchestrate_planning
+    )
+    
+    # Test step with no plan (should trigger planning)
+    execution_log.clear()
+    agent.step()
+    
+    # Verify sense-plan-act sequence
+    expected_sequence = ["sensor_ran", "planning_called", "action_executed"]
+    assert execution_log == expected_sequence
+    assert agent.state.get('sensor_updated') == True
+    print('✓ step() runs sensors, plans, and acts in sequence')
+    
+    # Test step with existing plan (should not trigger planning)
+    execution_log.clear()
+    agent.current_plan = [Action(name="existing_action", cost=1.0, preconditions={}, effects={}, executor=logging_action)]
+    agent.step()
+    
+    # Should only run sensors and execute action
+    expected_sequence = ["sensor_ran", "action_executed"]
+    assert execution_log == expected_sequence
+    print('✓ step() skips planning when plan exists')
+    
+    # Test ONE_ACTION mode
+    execution_log.clear()
+    agent.current_plan = None  # Force planning
+    agent.step(StepMode.ONE_ACTION)
+    
+    # Should behave same as DEFAULT for planning
+    expected_sequence = ["sensor_ran", "planning_called", "action_executed"]
+    assert execution_log == expected_sequence
+    print('✓ ONE_ACTION mode works correctly')
     
     print('All step method tests passed!')
 
@@ -178,8 +151,14 @@ def test_execution_states():
     original_plan_length = len(agent.current_plan)
     agent._execute_current_action()
     assert len(agent.current_plan) == original_plan_length - 1
+    assert isinstance(agent.current_plan, deque)  # Assigned lists become deques
     print('✓ SUCCEEDED actions are removed from plan')
     
+    # Completing the last action clears the plan
+    agent._execute_current_action()
+    assert agent.current_plan is None
+    print('✓ Fully consumed plans are cleared')
+    
     # Test FAILED status
     def failing_action(agent):
         return ExecutionStatus.FAILED
@@ -264,6 +243,19 @@ def test_edge_cases():
     assert agent.state['counter'] == 2
     print('✓ Sensors properly update agent state')
     
+    # step() calls plain sensors' callbacks directly, but still honors overridden run()
+    class DoublingSensor(Sensor):
+        __slots__ = ()
+        
+        def run(self, agent_state):
+            self.callback(agent_state)
+            self.callback(agent_state)
+    
+    agent.sensors.append(DoublingSensor(name="doubling_sensor", callback=state_updating_sensor))
+    agent.step()
+    assert agent.state['counter'] == 5
+    print('✓ step() runs plain and overridden sensors')
+    
     # Test defensive copying
     original_actions = [Action(name="original", cost=1.0, preconditions={}, effects={}, executor=dummy_executor)]
     original_goals = [Goal(name="original", desired_state={})]
@@ -309,57 +301,94 @@ def test_planning_integration():
         })
         return [Action(name="planned", cost=1.0, preconditions={}, effects={}, executor=lambda a: ExecutionStatus.SUCCEEDED)]
     
-    # Mock planner temporarily
-    import sys
-    from types import ModuleType
-    
-    mock_planner = ModuleType('planner')
-    mock_planner.orchestrate_planning = mock_orchestrate_planning
-    
-    original_planner = sys.modules.get('goap.planner')
-    sys.modules['goap.planner'] = mock_planner
-    
-    # Also replace the imported planner module in this module
-    global planner
-    original_local_planner = planner
-    planner = mock_planner
-    
-    try:
-        agent = Agent(
-            name="planner_test",
-            initial_state={"test": "state"},
-            actions=[Action(name="available", cost=1.0, preconditions={}, effects={}, executor=lambda a: ExecutionStatus.SUCCEEDED)],
-            goals=[Goal(name="target", desired_state={"achieved": True})],
-            sensors=[Sensor(name="null_sensor", callback=lambda s: None)]
-        )
-        
-        # Test planning call
-        planner_calls.clear()
-        agent._find_new_plan()
-        
-        assert len(planner_calls) == 1
-        call = planner_calls[0]
-        assert call['agent_name'] == "planner_test"
-        assert 'test' in call['state_keys']
-        assert call['num_actions'] == 1
-        assert call['num_goals'] == 1
-        assert agent.current_plan is not None
-        assert len(agent.current_plan) == 1
-        print('✓ Planner integration works correctly')
-        
-    finally:
-        # Restore original planner
-        if original_planner:
-            sys.modules['goap.planner'] = original_planner
-        else:
-            sys.modules.pop('goap.planner', None)
-        
-        # Restore local planner import
-        planner = original_local_planner
+    agent = Agent(
+        name="planner_test",
+        initial_state={"test": "state"},
+        actions=[Action(name="available", cost=1.0, preconditions={}, effects={}, executor=lambda a: ExecutionStatus.SUCCEEDED)],
+        goals=[Goal(name="target", desired_state={"achieved": True})],
+        sensors=[Sensor(name="null_sensor", callback=lambda s: None)],
+        planner_fn=mock_orchestrate_planning
+    )
+    
+    # Test planning call
+    planner_calls.clear()
+    agent._find_new_plan()
+    
+    assert len(planner_calls) == 1
+    call = planner_calls[0]
+    assert call['agent_name'] == "planner_test"
+    assert 'test' in call['state_keys']
+    assert call['num_actions'] == 1
+    assert call['num_goals'] == 1
+    assert agent.current_plan is not None
+    assert len(agent.current_plan) == 1
+    print('✓ Planner integration works correctly')
+    
+    # Planner is skipped when every goal is already satisfied
+    planner_calls.clear()
+    agent.state['achieved'] = True
+    agent._find_new_plan()
+    assert planner_calls == []
+    assert agent.current_plan is None
+    print('✓ Planner skipped when all goals are satisfied')
+    
+    # Without planner_fn the agent uses the real planner
+    from goap.planner import orchestrate_planning
+    default_agent = Agent(name="default", initial_state={}, actions=[], goals=[], sensors=[])
+    assert default_agent._plan_fn is orchestrate_planning
+    print('✓ Default planner is orchestrate_planning')
     
     print('All planner integration tests passed!')
 
 
+def test_replanning_after_failure():
+    """Test that failed planning is retried, including after goal and state changes."""
+    print('Testing replanning after failed planning...')
+    
+    planner_calls = []
+    
+    def failing_orchestrate_planning(agent):
+        planner_calls.append(agent.state_version)
+        return None
+    
+    enemies = ['orc', 'troll']
+    
+    def vision_sensor(state):
+        state['enemies'] = enemies
+    
+    agent = Agent(
+        name="replan_test",
+        initial_state={},
+        actions=[],
+        goals=[],
+        sensors=[Sensor(name="vision", callback=vision_sensor)],
+        planner_fn=failing_orchestrate_planning
+    )
+    
+    # No goals - nothing to plan for
+    agent.step()
+    assert planner_calls == []
+    
+    # A goal added later is planned for, even though the state didn't change
+    agent.goals.append(Goal(name="target", desired_state={"enemy_dead": True}))
+    agent.step()
+    assert len(planner_calls) == 1
+    print('✓ Goals added after a failed plan trigger planning')
+    
+    # Failed planning is retried on later steps
+    agent.step()
+    assert len(planner_calls) == 2
+    
+    # A list changed in place and written back is a new state version
+    enemies.remove('orc')
+    agent.step()
+    assert len(planner_calls) == 3
+    assert planner_calls[1] != planner_calls[2]
+    print('✓ In-place changes written back by sensors are new state versions')
+    
+    print('All replanning tests passed!')
+
+
 if __name__ == "__main__":
     test_basic_functionality()
     test_step_method()
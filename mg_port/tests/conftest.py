@@ -0,0 +1,30 @@
+"""Shared pytest fixtures for the goap test suite."""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def mock_action_cls():
+    """Action-like class with parameter support, built once per test session."""
+
+    class MockAction:
+        def __init__(self, name='test', cost=1.0, preconditions=None, effects=None,
+                     executor=None, parameterizers=None):
+            self.name = name
+            self.cost = cost
+            self.preconditions = preconditions or {}
+            self.effects = effects or {}
+            self.executor = executor or (lambda: None)
+            self.parameterizers = parameterizers
+            self.parameters = {}
+
+        def copy(self):
+            new_action = MockAction(self.name, self.cost, self.preconditions.copy(),
+                                    self.effects.copy(), self.executor, self.parameterizers)
+            new_action.parameters = self.parameters.copy()
+            return new_action
+
+        def set_parameter(self, name, value):
+            self.parameters[name] = value
+
+    return MockAction
@@ -0,0 +1,71 @@
+"""Tests for fluents.py module using pytest conventions."""
+
+from goap.action import Action, ExecutionStatus
+from goap.fluents import FluentRegistry
+
+
+def _executor(agent):
+    return ExecutionStatus.SUCCEEDED
+
+
+def test_encode_decode():
+    """Test that states round-trip through the bitset encoding."""
+    print('Testing FluentRegistry encode/decode...')
+
+    registry = FluentRegistry()
+    state = {'has_key': True, 'door_open': False, 'position': 'center'}
+    bits = registry.encode(state)
+
+    assert len(registry) == 3
+    assert bin(bits).count('1') == 3
+    assert registry.decode(bits) == state
+    assert registry.decode(0) == {}
+    print('✓ States round-trip through bitsets')
+
+    # Each value of a key gets its own bit
+    north = registry.bit('position', 'north')
+    assert north != registry.bit('position', 'center')
+    assert registry.key_mask('position') == north | registry.bit('position', 'center')
+    print('✓ Enum-like fluents use one bit per value')
+
+    # Re-registering a literal is stable and doesn't bump the generation
+    generation = registry.generation
+    assert registry.encode(state) == bits
+    assert registry.generation == generation
+    print('✓ Known literals keep their bits')
+
+    print('All encode/decode tests passed!')
+
+
+def test_action_masks():
+    """Test precondition and effect masks of actions."""
+    print('Testing FluentRegistry action masks...')
+
+    registry = FluentRegistry()
+    open_door = Action('open_door', 1.0, {'has_key': True}, {'door_open': True}, _executor)
+    state = registry.encode({'has_key': True, 'door_open': False})
+
+    pre_mask, pre_bits, eff_mask, eff_bits = registry.action_masks(open_door)
+    assert state & pre_mask == pre_bits
+    new_state = (state & ~eff_mask) | eff_bits
+    assert registry.decode(new_state) == {'has_key': True, 'door_open': True}
+    print('✓ Masks check preconditions and apply effects')
+
+    # Cached masks are reused until a new literal appears
+    assert registry.action_masks(open_door) is registry.action_masks(open_door)
+    registry.bit('door_open', 'broken')
+    _, _, eff_mask, _ = registry.action_masks(open_door)
+    assert eff_mask & registry.bit('door_open', 'broken')
+    print('✓ Masks are refreshed when a key gains a value')
+
+    # Comparative preconditions and arithmetic effects can't be encoded
+    for action in (Action('heal', 1.0, {'health': '< 50'}, {}, _executor),
+                   Action('eat', 1.0, {}, {'health': '+10'}, _executor)):
+        try:
+            registry.action_masks(action)
+            assert False, 'Non-literal actions should not be encodable'
+        except ValueError:
+            pass
+    print('✓ Non-literal actions are rejected')
+
+    print('All action mask tests passed!')
@@ -89,6 +89,7 @@ def test_inheritance():
         assert hasattr(goal, 'weight')
         assert hasattr(goal, 'is_satisfied')
         assert callable(goal.is_satisfied)
+        assert not hasattr(goal, '__dict__')  # Goals are slotted
     
     print('✓ Polymorphism works correctly')
     print('All inheritance tests passed!')
@@ -111,6 +112,24 @@ def test_edge_cases():
     assert none_goal.is_satisfied({}) == False
     print('✓ None value handling works')
     
+    # Test reassigning desired_state
+    reassigned_goal = Goal('reassigned', 1.0, {'a': 1})
+    reassigned_goal.desired_state = {'b': 2}
+    assert reassigned_goal.is_satisfied({'b': 2}) == True
+    assert reassigned_goal.is_satisfied({'a': 1}) == False
+    print('✓ Reassigned desired state is used')
+    
+    # Test that desired_state cannot drift from the satisfaction snapshot
+    read_only_goal = Goal('read_only', 1.0, {'a': 1})
+    try:
+        read_only_goal.desired_state['b'] = 2
+        assert False, "desired_state should be read-only"
+    except TypeError:
+        pass
+    assert read_only_goal.desired_state == {'a': 1}
+    assert read_only_goal.is_satisfied({'a': 1}) == True
+    print('✓ Desired state is read-only')
+    
     # Test NOT_EQUALS operator (Python enhancement)
     not_eq_conditions = {
         'status': ComparisonValuePair(ComparisonOperator.NOT_EQUALS, 'dead')
@@ -182,6 +201,146 @@ def test_performance_characteristics():
     print('All performance tests passed!')
 
 
+def test_satisfaction_memoization():
+    """Test that satisfaction checks are memoized on versioned state."""
+    print('Testing satisfaction memoization...')
+    from goap.state import VersionedDict
+    
+    calls = []
+    
+    class CountingGoal(Goal):
+        def _check_desired_state(self, state):
+            calls.append(state)
+            return super()._check_desired_state(state)
+    
+    goal = CountingGoal('memo', 1.0, {'door_open': True})
+    
+    # Repeated checks against unchanged versioned state hit the cache
+    state = VersionedDict({'door_open': False})
+    assert goal.is_satisfied(state) == False
+    assert goal.is_satisfied(state) == False
+    assert len(calls) == 1
+    print('✓ Unchanged state is checked once')
+    
+    # Writing to the state invalidates the cached result
+    state['door_open'] = True
+    assert goal.is_satisfied(state) == True
+    assert len(calls) == 2
+    print('✓ State writes invalidate the cache')
+    
+    # Plain dicts are never cached
+    plain = {'door_open': True}
+    goal.is_satisfied(plain)
+    goal.is_satisfied(plain)
+    assert len(calls) == 4
+    print('✓ Plain dicts bypass the cache')
+    
+    # The cache stays bounded
+    for i in range(20):
+        state['counter'] = i
+        goal.is_satisfied(state)
+    assert len(goal._sat_cache) <= 4
+    print('✓ Cache size is bounded')
+    
+    # Changing the target invalidates cached results
+    state = VersionedDict({'door_open': True, 'health': 80})
+    assert goal.is_satisfied(state) == True
+    goal.desired_state = {'door_open': False}
+    assert goal.is_satisfied(state) == False
+    
+    print('✓ Reassigned targets invalidate the cache')
+    
+    # Containers changed in place keep the state's version, so goals
+    # that could match a container are never memoized
+    state = VersionedDict({'inv': []})
+    inventory_goal = Goal('armed', 1.0, {'inv': ['sword']})
+    assert inventory_goal.is_satisfied(state) == False
+    state['inv'].append('sword')
+    assert inventory_goal.is_satisfied(state) == True
+    assert len(inventory_goal._sat_cache) == 0
+    print('✓ Goals with mutable desired values are checked directly')
+    
+    # Comparative conditions can be edited in place, so they are never memoized
+    state = VersionedDict({'health': 80})
+    comparative = ComparativeGoal('healthy', 1.0, {
+        'health': ComparisonValuePair(ComparisonOperator.GREATER_THAN, 50)
+    })
+    assert comparative.is_satisfied(state) == True
+    comparative.conditions['health'].value = 90
+    assert comparative.is_satisfied(state) == False
+    print('✓ Comparative goals are checked directly')
+    
+    print('All memoization tests passed!')
+
+
+def test_specialized_checker():
+    """Test that compiled exact-state checks match the generic loop."""
+    print('Testing specialized Goal checkers...')
+    
+    class Position:
+        def __init__(self, x):
+            self.x = x
+        
+        def __eq__(self, other):
+            return isinstance(other, Position) and other.x == self.x
+    
+    desired = {'name': "it's", 'count': 3, 'flag': True, 'empty': None,
+               'ratio': 0.5, 'pos': Position(1), ('tuple', 'key'): [1, 2]}
+    goal = Goal('special', 1.0, desired)
+    assert goal._checker is not None
+    
+    states = [
+        dict(desired),
+        {**desired, 'extra': 1},
+        {**desired, 'count': 3.0},
+        {**desired, 'flag': 1},
+        {**desired, 'pos': Position(2)},
+        {**desired, ('tuple', 'key'): [1, 2, 3]},
+        {key: value for key, value in desired.items() if key != 'empty'},
+        {},
+    ]
+    generic = Goal('generic', 1.0, {})
+    generic._desired_items = goal._desired_items
+    generic._checker = None
+    for state in states:
+        assert goal.is_satisfied(state) == generic.is_satisfied(state)
+    assert goal.is_satisfied(states[0]) == True
+    assert goal.is_satisfied(states[6]) == False
+    print('✓ Compiled checks agree with the generic loop')
+    
+    # Large desired states keep the generic loop
+    large = Goal('large', 1.0, {f'key_{i}': i for i in range(100)})
+    assert large._checker is None
+    assert large.is_satisfied({f'key_{i}': i for i in range(100)}) == True
+    assert large.is_satisfied({f'key_{i}': i for i in range(99)}) == False
+    print('✓ Large goals fall back to the generic loop')
+    
+    print('All specialized checker tests passed!')
+
+
+def test_extreme_goal_score():
+    """Test batch scoring of candidate states for ExtremeGoal."""
+    print('Testing ExtremeGoal.score...')
+    
+    goal = ExtremeGoal('rich_and_close', 1.0, {'gold': True, 'distance': False})
+    states = [
+        {'gold': 100, 'distance': 10},
+        {'gold': 50, 'distance': 0},
+        {'gold': 10},  # Missing keys count as 0
+    ]
+    scores = [float(score) for score in goal.score(states)]
+    assert scores == [90.0, 50.0, 10.0]
+    assert len(goal.score([])) == 0
+    print('✓ Scores combine maximized and minimized keys')
+    
+    # Reassigning optimizations updates the scored keys
+    goal.optimizations = {'distance': True}
+    assert [float(score) for score in goal.score(states)] == [10.0, 0.0, 0.0]
+    print('✓ Reassigned optimizations are used')
+    
+    print('All ExtremeGoal score tests passed!')
+
+
 # if __name__ == "__main__":
     
 #     test_basic_functionality()
@@ -6,12 +6,25 @@ This module tests the core graph functionality that generates valid state
 transitions from the current state by applying available actions.
 """
 
-from goap.graph import get_successors
+import time
+from unittest.mock import patch
+
+import pytest
+
+from goap.fluents import FluentRegistry
+from goap.action import Action
+from goap.goal import Goal
+from goap.search import astar_pathfind
+from goap.graph import ActionTable, VectorizedActionBatch, _expand, get_predecessors, get_successors, get_successors_into, iter_successors
+from goap.state import FrozenState
 
 
 class MockAction:
     """Mock Action class for testing graph functionality."""
     
+    # Slotted like Action; subclasses need their own __slots__ to stay dict-free
+    __slots__ = ('name', 'cost', 'preconditions', 'effects', '_is_possible_result')
+    
     def __init__(self, name: str, cost: float, preconditions: dict, effects: dict, is_possible_result: bool = True):
         """Initialize a mock action for testing.
         
@@ -27,13 +40,9 @@ class MockAction:
         self.preconditions = preconditions.copy()
         self.effects = effects.copy()
         self._is_possible_result = is_possible_result
-        self._call_count_is_possible = 0
-        self._call_count_apply_effects = 0
     
     def is_possible(self, state: dict) -> bool:
         """Check if action can be executed. Mock implementation for testing."""
-        self._call_count_is_possible += 1
-        
         if not self._is_possible_result:
             return False
             
@@ -45,7 +54,6 @@ class MockAction:
     
     def apply_effects(self, state: dict) -> dict:
         """Apply effects and return new state. Mock implementation for testing."""
-        self._call_count_apply_effects += 1
         new_state = state.copy()
         new_state.update(self.effects)
         return new_state
@@ -55,9 +63,34 @@ class MockAction:
         return self.cost * 2  # Different from base cost for testing
 
 
+class CountingMockAction(MockAction):
+    """MockAction that counts calls to is_possible and apply_effects.
+    
+    Kept separate so that MockAction itself carries no bookkeeping on the
+    hot path; only tests that check how the graph calls actions use it.
+    """
+    
+    __slots__ = ('_call_count_is_possible', '_call_count_apply_effects')
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._call_count_is_possible = 0
+        self._call_count_apply_effects = 0
+    
+    def is_possible(self, state: dict) -> bool:
+        self._call_count_is_possible += 1
+        return super().is_possible(state)
+    
+    def apply_effects(self, state: dict) -> dict:
+        self._call_count_apply_effects += 1
+        return super().apply_effects(state)
+
+
 class MockActionWithDynamicCost:
     """Mock action that only has get_cost method."""
     
+    __slots__ = ('name', 'preconditions', 'effects', '_dynamic_cost')
+    
     def __init__(self, name: str, dynamic_cost: float, preconditions: dict, effects: dict):
         self.name = name
         self.preconditions = preconditions
@@ -79,6 +112,8 @@ class MockActionWithDynamicCost:
 class MockActionNoCost:
     """Mock action with no cost information."""
     
+    __slots__ = ('name', 'preconditions', 'effects')
+    
     def __init__(self, name: str, preconditions: dict, effects: dict):
         self.name = name
         self.preconditions = preconditions
@@ -205,6 +240,27 @@ def test_cost_handling():
     # No cost should default to 1.0
     assert costs_by_name["no_cost"] == 1.0, f"Expected 1.0, got {costs_by_name['no_cost']}"
     
+    # Real actions honour later changes to their cost attribute; their
+    # constant cost is read from static_cost without a call
+    real_action = Action("real", 2.0, {}, {}, None)
+    assert get_successors({}, [real_action])[0][2] == 2.0
+    assert real_action._cost_fn is None
+    real_action.cost = 4.0
+    assert get_successors({}, [real_action])[0][2] == 4.0
+    
+    # An Action subclass overriding get_cost takes precedence over its static cost
+    class SurchargedAction(Action):
+        __slots__ = ()
+        
+        def get_cost(self, state):
+            return 42.0
+    
+    surcharged = SurchargedAction("surcharged", 1.0, {}, {"paid": True}, None)
+    assert get_successors({}, [surcharged])[0][2] == 42.0
+    assert surcharged._cost_fn == surcharged.get_cost  # Resolved once and cached
+    cheap = Action("cheap", 5.0, {}, {"paid": True}, None)
+    assert astar_pathfind({}, Goal("pay", 1.0, {"paid": True}), [surcharged, cheap]) == [cheap]
+    
     # Test precedence: get_cost should override cost attribute
     action_with_both = MockAction("both", 10.0, {}, {"result": "both"})
     # This action has both cost (10.0) and get_cost (returns 20.0)
@@ -216,7 +272,7 @@ def test_cost_handling():
 def test_action_interface_integration():
     """Test integration with action interface methods."""
     
-    action = MockAction("test", 1.0, {"ready": True}, {"done": True})
+    action = CountingMockAction("test", 1.0, {"ready": True}, {"done": True})
     current_state = {"ready": True, "other": "value"}
     
     # Action should be called correctly
@@ -227,7 +283,7 @@ def test_action_interface_integration():
     assert action._call_count_apply_effects == 1, "apply_effects should be called once"
     
     # Test action that fails is_possible
-    failing_action = MockAction("fail", 1.0, {"ready": True}, {"done": True}, is_possible_result=False)
+    failing_action = CountingMockAction("fail", 1.0, {"ready": True}, {"done": True}, is_possible_result=False)
     successors = get_successors(current_state, [failing_action])
     
     assert len(successors) == 0, "Failing action should produce no successors"
@@ -301,9 +357,40 @@ def test_edge_cases():
     assert len(successors) == 1
     assert successors[0][1] == current_state  # State unchanged
     
+    # An Action with empty preconditions/effects skips is_possible/apply_effects
+    # entirely, and its successor is the current state itself
+    idle = Action("idle", 1.0, {}, {}, None)
+    with patch.object(Action, "is_possible", autospec=True) as is_possible, \
+            patch.object(Action, "apply_effects", autospec=True) as apply_effects:
+        successors = get_successors(current_state, [idle])
+    assert successors[0][1] is current_state
+    assert not is_possible.called and not apply_effects.called
+    
+    # Duck-typed actions are always asked
+    failing = MockAction("failing_empty", 1.0, {}, {}, is_possible_result=False)
+    assert get_successors(current_state, [failing]) == []
+    
+    # ...and so are Action subclasses overriding is_possible or apply_effects
+    class Locked(Action):
+        __slots__ = ()
+        
+        def is_possible(self, state):
+            return False
+    
+    class Stamping(Action):
+        __slots__ = ()
+        
+        def apply_effects(self, state):
+            return state | {"stamped": True}
+    
+    assert get_successors(current_state, [Locked("locked", 1.0, {}, {}, None)]) == []
+    successors = get_successors(current_state, [Stamping("stamp", 1.0, {}, {}, None)])
+    assert successors[0][1] == {"existing": "value", "stamped": True}
+    
 
 
-def test_performance_characteristics():
+@pytest.mark.parametrize("backend", ["dict", "bitset"])
+def test_performance_characteristics(backend):
     """Test basic performance characteristics."""
     
     # Create many actions to test scaling
@@ -312,16 +399,39 @@ def test_performance_characteristics():
         actions.append(MockAction(f"action_{i}", 1.0, {"trigger": True}, {f"result_{i}": True}))
     
     current_state = {"trigger": True}
-    successors = get_successors(current_state, actions)
     
-    # All actions should be valid
-    assert len(successors) == 100
+    if backend == "dict":
+        start = time.perf_counter()
+        successors = get_successors(current_state, actions)
+        elapsed = time.perf_counter() - start
+        
+        # All actions should be valid
+        assert len(successors) == 100
+        
+        # Verify each action was processed correctly
+        for i, (action, new_state, cost) in enumerate(successors):
+            assert action.name == f"action_{i}"
+            assert f"result_{i}" in new_state
+            assert cost == 2.0  # MockAction.get_cost returns cost * 2
+    else:
+        registry = FluentRegistry()
+        batch = VectorizedActionBatch(actions, registry)
+        state_bits = registry.encode(current_state)
+        
+        start = time.perf_counter()
+        indices, new_states = batch.get_successors_batch(state_bits)
+        elapsed = time.perf_counter() - start
+        
+        # All actions should be valid, producing one row per action
+        assert list(indices) == list(range(100))
+        assert len(new_states) == 100
+        
+        # Every row decodes to the expected state
+        for i, row in zip(indices, new_states):
+            assert registry.decode(batch.to_int(row)) == {"trigger": True, f"result_{i}": True}
     
-    # Verify each action was processed correctly
-    for i, (action, new_state, cost) in enumerate(successors):
-        assert action.name == f"action_{i}"
-        assert f"result_{i}" in new_state
-        assert cost == 2.0  # MockAction.get_cost returns cost * 2
+    # Loose bound - catches pathological slowdowns without being flaky
+    assert elapsed < 1.0, f"{backend} expansion of 100 actions took {elapsed:.3f}s"
     
 
 
@@ -364,3 +474,248 @@ def test_comparison_with_csharp_behavior():
     assert costs_by_name["move_north"] == 2.0  # MockAction returns cost * 2
     assert costs_by_name["move_south"] == 2.0
     assert costs_by_name["attack"] == 4.0  # 2.0 * 2
+
+
+def test_bitset_successors():
+    """Test get_successors on bitset states with a FluentRegistry."""
+    
+    actions = [
+        CountingMockAction("move_north", 1.0, {"position": "center"}, {"position": "north"}),
+        CountingMockAction("move_south", 1.0, {"position": "center"}, {"position": "south"}),
+        MockActionNoCost("attack", {"has_weapon": True, "enemy_present": True}, {"enemy_dead": True})
+    ]
+    registry = FluentRegistry()
+    
+    # Results match the dictionary path
+    for current_state in ({"position": "center", "has_weapon": False, "enemy_present": True},
+                          {"position": "center", "has_weapon": True, "enemy_present": True},
+                          {"position": "north", "has_weapon": True, "enemy_present": False}):
+        expected = get_successors(current_state, actions)
+        successors = get_successors(registry.encode(current_state), actions, registry)
+        assert [(a.name, registry.decode(s), c) for a, s, c in successors] == \
+            [(a.name, s, c) for a, s, c in expected]
+    
+    # Bitset successors are integers, not dictionary copies
+    successors = get_successors(registry.encode({"position": "center"}), actions, registry)
+    assert all(isinstance(new_state, int) for _, new_state, _ in successors)
+    assert registry.decode(successors[0][1]) == {"position": "north"}
+    
+    # The bitset path never calls is_possible/apply_effects
+    assert all(action._call_count_is_possible == 3 for action in actions[:2])
+
+
+def test_iter_successors():
+    """Test that iter_successors lazily yields the same transitions."""
+    
+    actions = [
+        MockAction("move_north", 1.0, {"position": "center"}, {"position": "north"}),
+        MockActionWithDynamicCost("move_south", 3.0, {"position": "center"}, {"position": "south"}),
+        MockActionNoCost("wait", {}, {}),
+        CountingMockAction("move_east", 1.0, {"position": "center"}, {"position": "east"}),
+    ]
+    current_state = {"position": "center"}
+    
+    assert list(iter_successors(current_state, actions)) == get_successors(current_state, actions)
+    assert min(iter_successors(current_state, actions), key=lambda s: s[2])[0].name == "wait"
+    
+    # Stopping after the first successor leaves the other actions untouched
+    calls = actions[3]._call_count_is_possible
+    action, new_state, cost = next(iter_successors(current_state, actions))
+    assert action.name == "move_north" and new_state == {"position": "north"}
+    assert actions[3]._call_count_is_possible == calls
+    
+    # Bitset states are supported too
+    registry = FluentRegistry()
+    literal = [MockAction("move_north", 1.0, {"position": "center"}, {"position": "north"})]
+    bits = registry.encode(current_state)
+    assert list(iter_successors(bits, literal, registry)) == get_successors(bits, literal, registry)
+
+
+def test_bloom_prefilter():
+    """Test that frozen states reject actions by their Bloom filter."""
+    
+    # Integer literals hash the same in every process
+    actions = [
+        Action("stay", 1.0, {1: 10}, {2: 20}, None),
+        Action("missing", 1.0, {1: 11}, {2: 21}, None),
+    ]
+    state = FrozenState({1: 10, 3: 30})
+    assert actions[1].pre_bloom & state.bloom != actions[1].pre_bloom
+    
+    with patch.object(Action, "is_possible", autospec=True, side_effect=Action.is_possible) as is_possible:
+        successors = get_successors(state, actions)
+        assert [s[0].name for s in successors] == ["stay"]
+        assert [call.args[0].name for call in is_possible.call_args_list] == ["stay"]  # "missing" rejected by the filter
+        
+        # Plain dictionaries are never filtered
+        assert get_successors({1: 11}, actions)[0][0].name == "missing"
+        assert is_possible.call_count == 3
+    
+    # Subclasses overriding is_possible may accept states lacking the
+    # literals, so they are never filtered
+    class OpenDoor(Action):
+        __slots__ = ()
+        
+        def is_possible(self, state):
+            return state.get("door", "closed") == "closed"
+    
+    open_door = OpenDoor("open", 1.0, {"door": "closed"}, {"door": "open"}, None)
+    assert open_door.pre_bloom == 0
+    assert [s[0] for s in get_successors(FrozenState({"x": 1}), [open_door])] == [open_door]
+    assert astar_pathfind({"x": 1}, Goal("door_open", 1.0, {"door": "open"}), [open_door]) == [open_door]
+
+
+def test_vectorized_action_batch():
+    """Test batched bitset expansion against the per-action bitset path."""
+    
+    actions = [
+        MockAction("move_north", 1.0, {"position": "center"}, {"position": "north"}),
+        MockAction("move_south", 1.0, {"position": "center"}, {"position": "south"}),
+        MockAction("attack", 2.0, {"has_weapon": True, "enemy_present": True}, {"enemy_dead": True})
+    ]
+    registry = FluentRegistry()
+    batch = VectorizedActionBatch(actions, registry)
+    
+    for current_state in ({"position": "center", "has_weapon": False, "enemy_present": True},
+                          {"position": "center", "has_weapon": True, "enemy_present": True},
+                          {"position": "north", "has_weapon": True, "enemy_present": True}):
+        state_bits = registry.encode(current_state)
+        expected = get_successors(state_bits, actions, registry)
+        indices, new_states = batch.get_successors_batch(state_bits)
+        
+        assert [actions[i].name for i in indices] == [a.name for a, _, _ in expected]
+        assert [registry.decode(batch.to_int(row)) for row in new_states] == \
+            [registry.decode(s) for _, s, _ in expected]
+    
+    # Masks are rebuilt when the registry learns new values of an effect key
+    current_state = {"position": "north", "has_weapon": True, "enemy_present": True, "enemy_dead": "unknown"}
+    indices, new_states = batch.get_successors_batch(registry.encode(current_state))
+    assert [actions[i].name for i in indices] == ["attack"]
+    assert registry.decode(batch.to_int(new_states[0])) == {**current_state, "enemy_dead": True}
+
+
+def test_batch_expand_costs():
+    """Test that batched expansion reports the applicable actions' costs."""
+    
+    actions = [
+        MockActionNoCost("wait", {}, {"waited": True}),
+        MockAction("open_door", 3.0, {"has_key": True}, {"door_open": True}),
+        MockAction("pick_lock", 5.0, {"has_pick": True}, {"door_open": True})
+    ]
+    registry = FluentRegistry()
+    batch = VectorizedActionBatch(actions, registry)
+    
+    indices, new_states, costs = batch.expand(registry.encode({"has_key": True, "door_open": False}))
+    assert [actions[i].name for i in indices] == ["wait", "open_door"]
+    assert [float(c) for c in costs] == [1.0, 3.0]  # Static costs
+    assert registry.decode(batch.to_int(new_states[1])) == {"has_key": True, "door_open": True}
+
+
+def test_expand_kernel():
+    """Test the array kernel directly on two-word bitsets."""
+    np = pytest.importorskip("numpy")
+    
+    high = 1 << 63
+    state = np.array([1, high], dtype=np.uint64)
+    pre_mask = np.array([[1, 0], [2, 0], [0, high]], dtype=np.uint64)
+    pre_bits = pre_mask.copy()
+    eff_mask = np.array([[1, 0], [2, 0], [0, high]], dtype=np.uint64)
+    eff_bits = np.array([[0, 0], [2, 0], [0, 0]], dtype=np.uint64)
+    costs = np.array([1.0, 2.0, 3.0])
+    
+    indices, new_states, new_costs = _expand(state, pre_mask, pre_bits, eff_mask, eff_bits, costs)
+    assert indices.tolist() == [0, 2]
+    assert new_states.tolist() == [[0, high], [1, 0]]
+    assert new_costs.tolist() == [1.0, 3.0]
+
+
+def test_get_predecessors():
+    """Test goal regression through actions, on dicts and bitsets."""
+    
+    actions = [
+        MockAction("unlock", 1.0, {"has_key": True}, {"door_locked": False}),
+        MockAction("open_door", 1.0, {"door_locked": False}, {"door_open": True}),
+        MockAction("slam_door", 1.0, {}, {"door_open": False}),
+        MockAction("steal_key", 1.0, {"has_key": False, "door_open": False}, {"has_key": True}),
+        Action("heal", 1.0, {}, {"health": "+10"}, None),
+    ]
+    goal = {"door_open": True}
+    
+    predecessors = get_predecessors(goal, actions)
+    assert [(a.name, g, c) for a, g, c in predecessors] == [("open_door", {"door_locked": False}, 2.0)]
+    
+    # Regressing further chains back towards the start
+    predecessors = get_predecessors({"door_locked": False, "door_open": True}, actions)
+    names = {a.name: g for a, g, _ in predecessors}
+    assert names == {"unlock": {"door_open": True, "has_key": True},
+                     "open_door": {"door_locked": False}}
+    
+    # Preconditions contradicting the remaining goal rule an action out
+    assert get_predecessors({"has_key": True, "door_open": True}, actions[3:4]) == []
+    
+    # The bitset version regresses the same goals
+    registry = FluentRegistry()
+    for goal in ({"door_open": True}, {"door_locked": False, "door_open": True},
+                 {"has_key": True, "door_open": True}):
+        expected = get_predecessors(goal, actions[:4])
+        result = get_predecessors(registry.encode(goal), actions[:4], registry)
+        assert [(a.name, registry.decode(g), c) for a, g, c in result] == \
+            [(a.name, g, c) for a, g, c in expected]
+
+
+def test_get_successors_into():
+    """Test appending successors to caller-owned buffers."""
+    
+    actions = [
+        MockAction("heal", 2.0, {"health": 50}, {"health": 100}),
+        MockAction("unlock", 1.0, {"has_key": True}, {"door_locked": False}),
+        MockActionNoCost("wait", {}, {"waited": True})
+    ]
+    current_state = {"health": 50, "has_key": False}
+    out_actions, out_states, out_costs = ["existing"], [None], [0.0]
+    
+    added = get_successors_into(current_state, actions, out_actions, out_states, out_costs)
+    
+    # Results are appended after existing entries, in parallel lists
+    assert added == 2
+    assert [a if isinstance(a, str) else a.name for a in out_actions] == ["existing", "heal", "wait"]
+    assert out_states[1:] == [{"health": 100, "has_key": False}, {"health": 50, "has_key": False, "waited": True}]
+    assert out_costs[1:] == [4.0, 1.0]
+    
+    # get_successors returns the same transitions as tuples
+    assert get_successors(current_state, actions) == list(zip(out_actions[1:], out_states[1:], out_costs[1:]))
+
+
+def test_action_table():
+    """Test that an ActionTable expands states like get_successors_into."""
+    
+    actions = [
+        Action("unlock", 2.0, {"has_key": True}, {"door_locked": False}, None),
+        Action("open", 1.0, {"door_locked": False}, {"door_open": True}, None),
+        Action("rest", 1.0, {"energy": lambda v: v < 5}, {"energy": 10}, None),
+        MockAction("heal", 2.0, {"health": 50}, {"health": 100}),
+        Action("wait", 0.5, {}, {"waited": True}, None)
+    ]
+    table = ActionTable(actions)
+    assert len(table) == 5 and list(table) == actions
+    
+    for state in ({"has_key": True, "door_locked": True, "energy": 3, "health": 50},
+                  {"has_key": False, "door_locked": False, "energy": 7, "health": 10}):
+        expected = get_successors(state, actions)
+        
+        # Frozen states use the table, plain dicts fall back to get_successors_into
+        for current in (FrozenState(state), state):
+            out_actions, out_states, out_costs = [], [], []
+            added = table.get_successors_into(current, out_actions, out_states, out_costs)
+            assert added == len(expected)
+            assert [(a.name, dict(s), c) for a, s, c in zip(out_actions, out_states, out_costs)] == \
+                [(a.name, s, c) for a, s, c in expected]
+        
+        # Tabled successors of frozen states are frozen themselves
+        out_actions, out_states, out_costs = [], [], []
+        table.get_successors_into(FrozenState(state), out_actions, out_states, out_costs)
+        for action, new_state in zip(out_actions, out_states):
+            if type(action) is Action and action.name != 'rest':
+                assert type(new_state) is FrozenState and new_state.key == FrozenState(new_state).key
+    
+    print("✓ Action table matches get_successors_into")
@@ -1,5 +1,10 @@
+import time
+from abc import ABC
 
-from goap.parameters import Parameterizer, SelectFromCollection, SelectFromState, generate_action_variants
+import pytest
+
+from goap.parameters import Parameterizer, SelectFromCollection, SelectFromState, _variant_builder, generate_action_variants, generate_all_action_variants, iter_action_variants
+from goap.state import VersionedDict
 
 # ==============================================================================
 # TESTS
@@ -19,8 +24,9 @@ def test_parameterizer_abstract_base():
         pass
     
     # Test that generate method is abstract
-    from abc import ABC
     assert issubclass(Parameterizer, ABC), "Parameterizer should inherit from ABC"
+    assert Parameterizer.__abstractmethods__ == frozenset({'generate'}), \
+        "generate should be the only abstract method"
     
     print('✓ Parameterizer is properly abstract')
 
@@ -137,33 +143,34 @@ def test_select_from_state():
     print('✓ SelectFromState works correctly')
 
 
-def test_generate_action_variants_basic():
+def test_select_from_state_freshness():
+    """Test that selections from versioned agent state always reflect the state."""
+    print('Testing SelectFromState freshness...')
+    
+    enemies = ['goblin', None, 'orc']
+    state = VersionedDict({'enemies': enemies})
+    first = SelectFromState('enemies').generate(state)
+    assert first == SelectFromState('enemies').generate(state) == ['goblin', 'orc']
+    
+    # Callers get their own lists
+    first.append('dragon')
+    assert SelectFromState('enemies').generate(state) == ['goblin', 'orc']
+    print('✓ Each selection is a new list')
+    
+    # Collections changed in place are seen, whether or not they are written back
+    enemies.remove('goblin')
+    assert SelectFromState('enemies').generate(state) == ['orc']
+    state['enemies'] = enemies
+    assert SelectFromState('enemies').generate(state) == ['orc']
+    print('✓ In-place changes are reflected in selections')
+
+
+def test_generate_action_variants_basic(mock_action_cls):
     """Test basic functionality of generate_action_variants."""
     print('Testing generate_action_variants basic functionality...')
     
-    # Create a mock action class for testing
-    class MockAction:
-        def __init__(self, name='test', cost=1.0, preconditions=None, effects=None, 
-                     executor=None, parameterizers=None):
-            self.name = name
-            self.cost = cost
-            self.preconditions = preconditions or {}
-            self.effects = effects or {}
-            self.executor = executor or (lambda: None)
-            self.parameterizers = parameterizers
-            self.parameters = {}
-        
-        def copy(self):
-            new_action = MockAction(self.name, self.cost, self.preconditions.copy(), 
-                                  self.effects.copy(), self.executor, self.parameterizers)
-            new_action.parameters = self.parameters.copy()
-            return new_action
-        
-        def set_parameter(self, name, value):
-            self.parameters[name] = value
-    
     # Test with no parameterizers
-    action = MockAction(name='simple_action')
+    action = mock_action_cls(name='simple_action')
     result = generate_action_variants(action, {})
     assert len(result) == 1, "No parameterizers should return single action"
     assert result[0] == action, "Should return the original action"
@@ -193,34 +200,13 @@ def test_generate_action_variants_basic():
     print('✓ generate_action_variants basic functionality works')
 
 
-def test_generate_action_variants_combinations():
+def test_generate_action_variants_combinations(mock_action_cls):
     """Test Cartesian product generation in generate_action_variants."""
     print('Testing generate_action_variants Cartesian product...')
     
-    # Mock action class (reusing from previous test)
-    class MockAction:
-        def __init__(self, name='test', cost=1.0, preconditions=None, effects=None, 
-                     executor=None, parameterizers=None):
-            self.name = name
-            self.cost = cost
-            self.preconditions = preconditions or {}
-            self.effects = effects or {}
-            self.executor = executor or (lambda: None)
-            self.parameterizers = parameterizers
-            self.parameters = {}
-        
-        def copy(self):
-            new_action = MockAction(self.name, self.cost, self.preconditions.copy(), 
-                                  self.effects.copy(), self.executor, self.parameterizers)
-            new_action.parameters = self.parameters.copy()
-            return new_action
-        
-        def set_parameter(self, name, value):
-            self.parameters[name] = value
-    
     # Test with multiple parameterizers
     state = {'enemies': ['goblin', 'orc']}
-    action = MockAction(
+    action = mock_action_cls(
         name='attack',
         parameterizers={
             'target': SelectFromState('enemies'),
@@ -249,33 +235,12 @@ def test_generate_action_variants_combinations():
     print('✓ generate_action_variants Cartesian product works')
 
 
-def test_generate_action_variants_edge_cases():
+def test_generate_action_variants_edge_cases(mock_action_cls):
     """Test edge cases and error handling in generate_action_variants."""
     print('Testing generate_action_variants edge cases...')
     
-    # Mock action class
-    class MockAction:
-        def __init__(self, name='test', cost=1.0, preconditions=None, effects=None, 
-                     executor=None, parameterizers=None):
-            self.name = name
-            self.cost = cost
-            self.preconditions = preconditions or {}
-            self.effects = effects or {}
-            self.executor = executor or (lambda: None)
-            self.parameterizers = parameterizers
-            self.parameters = {}
-        
-        def copy(self):
-            new_action = MockAction(self.name, self.cost, self.preconditions.copy(), 
-                                  self.effects.copy(), self.executor, self.parameterizers)
-            new_action.parameters = self.parameters.copy()
-            return new_action
-        
-        def set_parameter(self, name, value):
-            self.parameters[name] = value
-    
     # Test with empty parameter values (should return empty list)
-    action = MockAction(
+    action = mock_action_cls(
         name='test',
         parameterizers={'target': SelectFromState('missing_key')}
     )
@@ -290,6 +255,18 @@ def test_generate_action_variants_edge_cases():
     result = generate_action_variants(action, {})
     assert result == [], "Any empty parameterizer should result in no variants"
     
+    # Parameterizers after the first empty one are never consulted
+    class FailingParameterizer(Parameterizer):
+        def generate(self, state):
+            assert False, "Should not generate after an empty parameterizer"
+    
+    action.parameterizers = {
+        'target': SelectFromState('missing_key'),
+        'weapon': FailingParameterizer()
+    }
+    assert generate_action_variants(action, {}) == []
+    assert list(iter_action_variants(action, {})) == []
+    
     # Test invalid parameterizers type
     action.parameterizers = "not a dict"
     try:
@@ -338,6 +315,168 @@ def test_generate_action_variants_edge_cases():
     print('✓ generate_action_variants edge cases work correctly')
 
 
+def test_generate_action_variants_pruning(mock_action_cls):
+    """Test that prune_fn discards infeasible partial combinations."""
+    print('Testing generate_action_variants pruning...')
+    
+    state = {'enemies': ['goblin', 'orc', 'dragon'], 'weapons': ['sword', 'bow']}
+    action = mock_action_cls(
+        name='attack',
+        parameterizers={
+            'target': SelectFromState('enemies'),
+            'weapon': SelectFromState('weapons'),
+            'stance': SelectFromCollection(['aggressive', 'defensive'])
+        }
+    )
+    
+    # A prune function that accepts everything yields the plain product, in order
+    full = generate_action_variants(action, state)
+    unpruned = generate_action_variants(action, state, prune_fn=lambda partial, state: True)
+    assert [v.parameters for v in unpruned] == [v.parameters for v in full]
+    print('✓ Accept-all pruning matches the full Cartesian product')
+    
+    # Rejecting a partial binding skips its whole subtree
+    calls = []
+    
+    def prune(partial, state):
+        calls.append(dict(partial))
+        return partial.get('target') != 'dragon' and partial.get('weapon') != 'bow'
+    
+    result = generate_action_variants(action, state, prune_fn=prune)
+    assert [(v.parameters['target'], v.parameters['stance']) for v in result] == [
+        ('goblin', 'aggressive'), ('goblin', 'defensive'),
+        ('orc', 'aggressive'), ('orc', 'defensive')
+    ]
+    assert all(v.parameters['weapon'] == 'sword' for v in result)
+    assert not any(c.get('target') == 'dragon' and 'weapon' in c for c in calls), \
+        "Pruned targets should never be extended"
+    print('✓ Pruned partial bindings are never extended')
+    
+    # Pruning everything yields no variants
+    assert generate_action_variants(action, state, prune_fn=lambda partial, state: False) == []
+    print('✓ Pruning every binding yields no variants')
+
+
+def test_iter_action_variants(mock_action_cls):
+    """Test lazy generation of action variants."""
+    print('Testing iter_action_variants...')
+    
+    copies = []
+    
+    class CountingAction(mock_action_cls):
+        def copy(self):
+            copies.append(self)
+            return super().copy()
+    
+    state = {'enemies': ['goblin', 'orc', 'dragon']}
+    action = CountingAction(
+        name='attack',
+        parameterizers={
+            'target': SelectFromState('enemies'),
+            'weapon': SelectFromCollection(['sword', 'bow'])
+        }
+    )
+    
+    # Same variants, in the same order, as the eager version
+    lazy = [v.parameters for v in iter_action_variants(action, state)]
+    assert lazy == [v.parameters for v in generate_action_variants(action, state)]
+    print('✓ Lazy and eager generation agree')
+    
+    # Variants are only created as they are requested
+    copies.clear()
+    variants = iter_action_variants(action, state)
+    assert copies == []
+    first = next(variants)
+    assert first.parameters == {'target': 'goblin', 'weapon': 'sword'}
+    assert len(copies) == 1
+    print('✓ Variants are created on demand')
+    
+    # Unparameterized templates yield themselves; empty selections yield nothing
+    assert list(iter_action_variants(mock_action_cls(name='wait'), state)) != []
+    assert list(iter_action_variants(action, {'enemies': []})) == []
+    print('✓ Edge cases match generate_action_variants')
+
+
+def test_generated_variant_builders(mock_action_cls):
+    """Test the specialized variant loops used by generate_action_variants."""
+    print('Testing generated variant builders...')
+    
+    state = {'enemies': ['goblin', 'orc']}
+    parameterizers = {
+        'target': SelectFromState('enemies'),
+        'weapon': SelectFromCollection(['sword', 'bow'])
+    }
+    
+    # Templates sharing a parameter schema share one builder
+    attack = mock_action_cls(name='attack', parameterizers=parameterizers)
+    taunt = mock_action_cls(name='taunt', parameterizers=dict(parameterizers))
+    generate_action_variants(attack, state)
+    generate_action_variants(taunt, state)
+    assert _variant_builder(('target', 'weapon'), True) is _variant_builder(('target', 'weapon'), True)
+    print('✓ Builders are shared per schema')
+    
+    # Templates without set_parameter get their parameters dict filled in
+    class NoSetterAction:
+        def __init__(self):
+            self.parameterizers = parameterizers
+            self.parameters = None
+        
+        def copy(self):
+            new = NoSetterAction()
+            new.parameters = None if self.parameters is None else dict(self.parameters)
+            return new
+    
+    variants = generate_action_variants(NoSetterAction(), state)
+    assert [v.parameters for v in variants] == [
+        {'target': 'goblin', 'weapon': 'sword'}, {'target': 'goblin', 'weapon': 'bow'},
+        {'target': 'orc', 'weapon': 'sword'}, {'target': 'orc', 'weapon': 'bow'},
+    ]
+    print('✓ Parameters dict is populated without set_parameter')
+    
+    # Non-string parameter names fall back to the generic loop
+    numbered = mock_action_cls(name='numbered', parameterizers={0: SelectFromCollection(['a', 'b'])})
+    assert [v.parameters for v in generate_action_variants(numbered, state)] == [{0: 'a'}, {0: 'b'}]
+    print('✓ Non-string parameter names are supported')
+
+
+def test_generate_all_action_variants(mock_action_cls):
+    """Test batch generation of variants for several templates."""
+    print('Testing generate_all_action_variants...')
+    
+    calls = []
+    
+    class CountingParameterizer(SelectFromCollection):
+        def generate(self, state):
+            calls.append(self)
+            return super().generate(state)
+    
+    state = {'enemies': ['goblin', 'orc']}
+    shared = {
+        'target': SelectFromState('enemies'),
+        'weapon': CountingParameterizer(['sword', 'bow'])
+    }
+    templates = [
+        mock_action_cls(name='attack', parameterizers=shared),
+        mock_action_cls(name='wait'),
+        mock_action_cls(name='taunt', parameterizers=shared),
+        mock_action_cls(name='flee', parameterizers={'target': SelectFromState('missing_key')}),
+    ]
+    
+    # Same variants, in the same order, as expanding each template
+    expected = []
+    for template in templates:
+        expected.extend(generate_action_variants(template, state))
+    calls.clear()
+    variants = generate_all_action_variants(templates, state)
+    assert [(v.name, v.parameters) for v in variants] == [(v.name, v.parameters) for v in expected]
+    assert len(variants) == 9
+    print('✓ Batch generation matches per-template generation')
+    
+    # The shared parameterizers dictionary is only generated once
+    assert len(calls) == 1
+    print('✓ Shared parameterizers are generated once per batch')
+
+
 def test_integration_with_action_patterns():
     """Test integration with different action implementation patterns."""
     print('Testing integration with various action patterns...')
@@ -401,39 +540,12 @@ def test_integration_with_action_patterns():
     print('✓ Integration with action patterns works correctly')
 
 
-def test_comprehensive_scenario():
+def test_comprehensive_scenario(mock_action_cls):
     """Test a comprehensive scenario simulating real GOAP usage."""
     print('Testing comprehensive parameterization scenario...')
     
-    # Mock action that resembles real Action class
-    class MockAction:
-        def __init__(self, name, cost=1.0, preconditions=None, effects=None, 
-                     executor=None, parameterizers=None):
-            self.name = name
-            self.cost = cost
-            self.preconditions = preconditions or {}
-            self.effects = effects or {}
-            self.executor = executor or (lambda: None)
-            self.parameterizers = parameterizers
-            self.parameters = {}
-        
-        def copy(self):
-            new_action = MockAction(
-                name=self.name,
-                cost=self.cost,
-                preconditions=self.preconditions.copy(),
-                effects=self.effects.copy(),
-                executor=self.executor,
-                parameterizers=self.parameterizers
-            )
-            new_action.parameters = self.parameters.copy()
-            return new_action
-        
-        def set_parameter(self, name, value):
-            self.parameters[name] = value
-    
     # Create a complex action with multiple parameterizers
-    attack_action = MockAction(
+    attack_action = mock_action_cls(
         name='attack',
         cost=1.0,
         preconditions={'has_weapon': True},
@@ -490,6 +602,35 @@ def test_comprehensive_scenario():
     print('✓ Comprehensive parameterization scenario works correctly')
 
 
+@pytest.mark.parametrize("n_enemies,n_weapons,n_stances", [(1, 1, 1), (3, 2, 2), (10, 5, 4), (50, 10, 5)])
+def test_variant_count_scaling(mock_action_cls, n_enemies, n_weapons, n_stances):
+    """Test variant generation across parameter space sizes."""
+    attack_action = mock_action_cls(
+        name='attack',
+        parameterizers={
+            'target': SelectFromState('visible_enemies'),
+            'weapon': SelectFromState('available_weapons'),
+            'stance': SelectFromCollection([f'stance_{i}' for i in range(n_stances)])
+        }
+    )
+    world_state = {
+        'visible_enemies': [f'enemy_{i}' for i in range(n_enemies)],
+        'available_weapons': [f'weapon_{i}' for i in range(n_weapons)],
+    }
+    
+    start = time.perf_counter()
+    variants = generate_action_variants(attack_action, world_state)
+    elapsed = time.perf_counter() - start
+    
+    # One variant per combination, each combination exactly once
+    assert len(variants) == n_enemies * n_weapons * n_stances
+    combinations = {tuple(v.parameters.values()) for v in variants}
+    assert len(combinations) == len(variants)
+    
+    # Should be fast (less than 1 second even for the largest space)
+    assert elapsed < 1.0, f"Variant generation too slow: {elapsed}s"
+
+
 # if __name__ == "__main__":
 #     print("Running parameters.py validation tests...")
 #     print("=" * 50)
@@ -1,52 +1,94 @@
 
 """Test suite for the GOAP planner module using pytest conventions."""
 
+import math
 import pytest
-from unittest.mock import patch
+from dataclasses import dataclass
+from unittest.mock import MagicMock, patch
 from goap.planner import _calculate_plan_utility, _find_plan_for_goal, orchestrate_planning
 from goap.parameters import generate_action_variants
 from goap.search import astar_pathfind
 
 
 # =============================================================================
-# TEST FUNCTIONS
+# MOCK CLASSES
 # =============================================================================
 
-def test_calculate_plan_utility():
-    """Test the _calculate_plan_utility function with various cost/weight combinations."""
-    
-    # Mock goal with weight
-    class MockGoal:
-        def __init__(self, weight):
-            self.weight = weight
-    
-    # Test normal cases
-    goal = MockGoal(100.0)
-    utility = _calculate_plan_utility(50.0, goal)
-    assert utility == 2.0, f"Expected 2.0, got {utility}"
-    
-    # Test zero-cost plan (should return infinity)
-    utility = _calculate_plan_utility(0.0, goal)
-    assert utility == float('inf'), f"Expected inf, got {utility}"
-    
-    # Test negative cost (should return infinity)
-    utility = _calculate_plan_utility(-10.0, goal)
-    assert utility == float('inf'), f"Expected inf, got {utility}"
+@dataclass(slots=True, eq=False)
+class MockAction:
+    """Concrete action with a name and cost."""
+    name: str
+    cost: float
     
-    # Test high-weight goal with expensive plan
-    high_weight_goal = MockGoal(1000.0)
-    utility = _calculate_plan_utility(100.0, high_weight_goal)
-    assert utility == 10.0, f"Expected 10.0, got {utility}"
+    def __repr__(self):
+        return f"MockAction({self.name}, {self.cost})"
     
-    # Test low-weight goal with cheap plan
-    low_weight_goal = MockGoal(1.0)
-    utility = _calculate_plan_utility(0.5, low_weight_goal)
-    assert utility == 2.0, f"Expected 2.0, got {utility}"
+    def is_possible(self, state):
+        return True
     
-    # Test fractional weights and costs
-    fractional_goal = MockGoal(2.5)
-    utility = _calculate_plan_utility(1.25, fractional_goal)
-    assert utility == 2.0, f"Expected 2.0, got {utility}"
+    def apply_effects(self, state):
+        return state.copy()  # Return copy for testing
+
+
+@dataclass(slots=True, eq=False)
+class MockGoal:
+    """Goal with a name and weight that is never already satisfied."""
+    name: str
+    weight: float
+    
+    def is_satisfied(self, state):
+        return False  # For testing purposes
+
+
+@dataclass(slots=True, eq=False)
+class MockAgent:
+    """Agent holding action templates, goals and world state."""
+    actions: list  # Action templates
+    goals: list
+    state: dict
+
+
+@dataclass(slots=True, eq=False)
+class MockActionTemplate:
+    """Action template with a name and cost."""
+    name: str
+    cost: float
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def planner_mocks(monkeypatch):
+    """Replace the planner's variant generation and per-goal search with mocks.
+    
+    Returns:
+        Tuple (mock_generate, mock_find_plan)
+    """
+    mock_generate = MagicMock()
+    mock_find_plan = MagicMock()
+    monkeypatch.setattr('goap.planner.generate_all_action_variants', mock_generate)
+    monkeypatch.setattr('goap.planner._find_plan_for_goal', mock_find_plan)
+    return mock_generate, mock_find_plan
+
+
+# =============================================================================
+# TEST FUNCTIONS
+# =============================================================================
+
+@pytest.mark.parametrize("cost, weight, expected", [
+    pytest.param(50.0, 100.0, 2.0, id="normal"),
+    pytest.param(0.0, 100.0, math.inf, id="zero_cost"),           # Zero-cost plan is infinitely good
+    pytest.param(-10.0, 100.0, math.inf, id="negative_cost"),     # Negative cost is treated like zero
+    pytest.param(100.0, 1000.0, 10.0, id="high_weight_expensive"),
+    pytest.param(0.5, 1.0, 2.0, id="low_weight_cheap"),
+    pytest.param(1.25, 2.5, 2.0, id="fractional"),
+])
+def test_calculate_plan_utility(cost, weight, expected):
+    """Test the _calculate_plan_utility function with various cost/weight combinations."""
+    utility = _calculate_plan_utility(cost, MockGoal("test_goal", weight))
+    assert utility == expected, f"Expected {expected}, got {utility}"
 
 
 @patch('goap.planner.astar_pathfind')
@@ -71,285 +113,126 @@ def test_find_plan_for_goal(mock_astar):
     mock_astar.assert_called_once_with({'health': 0}, 'impossible_goal', ['no_actions'])
 
 
-@patch('goap.planner._find_plan_for_goal')
-@patch('goap.planner.generate_action_variants')
-def test_orchestrate_planning_basic(mock_generate, mock_find_plan):
-    """Test basic orchestrate_planning functionality."""
-    
-    # Mock action with cost
-    class MockAction:
-        def __init__(self, name, cost):
-            self.name = name
-            self.cost = cost
-        
-        def __repr__(self):
-            return f"MockAction({self.name}, {self.cost})"
-        
-        def is_possible(self, state):
-            return True
-        
-        def apply_effects(self, state):
-            return state.copy()  # Return copy for testing
-    
-    # Mock goal with weight
-    class MockGoal:
-        def __init__(self, name, weight):
-            self.name = name
-            self.weight = weight
-        
-        def is_satisfied(self, state):
-            return False  # For testing purposes
-    
-    # Mock agent
-    class MockAgent:
-        def __init__(self, actions, goals, state):
-            self.actions = actions  # Action templates
-            self.goals = goals
-            self.state = state
-    
-    # Mock action template
-    class MockActionTemplate:
-        def __init__(self, name, cost):
-            self.name = name
-            self.cost = cost
-    
-    # Set up mocks
-    mock_generate.return_value = [MockAction("concrete_test_action", 5.0)]
-    mock_find_plan.return_value = [MockAction("step1", 10.0), MockAction("step2", 20.0)]
-    
-    # Create test data
-    template = MockActionTemplate("test_action", 5.0)
-    goal = MockGoal("test_goal", 100.0)
-    agent = MockAgent([template], [goal], {"health": 100})
-    
-    # Test planning
-    result = orchestrate_planning(agent)
-    assert result is not None
-    assert len(result) == 2
-    assert result[0].cost == 10.0
-    assert result[1].cost == 20.0
-
-
-@patch('goap.planner._find_plan_for_goal')
-@patch('goap.planner.generate_action_variants')
-def test_orchestrate_planning_multi_goal(mock_generate, mock_find_plan):
-    """Test orchestrate_planning with multiple goals and utility optimization."""
-    
-    class MockAction:
-        def __init__(self, name, cost):
-            self.name = name
-            self.cost = cost
-        
-        def __repr__(self):
-            return f"MockAction({self.name}, {self.cost})"
-        
-        def is_possible(self, state):
-            return True
-        
-        def apply_effects(self, state):
-            return state.copy()  # Return copy for testing
-    
-    class MockGoal:
-        def __init__(self, name, weight):
-            self.name = name
-            self.weight = weight
-        
-        def is_satisfied(self, state):
-            return False  # For testing purposes
-    
-    class MockAgent:
-        def __init__(self, actions, goals, state):
-            self.actions = actions
-            self.goals = goals
-            self.state = state
-    
-    class MockActionTemplate:
-        def __init__(self, name, cost):
-            self.name = name
-            self.cost = cost
-    
-    # Set up mocks
-    mock_generate.return_value = [MockAction("concrete_test_action", 5.0)]
-    
-    # Return different plans for different goals
+@pytest.mark.parametrize("goals, plans, expected", [
+    pytest.param(
+        [("test_goal", 100.0)],
+        {"test_goal": [("step1", 10.0), ("step2", 20.0)]},
+        [("step1", 10.0), ("step2", 20.0)],
+        id="basic"),
+    # Utility optimization across multiple goals
+    pytest.param(
+        [("high_weight_goal", 1000.0), ("low_weight_goal", 10.0), ("best_goal", 100.0)],
+        {"high_weight_goal": [("expensive_step", 100.0)],   # Utility = 1000/100 = 10
+         "low_weight_goal": [("cheap_step", 1.0)],          # Utility = 10/1 = 10
+         "best_goal": [("efficient_step", 5.0)]},           # Utility = 100/5 = 20 (best!)
+        [("efficient_step", 5.0)],
+        id="multi_goal"),
+    # No goal has a plan
+    pytest.param(
+        [("impossible_goal", 100.0)],
+        {},
+        None,
+        id="no_valid_plans"),
+    # A zero-cost plan has infinite utility, even for a low-weight goal
+    pytest.param(
+        [("expensive_goal", 1000.0), ("free_goal", 1.0)],
+        {"expensive_goal": [("expensive_step", 100.0)],     # Finite utility
+         "free_goal": [("free_step", 0.0)]},                # Zero cost = infinite utility
+        [("free_step", 0.0)],
+        id="zero_cost_plan"),
+    # Equal utilities go to the goal listed first, whatever its weight
+    pytest.param(
+        [("light_goal", 10.0), ("heavy_goal", 100.0)],
+        {"light_goal": [("cheap_step", 1.0)],               # Utility = 10/1 = 10
+         "heavy_goal": [("costly_step", 10.0)]},            # Utility = 100/10 = 10
+        [("cheap_step", 1.0)],
+        id="utility_tie"),
+])
+def test_orchestrate_planning(planner_mocks, goals, plans, expected):
+    """Test that orchestrate_planning selects the plan with the best utility."""
+    mock_generate, mock_find_plan = planner_mocks
+    
+    # Set up mocks - plans are made of the generated concrete actions
+    plan_actions = {goal_name: [MockAction(name, cost) for name, cost in plan]
+                    for goal_name, plan in plans.items()}
+    mock_generate.return_value = [MockAction("concrete_test_action", 5.0)] + [
+        action for plan in plan_actions.values() for action in plan]
+    
+    # Return the plan listed for each goal, or None if it has none
     def side_effect_find_plan(goal, state, actions):
-        if goal.name == "high_weight_goal":
-            return [MockAction("expensive_step", 100.0)]  # Utility = 1000/100 = 10
-        elif goal.name == "low_weight_goal":
-            return [MockAction("cheap_step", 1.0)]        # Utility = 10/1 = 10
-        elif goal.name == "best_goal":
-            return [MockAction("efficient_step", 5.0)]    # Utility = 100/5 = 20 (best!)
-        return None
+        return plan_actions.get(goal.name)
     
     mock_find_plan.side_effect = side_effect_find_plan
     
-    # Create test data with multiple goals
+    # Create test data
     template = MockActionTemplate("test_action", 5.0)
-    goals = [
-        MockGoal("high_weight_goal", 1000.0),
-        MockGoal("low_weight_goal", 10.0),
-        MockGoal("best_goal", 100.0)  # This should win with highest utility
-    ]
-    agent = MockAgent([template], goals, {"health": 100})
+    agent = MockAgent([template], [MockGoal(name, weight) for name, weight in goals], {"health": 100})
     
     # Test planning
     result = orchestrate_planning(agent)
-    assert result is not None
-    assert len(result) == 1
-    assert result[0].name == "efficient_step"  # Should select the plan with best utility
+    if expected is None:
+        assert result is None
+    else:
+        assert result is not None
+        assert [(action.name, action.cost) for action in result] == expected
 
 
-@patch('goap.planner._find_plan_for_goal')
-@patch('goap.planner.generate_action_variants')
-def test_orchestrate_planning_no_valid_plans(mock_generate, mock_find_plan):
-    """Test orchestrate_planning when no valid plans exist."""
-    
-    class MockAction:
-        def __init__(self, name, cost):
-            self.name = name
-            self.cost = cost
-    
-    class MockGoal:
-        def __init__(self, name, weight):
-            self.name = name
-            self.weight = weight
-        
-        def is_satisfied(self, state):
-            return False  # For testing purposes
+def test_orchestrate_planning_skips_unbeatable_goals(planner_mocks):
+    """Test that goals whose utility bound can't beat the best plan aren't searched."""
+    mock_generate, mock_find_plan = planner_mocks
     
-    class MockAgent:
-        def __init__(self, actions, goals, state):
-            self.actions = actions
-            self.goals = goals
-            self.state = state
+    # Set up mocks - the cheapest action costs 5.0
+    mock_generate.return_value = [MockAction("strike", 5.0), MockAction("rest", 20.0)]
+    mock_find_plan.return_value = [MockAction("strike", 5.0)]
     
-    class MockActionTemplate:
-        def __init__(self, name, cost):
-            self.name = name
-            self.cost = cost
+    # Utility bounds are 1.0/5 = 0.2, 100/5 = 20 and 50/5 = 10
+    goals = [MockGoal("minor_goal", 1.0), MockGoal("major_goal", 100.0), MockGoal("medium_goal", 50.0)]
+    agent = MockAgent([MockActionTemplate("strike", 5.0)], goals, {"health": 100})
     
-    # Set up mocks
-    mock_generate.return_value = [MockAction("concrete_test_action", 5.0)]
-    mock_find_plan.return_value = None  # Always return None (no plans found)
-    
-    # Create test data
-    template = MockActionTemplate("test_action", 5.0)
-    goal = MockGoal("impossible_goal", 100.0)
-    agent = MockAgent([template], [goal], {"health": 100})
-    
-    # Test planning
+    # Test planning - the major goal's plan (utility 20) beats both other bounds
     result = orchestrate_planning(agent)
-    assert result is None
-
-
-@patch('goap.planner._find_plan_for_goal')
-@patch('goap.planner.generate_action_variants')
-def test_orchestrate_planning_zero_cost_plan(mock_generate, mock_find_plan):
-    """Test orchestrate_planning with zero-cost plans (infinite utility)."""
-    
-    class MockAction:
-        def __init__(self, name, cost):
-            self.name = name
-            self.cost = cost
-        
-        def __repr__(self):
-            return f"MockAction({self.name}, {self.cost})"
-        
-        def is_possible(self, state):
-            return True
+    assert result == mock_find_plan.return_value
+    searched = [call[0][0].name for call in mock_find_plan.call_args_list]
+    assert searched == ["major_goal"]
+    
+    # Without positive action costs no bound applies and every goal is searched
+    mock_find_plan.reset_mock()
+    mock_generate.return_value = [MockAction("free_strike", 0.0)]
+    orchestrate_planning(agent)
+    assert mock_find_plan.call_count == 3
+    
+    # Duck-typed actions without a cost resolve to the default cost of 1.0,
+    # so the bounds become 1, 100 and 50 and only the minor goal is skipped
+    class Uncosted:
+        name = "shrug"
+    
+    mock_find_plan.reset_mock()
+    mock_generate.return_value = [Uncosted(), MockAction("rest", 20.0)]
+    orchestrate_planning(agent)
+    searched = [call[0][0].name for call in mock_find_plan.call_args_list]
+    assert searched == ["major_goal", "medium_goal"]
+    
+    # A state-dependent cost turns the bound off, so every goal is searched
+    class Surcharged:
+        name = "surcharged_strike"
+        cost = 5.0
         
-        def apply_effects(self, state):
-            return state.copy()  # Return copy for testing
+        def get_cost(self, state):
+            return 5.0 + state["health"]
     
-    class MockGoal:
-        def __init__(self, name, weight):
-            self.name = name
-            self.weight = weight
-        
-        def is_satisfied(self, state):
-            return False  # For testing purposes
-    
-    class MockAgent:
-        def __init__(self, actions, goals, state):
-            self.actions = actions
-            self.goals = goals
-            self.state = state
-    
-    class MockActionTemplate:
-        def __init__(self, name, cost):
-            self.name = name
-            self.cost = cost
-    
-    # Set up mocks
-    mock_generate.return_value = [MockAction("concrete_test_action", 5.0)]
-    
-    # Return different plans for different goals
-    def side_effect_find_plan(goal, state, actions):
-        if goal.name == "free_goal":
-            return [MockAction("free_step", 0.0)]  # Zero cost = infinite utility
-        elif goal.name == "expensive_goal":
-            return [MockAction("expensive_step", 100.0)]  # Finite utility
-        return None
-    
-    mock_find_plan.side_effect = side_effect_find_plan
-    
-    # Create test data with multiple goals
-    template = MockActionTemplate("test_action", 5.0)
-    goals = [
-        MockGoal("expensive_goal", 1000.0),  # High weight but expensive
-        MockGoal("free_goal", 1.0)          # Low weight but free (should win)
-    ]
-    agent = MockAgent([template], goals, {"health": 100})
-    
-    # Test planning
-    result = orchestrate_planning(agent)
-    assert result is not None
-    assert len(result) == 1
-    assert result[0].name == "free_step"  # Should select the zero-cost plan
-    assert result[0].cost == 0.0
+    mock_find_plan.reset_mock()
+    mock_generate.return_value = [Surcharged()]
+    orchestrate_planning(agent)
+    assert mock_find_plan.call_count == 3
 
 
-@patch('goap.planner._find_plan_for_goal')
-@patch('goap.planner.generate_action_variants')
-def test_orchestrate_planning_action_generation_integration(mock_generate, mock_find_plan):
+def test_orchestrate_planning_action_generation_integration(planner_mocks):
     """Test orchestrate_planning integration with parameter generation."""
-    
-    class MockAction:
-        def __init__(self, name, cost):
-            self.name = name
-            self.cost = cost
-        
-        def __repr__(self):
-            return f"MockAction({self.name}, {self.cost})"
-        
-        def is_possible(self, state):
-            return True
-        
-        def apply_effects(self, state):
-            return state.copy()  # Return copy for testing
-    
-    class MockGoal:
-        def __init__(self, name, weight):
-            self.name = name
-            self.weight = weight
-        
-        def is_satisfied(self, state):
-            return False  # For testing purposes
-    
-    class MockAgent:
-        def __init__(self, actions, goals, state):
-            self.actions = actions
-            self.goals = goals
-            self.state = state
-    
-    class MockActionTemplate:
-        def __init__(self, name, cost):
-            self.name = name
-            self.cost = cost
+    mock_generate, mock_find_plan = planner_mocks
     
     # Set up mocks
-    def side_effect_generate(template, state):
-        return [MockAction(f"concrete_{template.name}", template.cost)]
+    def side_effect_generate(templates, state):
+        return [MockAction(f"concrete_{template.name}", template.cost) for template in templates]
     
     mock_generate.side_effect = side_effect_generate
     mock_find_plan.return_value = [MockAction("result_step", 10.0)]
@@ -366,21 +249,20 @@ def test_orchestrate_planning_action_generation_integration(mock_generate, mock_
     # Test planning
     result = orchestrate_planning(agent)
     
-    # Verify generate_action_variants was called for each template
-    assert mock_generate.call_count == 3
+    # Verify all templates were generated in one batch
+    assert mock_generate.call_count == 1
     
-    # Verify the calls were made with correct templates and state
-    calls = mock_generate.call_args_list
-    template_names = [call[0][0].name for call in calls]
+    # Verify the call was made with correct templates and state
+    call = mock_generate.call_args_list[0]
+    template_names = [template.name for template in call[0][0]]
     assert "attack" in template_names
     assert "move" in template_names
     assert "heal" in template_names
     
     # Verify state was passed correctly
-    for call in calls:
-        state = call[0][1]
-        assert state["location"] == "forest"
-        assert state["health"] == 50
+    state = call[0][1]
+    assert state["location"] == "forest"
+    assert state["health"] == 50
     
     # Verify concrete actions were passed to find_plan
     assert mock_find_plan.call_count == 1
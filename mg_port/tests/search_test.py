@@ -1,7 +1,7 @@
 
 """Tests for the search module functionality."""
 
-from goap.search import _SearchNode, _reconstruct_path, _calculate_heuristic, astar_pathfind, get_successors
+from goap.search import _SearchNode, _reconstruct_path, _calculate_heuristic, _numeric_goal_units, astar_pathfind, get_successors
 
 
 def test_search_node():
@@ -16,6 +16,8 @@ def test_search_node():
     assert node.parent is None
     assert node.g_score == 5.0
     assert node.h_score == 3.0
+    assert node.f_score == 8.0
+    assert not hasattr(node, '__dict__')
     
     # Test f-score calculation in comparison
     state2 = {'health': 80, 'has_key': False}
@@ -171,6 +173,7 @@ def test_calculate_heuristic_extreme():
     # Test non-numeric value
     bad_value_state = {'gold': 'lots', 'distance': 10}
     assert _calculate_heuristic(bad_value_state, extreme_goal) == float('inf')
+    assert _calculate_heuristic({'gold': None, 'distance': -10}, extreme_goal) == float('inf')
     
     print('✓ _calculate_heuristic ExtremeGoal works correctly')
 
@@ -400,6 +403,10 @@ def test_hash_state_consistency():
         assert result2 is None
         assert result3 is None
         
+        # Keys of different types can't be sorted, but states can still be hashed
+        mixed_state = {'a': 1, 2: 'b', ('c', 3): None}
+        assert astar_pathfind(mixed_state, goal, actions) is None
+        
         print('✓ State hashing consistency works')
         
     finally:
@@ -407,6 +414,47 @@ def test_hash_state_consistency():
             globals()['get_successors'] = original_get_successors
 
 
+def test_astar_pathfind_revisited_states():
+    """Test that states reached along several paths are expanded once."""
+    print('Testing astar_pathfind with revisited states...')
+    
+    from goap.goal import Goal
+    
+    expanded = []
+    
+    class ToggleAction:
+        def __init__(self, key, cost):
+            self.name = f"toggle_{key}"
+            self.key = key
+            self.cost = cost
+        
+        def is_possible(self, state):
+            if self.key == 'a':
+                expanded.append(dict(state))
+            return True
+        
+        def apply_effects(self, state):
+            new_state = dict(state)
+            new_state[self.key] = not state[self.key]
+            return new_state
+        
+        def get_cost(self, state):
+            return self.cost
+    
+    # Every state is reachable from every other, so each is generated repeatedly
+    actions = [ToggleAction('a', 1.0), ToggleAction('b', 2.0), ToggleAction('c', 4.0)]
+    start_state = {'a': False, 'b': False, 'c': False}
+    goal = Goal('all_on', 1.0, {'a': True, 'b': True, 'c': True})
+    
+    path = astar_pathfind(start_state, goal, actions)
+    assert sorted(action.name for action in path) == ['toggle_a', 'toggle_b', 'toggle_c']
+    
+    # No state is expanded twice, however often it was reached
+    assert len(expanded) == len({tuple(sorted(state.items())) for state in expanded})
+    
+    print('✓ astar_pathfind expands revisited states once')
+
+
 def test_heuristic_admissibility():
     """Test that heuristics are admissible (never overestimate)."""
     print('Testing heuristic admissibility...')
@@ -501,6 +549,78 @@ def test_performance_characteristics():
             globals()['get_successors'] = original_get_successors
 
 
+def test_astar_pathfind_goal_fallbacks():
+    """Test goals that can't use the set-based goal checks."""
+    print('Testing astar_pathfind goal fallbacks...')
+    
+    from goap.action import Action
+    from goap.goal import Goal
+    
+    actions = [Action('pick_up', 1.0, {'hand': None}, {'hand': 'sword'}, None)]
+    start_state = {'hand': None, 'bag': ('rope',)}
+    
+    # Plain goals use the state's precomputed items
+    assert len(astar_pathfind(start_state, Goal('armed', 1.0, {'hand': 'sword'}), actions)) == 1
+    
+    # Unhashable desired values fall back to is_satisfied and the heuristic loop
+    goal = Goal('armed', 1.0, {'hand': 'sword', 'bag': ['rope']})
+    assert astar_pathfind(start_state, goal, actions) is None
+    
+    # Subclasses keep their own satisfaction logic
+    class AnyWeaponGoal(Goal):
+        def is_satisfied(self, state):
+            return state.get('hand') is not None
+    
+    assert len(astar_pathfind(start_state, AnyWeaponGoal('armed', 1.0, {'hand': 'axe'}), actions)) == 1
+    print('✓ Goal fallbacks work')
+
+
+def test_astar_pathfind_bitset():
+    """Test A* search on bitset-encoded states."""
+    print('Testing astar_pathfind with a FluentRegistry...')
+    
+    from goap.action import Action
+    from goap.fluents import FluentRegistry
+    from goap.goal import Goal, ComparativeGoal, ComparisonOperator, ComparisonValuePair
+    
+    # A corridor of rooms, a key, and an expensive shortcut
+    actions = [Action(f'walk_{i}', 1.0, {'room': i}, {'room': i + 1}, None) for i in range(4)]
+    actions.append(Action('get_key', 1.0, {'room': 1}, {'has_key': True}, None))
+    actions.append(Action('teleport', 10.0, {'room': 0}, {'room': 4}, None))
+    start_state = {'room': 0, 'has_key': False}
+    goal = Goal('escape', 1.0, {'room': 4, 'has_key': True})
+    
+    # Same plan cost as the dictionary search
+    registry = FluentRegistry()
+    path = astar_pathfind(start_state, goal, actions, registry)
+    expected = astar_pathfind(start_state, goal, actions)
+    assert path is not None
+    assert sum(action.cost for action in path) == sum(action.cost for action in expected) == 5.0
+    print('✓ Bitset search finds the optimal plan')
+    
+    # Satisfied and unreachable goals
+    assert astar_pathfind({'room': 4, 'has_key': True}, goal, actions, registry) == []
+    assert astar_pathfind(start_state, Goal('fly', 1.0, {'flying': True}), actions, registry) is None
+    print('✓ Satisfied and unreachable goals are handled')
+    
+    # Other goal types are evaluated on decoded states
+    far_goal = ComparativeGoal('far', 1.0, {
+        'room': ComparisonValuePair(ComparisonOperator.GREATER_THAN_OR_EQUALS, 3)
+    })
+    path = astar_pathfind(start_state, far_goal, actions, registry)
+    assert [action.name for action in path] == ['walk_0', 'walk_1', 'walk_2']
+    print('✓ Non-literal goals fall back to decoded states')
+    
+    # Actions that can't be encoded are rejected
+    heal = Action('heal', 1.0, {'health': '< 50'}, {'health': '+10'}, None)
+    try:
+        astar_pathfind({'health': 10}, Goal('healthy', 1.0, {'health': 100}), [heal], FluentRegistry())
+        assert False, "Should reject actions that can't be encoded"
+    except ValueError:
+        pass
+    print('✓ Unencodable actions raise ValueError')
+
+
 # if __name__ == "__main__":
 #     test_search_node()
 #     test_reconstruct_path()
@@ -513,4 +633,52 @@ def test_performance_characteristics():
 #     test_hash_state_consistency()
 #     test_heuristic_admissibility()
 #     test_performance_characteristics()
-#     print('All search tests passed!')
\ No newline at end of file
+#     print('All search tests passed!')
+
+def test_numeric_goal_heuristic():
+    """Test the distance-aware heuristic for numeric Goal conditions."""
+    print('Testing numeric Goal heuristic bounds...')
+    
+    from goap.action import Action
+    from goap.fluents import FluentRegistry
+    from goap.goal import Goal
+    
+    class CountingGoal(Goal):
+        """Goal subclass, searched with the plain unmet-condition count."""
+    
+    class DuckAction:
+        name = 'duck'
+        cost = 1.0
+    
+    # Steps along x, a costly jump, a raise by deltas and a flag
+    actions = [Action(f'step_{i}', 1.0, {'x': i}, {'x': i + 1}, None) for i in range(8)]
+    actions.append(Action('jump', 6.0, {'x': 0}, {'x': 4}, None))
+    actions.append(Action('raise', 3.0, {}, {'level': '+2'}, None))
+    actions.append(Action('ready', 1.0, {}, {'ready': True}, None))
+    goal = Goal('target', 1.0, {'x': 8, 'level': 6, 'ready': True})
+    
+    # The cheapest cost per unit of each numeric key
+    assert _numeric_goal_units(goal, actions) == [('x', 8, 1.0), ('level', 6, 1.5)]
+    
+    # Keys that can jump arbitrarily far, or change together with another goal key, are not bounded
+    assert _numeric_goal_units(goal, actions + [Action('warp', 1.0, {}, {'x': 8}, None)]) == [('level', 6, 1.5)]
+    assert _numeric_goal_units(goal, actions + [Action('both', 9.0, {}, {'x': '+1', 'level': '+1'}, None)]) is None
+    
+    # Only plain Goals with numeric values and plain Actions are bounded
+    assert _numeric_goal_units(Goal('flag', 1.0, {'ready': True}), actions) is None
+    assert _numeric_goal_units(CountingGoal('target', 1.0, goal.desired_state), actions) is None
+    assert _numeric_goal_units(goal, actions + [DuckAction()]) is None
+    
+    # The bounded search finds plans as cheap as the counting one
+    start_state = {'x': 0, 'level': 0, 'ready': False}
+    path = astar_pathfind(start_state, goal, actions)
+    expected = astar_pathfind(start_state, CountingGoal('target', 1.0, goal.desired_state), actions)
+    assert sum(action.cost for action in path) == sum(action.cost for action in expected) == 18.0
+    
+    # Also with a registry (arithmetic effects can't be encoded, so without 'raise')
+    bit_actions = [action for action in actions if action.name != 'raise']
+    bit_goal = Goal('target', 1.0, {'x': 8, 'ready': True})
+    path = astar_pathfind(start_state, bit_goal, bit_actions, FluentRegistry())
+    assert sum(action.cost for action in path) == 9.0
+    
+    print('✓ Numeric Goal heuristic is bounded and keeps plans optimal')
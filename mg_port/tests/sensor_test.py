@@ -12,6 +12,7 @@ def test_basic_functionality():
     sensor = Sensor("test_sensor", test_callback)
     assert sensor.name == "test_sensor"
     assert sensor.callback == test_callback
+    assert not hasattr(sensor, "__dict__")  # Sensors are slotted
     print("✓ Basic initialization works")
 
     # Test sensor run with state modification
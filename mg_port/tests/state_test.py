@@ -0,0 +1,164 @@
+"""Tests for state.py module using pytest conventions."""
+
+import sys
+
+from goap.state import FrozenState, VersionedDict, bloom_bits, intern_keys, interned_items
+
+
+def test_basic_functionality():
+    """Test that VersionedDict behaves like a dict."""
+    print('Testing VersionedDict dict behaviour...')
+
+    state = VersionedDict({'health': 100, 'has_key': True})
+    assert isinstance(state, dict)
+    assert state == {'health': 100, 'has_key': True}
+    assert state['health'] == 100
+    assert 'has_key' in state
+    assert state.get('missing') is None
+
+    # Copies are plain, unversioned snapshots
+    snapshot = state.copy()
+    assert type(snapshot) is dict
+    assert snapshot == state
+    print('✓ VersionedDict behaves like a dict')
+
+    print('All basic functionality tests passed!')
+
+
+def test_version_bumping():
+    """Test that every mutating operation produces a new version."""
+    print('Testing version bumping...')
+
+    state = VersionedDict({'a': 1})
+    seen = {state._version}
+
+    def assert_bumped():
+        assert state._version not in seen
+        seen.add(state._version)
+
+    state['b'] = 2
+    assert_bumped()
+    state.update({'c': 3})
+    assert_bumped()
+    state |= {'d': 4}
+    assert_bumped()
+    state.setdefault('e', 5)
+    assert_bumped()
+    del state['a']
+    assert_bumped()
+    state.pop('b')
+    assert_bumped()
+    state.popitem()
+    assert_bumped()
+    state.clear()
+    assert_bumped()
+    print('✓ Mutations bump the version')
+
+    # Reads leave the version alone
+    state = VersionedDict({'a': 1})
+    version = state._version
+    state['a']
+    state.get('a')
+    list(state.items())
+    state.setdefault('a', 99)
+    assert state._version == version
+    print('✓ Reads keep the version')
+
+    # Rewriting an equal value is not a change
+    state['a'] = 1
+    assert state._version == version
+    state['a'] = 1.0  # Equal but different type
+    assert state._version != version
+    print('✓ Unchanged assignments keep the version')
+
+    # Writing back a container changed in place is a change
+    enemies = ['orc', 'troll']
+    state['enemies'] = enemies
+    version = state._version
+    enemies.remove('orc')
+    state['enemies'] = enemies
+    assert state._version != version
+    print('✓ Containers written back after in-place changes bump the version')
+
+    # Versions are unique across instances
+    assert VersionedDict()._version != VersionedDict()._version
+    print('✓ Versions are globally unique')
+
+    print('All version tests passed!')
+
+
+def test_intern_keys():
+    """Test that intern_keys interns string keys and copies the mapping."""
+    print('Testing intern_keys...')
+
+    original = {f'key_{i}': i for i in range(3)}
+    original[7] = 'non-string key'
+    interned = intern_keys(original)
+
+    assert interned == original
+    assert interned is not original
+    for key in interned:
+        if isinstance(key, str):
+            assert key is sys.intern(f'key_{key[4:]}')
+    print('✓ String keys are interned')
+
+    # A versioned state can be built directly from the interned items
+    state = VersionedDict(interned_items(original))
+    assert state == original
+    assert all(key is sys.intern(key) for key in state if isinstance(key, str))
+    print('✓ interned_items builds versioned copies in one pass')
+
+    print('All intern_keys tests passed!')
+
+
+def test_frozen_state():
+    """Test that FrozenState is an immutable, hashable dict."""
+    print('Testing FrozenState...')
+
+    state = FrozenState({'location': 'forest', 'wood': 10})
+    assert state == {'location': 'forest', 'wood': 10}
+    assert state['wood'] == 10
+    assert hash(state) == hash(FrozenState({'wood': 10, 'location': 'forest'}))
+    assert state != FrozenState({'location': 'forest', 'wood': 0})
+    print('✓ FrozenState reads like a dict and hashes by content')
+
+    for mutate in (lambda: state.__setitem__('wood', 0), lambda: state.update(wood=0),
+                   lambda: state.pop('wood'), lambda: state.clear()):
+        try:
+            mutate()
+            assert False, 'FrozenState should be immutable'
+        except TypeError:
+            pass
+    assert state == {'location': 'forest', 'wood': 10}
+
+    # Copies are ordinary mutable dicts
+    copied = state.copy()
+    copied['wood'] = 0
+    assert type(copied) is dict
+    print('✓ FrozenState is immutable and copies are mutable')
+
+    try:
+        FrozenState({'inventory': ['axe']})
+        assert False, 'Unhashable values should be rejected'
+    except TypeError:
+        pass
+    print('✓ Unhashable values are rejected')
+
+    # The Bloom filter covers every subset of the state's items
+    assert state.bloom == bloom_bits(state.items())
+    assert bloom_bits([('wood', 10)]) & state.bloom == bloom_bits([('wood', 10)])
+    assert FrozenState({'wood': 10.0}).bloom == bloom_bits([('wood', 10)])
+    print('✓ Bloom filters follow dictionary equality')
+
+    # Updated states match states built from the merged dictionary
+    for assignments in ({'wood': 12}, {'wood': 10}, {'axe': True}, {'wood': 10.0, 'location': 'town'}, {}):
+        updated = state.updated(assignments)
+        expected = FrozenState(dict(state) | assignments)
+        assert type(updated) is FrozenState
+        assert updated == expected and updated.key == expected.key and hash(updated) == hash(expected)
+        assert updated.bloom == expected.bloom
+    assert state.updated({'wood': 12}, frozenset({('wood', 12)})) == {'location': 'forest', 'wood': 12}
+    assert state == {'location': 'forest', 'wood': 10}
+    print('✓ Updated states derive their keys from the original')
+
+    print('All FrozenState tests passed!')